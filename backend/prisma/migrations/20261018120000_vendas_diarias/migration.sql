@@ -0,0 +1,34 @@
+-- CreateTable
+CREATE TABLE "vendas_diarias" (
+    "empresaId" TEXT NOT NULL,
+    "dia" DATE NOT NULL,
+    "status" TEXT NOT NULL,
+    "pedidos" INTEGER NOT NULL DEFAULT 0,
+    "total" DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    CONSTRAINT "vendas_diarias_pkey" PRIMARY KEY ("empresaId","dia","status")
+);
+
+-- CreateTable
+CREATE TABLE "vendas_diarias_produtos" (
+    "empresaId" TEXT NOT NULL,
+    "dia" DATE NOT NULL,
+    "status" TEXT NOT NULL,
+    "produtoId" TEXT NOT NULL,
+    "quantidade" INTEGER NOT NULL DEFAULT 0,
+    "subtotal" DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    CONSTRAINT "vendas_diarias_produtos_pkey" PRIMARY KEY ("empresaId","dia","status","produtoId")
+);
+
+-- CreateIndex
+CREATE INDEX "vendas_diarias_produtos_empresaId_produtoId_idx" ON "vendas_diarias_produtos"("empresaId", "produtoId");
+
+-- AddForeignKey
+ALTER TABLE "vendas_diarias" ADD CONSTRAINT "vendas_diarias_empresaId_fkey" FOREIGN KEY ("empresaId") REFERENCES "empresas"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "vendas_diarias_produtos" ADD CONSTRAINT "vendas_diarias_produtos_empresaId_fkey" FOREIGN KEY ("empresaId") REFERENCES "empresas"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "vendas_diarias_produtos" ADD CONSTRAINT "vendas_diarias_produtos_produtoId_fkey" FOREIGN KEY ("produtoId") REFERENCES "produtos"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,5 @@
+-- DropIndex
+DROP INDEX IF EXISTS "pedidos_empresaId_createdAt_idx";
+
+-- CreateIndex
+CREATE INDEX "pedidos_empresaId_createdAt_id_idx" ON "pedidos"("empresaId", "createdAt", "id");
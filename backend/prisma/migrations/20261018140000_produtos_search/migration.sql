@@ -0,0 +1,23 @@
+-- Busca de produtos (ProdutoSearchService): full-text em português + trigram, sem acentos
+
+-- CreateExtension
+CREATE EXTENSION IF NOT EXISTS "unaccent" WITH SCHEMA public;
+CREATE EXTENSION IF NOT EXISTS "pg_trgm" WITH SCHEMA public;
+
+-- unaccent() é STABLE; índices e colunas geradas exigem uma função IMMUTABLE
+CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+  LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+  AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+-- AlterTable
+ALTER TABLE "produtos" ADD COLUMN "search_vector" tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('portuguese', immutable_unaccent(coalesce("nome", ''))), 'A') ||
+    setweight(to_tsvector('portuguese', immutable_unaccent(coalesce("descricao", ''))), 'B')
+  ) STORED;
+
+-- CreateIndex
+CREATE INDEX "produtos_search_vector_idx" ON "produtos" USING GIN ("search_vector");
+
+-- CreateIndex
+CREATE INDEX "produtos_nome_trgm_idx" ON "produtos" USING GIN (immutable_unaccent(lower("nome")) gin_trgm_ops);
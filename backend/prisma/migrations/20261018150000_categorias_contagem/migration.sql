@@ -0,0 +1,57 @@
+-- Conjunto canônico de categorias por empresa, com a contagem de produtos ativos.
+-- Mantido por trigger em produtos, então vale para qualquer escrita (API, seed, SQL manual).
+
+-- AlterTable
+ALTER TABLE "categorias" ADD COLUMN "produtosAtivos" INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE "categorias" ADD COLUMN "manual" BOOLEAN NOT NULL DEFAULT false;
+
+-- Até aqui a tabela só tinha categorias criadas pelo admin
+UPDATE "categorias" SET "manual" = true;
+
+-- Backfill: categorias usadas por produtos ativos e suas contagens
+INSERT INTO "categorias" ("id", "empresaId", "nome", "createdAt")
+SELECT gen_random_uuid()::text, t."empresaId", t."categoria", CURRENT_TIMESTAMP
+FROM (SELECT DISTINCT "empresaId", "categoria" FROM "produtos" WHERE "ativo" AND "categoria" IS NOT NULL) t
+ON CONFLICT ("empresaId", "nome") DO NOTHING;
+
+UPDATE "categorias" c
+SET "produtosAtivos" = s.total
+FROM (
+  SELECT "empresaId", "categoria", count(*) AS total
+  FROM "produtos"
+  WHERE "ativo" AND "categoria" IS NOT NULL
+  GROUP BY 1, 2
+) s
+WHERE c."empresaId" = s."empresaId" AND c."nome" = s."categoria";
+
+-- CreateFunction
+CREATE OR REPLACE FUNCTION "categorias_sync_produtos"() RETURNS trigger
+  LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'UPDATE'
+     AND OLD."ativo" IS NOT DISTINCT FROM NEW."ativo"
+     AND OLD."categoria" IS NOT DISTINCT FROM NEW."categoria"
+     AND OLD."empresaId" = NEW."empresaId" THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD."ativo" AND OLD."categoria" IS NOT NULL THEN
+    UPDATE "categorias"
+    SET "produtosAtivos" = GREATEST("produtosAtivos" - 1, 0)
+    WHERE "empresaId" = OLD."empresaId" AND "nome" = OLD."categoria";
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW."ativo" AND NEW."categoria" IS NOT NULL THEN
+    INSERT INTO "categorias" ("id", "empresaId", "nome", "produtosAtivos", "createdAt")
+    VALUES (gen_random_uuid()::text, NEW."empresaId", NEW."categoria", 1, CURRENT_TIMESTAMP)
+    ON CONFLICT ("empresaId", "nome") DO UPDATE SET "produtosAtivos" = "categorias"."produtosAtivos" + 1;
+  END IF;
+
+  RETURN NULL;
+END
+$$;
+
+-- CreateTrigger
+CREATE TRIGGER "produtos_categorias_sync"
+  AFTER INSERT OR DELETE OR UPDATE OF "ativo", "categoria", "empresaId" ON "produtos"
+  FOR EACH ROW EXECUTE FUNCTION "categorias_sync_produtos"();
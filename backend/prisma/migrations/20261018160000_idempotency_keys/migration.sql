@@ -0,0 +1,15 @@
+-- CreateTable
+CREATE TABLE "idempotency_keys" (
+    "escopo" TEXT NOT NULL,
+    "chave" TEXT NOT NULL,
+    "hash" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'EM_ANDAMENTO',
+    "resposta" TEXT,
+    "expira_em" TIMESTAMP(3) NOT NULL,
+    "created_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "idempotency_keys_pkey" PRIMARY KEY ("escopo","chave")
+);
+
+-- CreateIndex
+CREATE INDEX "idempotency_keys_expira_em_idx" ON "idempotency_keys"("expira_em");
@@ -0,0 +1,27 @@
+-- Refresh tokens guardados só como hash (sha256) e agrupados em famílias de rotação.
+-- Tokens já emitidos continuam válidos: o hash é calculado a partir da coluna antiga.
+-- Linhas expiradas ficam para o RefreshTokenStore apagar em lotes.
+
+-- AlterTable
+ALTER TABLE "refresh_tokens" ADD COLUMN "tokenHash" TEXT,
+ADD COLUMN "familia" TEXT,
+ADD COLUMN "usadoEm" TIMESTAMP(3);
+
+UPDATE "refresh_tokens"
+SET "tokenHash" = encode(sha256(convert_to("token", 'UTF8')), 'hex'),
+    "familia" = "id";
+
+ALTER TABLE "refresh_tokens" ALTER COLUMN "tokenHash" SET NOT NULL,
+ALTER COLUMN "familia" SET NOT NULL;
+
+-- DropIndex
+DROP INDEX "refresh_tokens_token_idx";
+DROP INDEX "refresh_tokens_token_key";
+
+-- AlterTable
+ALTER TABLE "refresh_tokens" DROP COLUMN "token";
+
+-- CreateIndex
+CREATE UNIQUE INDEX "refresh_tokens_tokenHash_key" ON "refresh_tokens"("tokenHash");
+CREATE INDEX "refresh_tokens_familia_idx" ON "refresh_tokens"("familia");
+CREATE INDEX "refresh_tokens_expiresAt_idx" ON "refresh_tokens"("expiresAt");
@@ -0,0 +1,17 @@
+-- webhook_logs passa a ser também a fila de processamento dos webhooks.
+-- Logs antigos ficam com "disponivelEm" NULL (nada a processar).
+
+-- AlterTable
+ALTER TABLE "webhook_logs" ADD COLUMN "eventoId" TEXT,
+ADD COLUMN "chaveOrdem" TEXT,
+ADD COLUMN "tentativas" INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN "disponivelEm" TIMESTAMP(3),
+ADD COLUMN "travadoAte" TIMESTAMP(3),
+ADD COLUMN "processadoEm" TIMESTAMP(3);
+
+ALTER TABLE "webhook_logs" ALTER COLUMN "disponivelEm" SET DEFAULT CURRENT_TIMESTAMP;
+
+-- CreateIndex
+CREATE UNIQUE INDEX "webhook_logs_origem_eventoId_key" ON "webhook_logs"("origem", "eventoId");
+CREATE INDEX "webhook_logs_disponivelEm_createdAt_idx" ON "webhook_logs"("disponivelEm", "createdAt");
+CREATE INDEX "webhook_logs_origem_chaveOrdem_createdAt_idx" ON "webhook_logs"("origem", "chaveOrdem", "createdAt");
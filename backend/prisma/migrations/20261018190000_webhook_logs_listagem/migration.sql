@@ -0,0 +1,10 @@
+-- Listagem paginada por cursor (createdAt DESC, id DESC), com ou sem filtros,
+-- e poda dos logs antigos por data.
+
+-- DropIndex
+DROP INDEX "webhook_logs_origem_idx";
+DROP INDEX "webhook_logs_processado_idx";
+
+-- CreateIndex
+CREATE INDEX "webhook_logs_origem_processado_createdAt_id_idx" ON "webhook_logs"("origem", "processado", "createdAt", "id");
+CREATE INDEX "webhook_logs_createdAt_id_idx" ON "webhook_logs"("createdAt", "id");
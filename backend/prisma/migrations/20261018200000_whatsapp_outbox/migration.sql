@@ -0,0 +1,33 @@
+-- mensagens_whatsapp passa a ser o outbox do envio de mensagens.
+-- Mensagens antigas ficam com "disponivel_em" NULL, exceto as ainda PENDENTE,
+-- que entram na fila.
+
+-- AlterTable
+ALTER TABLE "mensagens_whatsapp" ADD COLUMN IF NOT EXISTS "empresa_id" TEXT,
+ADD COLUMN "tentativas" INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN "disponivel_em" TIMESTAMP(3),
+ADD COLUMN "travado_ate" TIMESTAMP(3),
+ADD COLUMN "enviado_em" TIMESTAMP(3),
+ADD COLUMN "provedor_id" TEXT;
+
+UPDATE "mensagens_whatsapp" m
+SET "empresa_id" = p."empresaId"
+FROM "pedidos" p
+WHERE p."id" = m."pedido_id" AND m."empresa_id" IS NULL;
+
+UPDATE "mensagens_whatsapp" SET "disponivel_em" = CURRENT_TIMESTAMP WHERE "status" = 'PENDENTE';
+
+ALTER TABLE "mensagens_whatsapp" ALTER COLUMN "empresa_id" SET NOT NULL;
+ALTER TABLE "mensagens_whatsapp" ALTER COLUMN "disponivel_em" SET DEFAULT CURRENT_TIMESTAMP;
+
+-- DropIndex
+DROP INDEX IF EXISTS "mensagens_whatsapp_status_idx";
+DROP INDEX IF EXISTS "mensagens_whatsapp_empresa_id_idx";
+
+-- CreateIndex
+CREATE INDEX "mensagens_whatsapp_empresa_id_created_at_idx" ON "mensagens_whatsapp"("empresa_id", "created_at");
+CREATE INDEX "mensagens_whatsapp_disponivel_em_idx" ON "mensagens_whatsapp"("disponivel_em");
+
+-- AddForeignKey
+ALTER TABLE "mensagens_whatsapp" DROP CONSTRAINT IF EXISTS "mensagens_whatsapp_empresa_id_fkey";
+ALTER TABLE "mensagens_whatsapp" ADD CONSTRAINT "mensagens_whatsapp_empresa_id_fkey" FOREIGN KEY ("empresa_id") REFERENCES "empresas"("id") ON DELETE CASCADE ON UPDATE CASCADE;
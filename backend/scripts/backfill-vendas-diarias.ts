@@ -0,0 +1,33 @@
+// Reconstrói o rollup do dashboard (vendas_diarias / vendas_diarias_produtos)
+// a partir de pedidos e itens_pedido.
+//
+//   npm run dashboard:backfill                 # todas as empresas
+//   npm run dashboard:backfill -- <empresaId>  # só uma empresa
+//
+// Escritas em pedidos ficam bloqueadas enquanto roda (ver reconstruirVendasDiarias).
+import { PrismaClient } from '@prisma/client';
+import { FUSO_HORARIO, reconstruirVendasDiarias } from '../src/dashboard/vendas-diarias.service';
+
+async function run() {
+  const prisma = new PrismaClient();
+  const empresaId = process.argv[2];
+  const inicio = Date.now();
+  try {
+    await reconstruirVendasDiarias(prisma, empresaId);
+    const [dias, produtos] = await Promise.all([
+      prisma.vendaDiaria.count({ where: empresaId ? { empresaId } : {} }),
+      prisma.vendaDiariaProduto.count({ where: empresaId ? { empresaId } : {} }),
+    ]);
+    console.log(
+      `Rollup reconstruído (${empresaId ?? 'todas as empresas'}, fuso ${FUSO_HORARIO}): ` +
+        `${dias} linhas em vendas_diarias, ${produtos} em vendas_diarias_produtos, ${Date.now() - inicio}ms`,
+    );
+  } catch (err) {
+    console.error('Erro ao reconstruir rollup:', err.message);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+run();
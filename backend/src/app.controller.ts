@@ -2,11 +2,16 @@ import { Controller, Get } from '@nestjs/common';
 import { AppService } from './app.service';
 import { Public } from './decorators/public.decorator';
 import { PrismaService } from './database/prisma.service';
+import { SenhaHasher } from './modules/auth/senha-hasher.service';
 import { URL } from 'url';
 
 @Controller()
 export class AppController {
-  constructor(private readonly appService: AppService, private readonly prisma: PrismaService) {}
+  constructor(
+    private readonly appService: AppService,
+    private readonly prisma: PrismaService,
+    private readonly senhas: SenhaHasher,
+  ) {}
 
   @Get()
   @Public()
@@ -20,6 +25,7 @@ export class AppController {
     return {
       status: 'ok',
       timestamp: new Date().toISOString(),
+      senhas: this.senhas.metricas(),
     };
   }
 
@@ -1,6 +1,8 @@
 import { Module } from '@nestjs/common';
 import { ConfigModule } from '@nestjs/config';
 import { PrismaModule } from './database/prisma.module';
+import { TenantModule } from './common/tenant/tenant.module';
+import { IdempotencyModule } from './common/idempotency/idempotency.module';
 import { AppController } from './app.controller';
 import { AppService } from './app.service';
 import { PedidosModule } from './pedidos/pedidos.module';
@@ -20,6 +22,8 @@ import { StorageModule } from './modules/storage/storage.module';
       envFilePath: '.env',
     }),
     PrismaModule,
+    TenantModule,
+    IdempotencyModule,
     PedidosModule,
     AuthModule,
     PublicModule,
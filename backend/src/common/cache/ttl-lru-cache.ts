@@ -0,0 +1,61 @@
+/**
+ * Cache em memória com expiração (TTL) e limite de tamanho (LRU).
+ *
+ * Usa a ordem de inserção do Map: cada leitura reinsere a chave no fim, então
+ * a primeira chave é sempre a menos usada recentemente e é a que sai quando o
+ * limite é atingido. Cada entrada pode ter um TTL próprio (ex.: negativos
+ * expiram mais rápido).
+ */
+interface Entrada<V> {
+  valor: V;
+  expiraEm: number;
+}
+
+export class TtlLruCache<K, V> {
+  private readonly entradas = new Map<K, Entrada<V>>();
+
+  constructor(
+    private readonly maxEntradas: number,
+    private readonly ttlMs: number,
+  ) {}
+
+  get size(): number {
+    return this.entradas.size;
+  }
+
+  /** Não conta como uso (não altera a ordem do LRU). */
+  has(chave: K): boolean {
+    const entrada = this.entradas.get(chave);
+    return entrada !== undefined && entrada.expiraEm > Date.now();
+  }
+
+  get(chave: K): V | undefined {
+    return this.lerEntrada(chave)?.valor;
+  }
+
+  set(chave: K, valor: V, ttlMs: number = this.ttlMs): void {
+    this.entradas.delete(chave);
+    this.entradas.set(chave, { valor, expiraEm: Date.now() + ttlMs });
+    while (this.entradas.size > this.maxEntradas) {
+      this.entradas.delete(this.entradas.keys().next().value);
+    }
+  }
+
+  delete(chave: K): boolean {
+    return this.entradas.delete(chave);
+  }
+
+  clear(): void {
+    this.entradas.clear();
+  }
+
+  private lerEntrada(chave: K): Entrada<V> | undefined {
+    const entrada = this.entradas.get(chave);
+    if (!entrada) return undefined;
+    this.entradas.delete(chave);
+    if (entrada.expiraEm <= Date.now()) return undefined;
+    // Reinsere no fim: passa a ser a mais recente
+    this.entradas.set(chave, entrada);
+    return entrada;
+  }
+}
@@ -0,0 +1,49 @@
+import {
+  BadRequestException,
+  CallHandler,
+  ExecutionContext,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import { Reflector } from '@nestjs/core';
+import { createHash } from 'crypto';
+import { Request, Response } from 'express';
+import { from, lastValueFrom, map, Observable } from 'rxjs';
+import { IdempotencyService } from './idempotency.service';
+
+export const IDEMPOTENTE_KEY = 'idempotente';
+const TAMANHO_MAXIMO_CHAVE = 255;
+
+/** Ver `@Idempotente()` e IdempotencyService. Sem o header, a rota segue normal. */
+@Injectable()
+export class IdempotencyInterceptor implements NestInterceptor {
+  constructor(
+    private readonly reflector: Reflector,
+    private readonly idempotencia: IdempotencyService,
+  ) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const req = context.switchToHttp().getRequest<Request>();
+    const res = context.switchToHttp().getResponse<Response>();
+    const chave = req.header('idempotency-key')?.trim();
+    if (!chave) return next.handle();
+
+    if (chave.length > TAMANHO_MAXIMO_CHAVE) {
+      throw new BadRequestException(`Idempotency-Key deve ter no máximo ${TAMANHO_MAXIMO_CHAVE} caracteres`);
+    }
+
+    const usuario = (req as any).user;
+    const escopo = `${this.reflector.get<string>(IDEMPOTENTE_KEY, context.getHandler())}:${usuario?.id ?? ''}`;
+    const hash = createHash('sha256')
+      .update(JSON.stringify([req.method, req.originalUrl, req.body ?? null]))
+      .digest('hex');
+
+    const executar = () => lastValueFrom(next.handle(), { defaultValue: undefined });
+    return from(this.idempotencia.executar(escopo, chave, hash, executar)).pipe(
+      map(({ resposta, repetida }) => {
+        if (repetida) res.setHeader('Idempotent-Replayed', 'true');
+        return resposta;
+      }),
+    );
+  }
+}
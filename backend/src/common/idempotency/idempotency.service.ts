@@ -0,0 +1,194 @@
+import {
+  ConflictException,
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { PrismaService } from '../../database/prisma.service';
+import { TtlLruCache } from '../cache/ttl-lru-cache';
+
+interface Concluida {
+  hash: string;
+  resposta: unknown;
+}
+
+export interface ResultadoIdempotente {
+  resposta: unknown;
+  repetida: boolean;
+}
+
+// Prazo da reserva de uma chave em andamento: se o processo cair no meio, outra
+// requisição com a mesma chave pode assumir depois disso
+const RESERVA_MS = 60_000;
+const INTERVALO_ESPERA_MS = 100;
+const INTERVALO_LIMPEZA_MS = 10 * 60_000;
+
+/**
+ * Guarda a resposta de requisições com Idempotency-Key (tabela idempotency_keys).
+ *
+ * A primeira requisição reserva a chave com um INSERT ... ON CONFLICT e executa
+ * o handler; as repetições recebem a resposta guardada sem executar nada de
+ * novo. Repetições simultâneas no mesmo processo aguardam a mesma promise; em
+ * outra instância, esperam a original concluir (até IDEMPOTENCY_WAIT_MS) e
+ * depois recebem 409. Se o handler falhar a reserva é apagada, e o cliente
+ * pode tentar de novo com a mesma chave.
+ *
+ * Respostas concluídas ficam também num LRU em memória, então a repetição
+ * mais comum (o cliente não recebeu a resposta e reenviou) nem vai ao banco.
+ */
+@Injectable()
+export class IdempotencyService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(IdempotencyService.name);
+  private readonly ttlMs = Number(process.env.IDEMPOTENCY_TTL_MS || 24 * 60 * 60_000);
+  private readonly esperaMaxMs = Number(process.env.IDEMPOTENCY_WAIT_MS || 10_000);
+  private readonly concluidas = new TtlLruCache<string, Concluida>(
+    Number(process.env.IDEMPOTENCY_CACHE_MAX || 10_000),
+    this.ttlMs,
+  );
+  private readonly emAndamento = new Map<string, { hash: string; promessa: Promise<ResultadoIdempotente> }>();
+  private limpeza?: NodeJS.Timeout;
+
+  constructor(private readonly prisma: PrismaService) {}
+
+  onModuleInit() {
+    this.limpeza = setInterval(() => {
+      this.limparExpiradas().catch((err) => this.logger.warn(`Falha ao limpar idempotency_keys: ${err}`));
+    }, INTERVALO_LIMPEZA_MS);
+    this.limpeza.unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.limpeza);
+  }
+
+  /**
+   * Executa `executar` uma única vez por (escopo, chave). `hash` identifica o
+   * conteúdo da requisição: a mesma chave com outro conteúdo é recusada (422).
+   */
+  async executar(
+    escopo: string,
+    chave: string,
+    hash: string,
+    executar: () => Promise<unknown>,
+  ): Promise<ResultadoIdempotente> {
+    const id = `${escopo}:${chave}`;
+
+    const concluida = this.concluidas.get(id);
+    if (concluida) {
+      this.conferirHash(concluida.hash, hash);
+      return { resposta: concluida.resposta, repetida: true };
+    }
+
+    const pendente = this.emAndamento.get(id);
+    if (pendente) {
+      this.conferirHash(pendente.hash, hash);
+      return { resposta: (await pendente.promessa).resposta, repetida: true };
+    }
+
+    const promessa = this.processar(escopo, chave, hash, executar).finally(() => this.emAndamento.delete(id));
+    this.emAndamento.set(id, { hash, promessa });
+    return promessa;
+  }
+
+  private async processar(
+    escopo: string,
+    chave: string,
+    hash: string,
+    executar: () => Promise<unknown>,
+  ): Promise<ResultadoIdempotente> {
+    const id = `${escopo}:${chave}`;
+    const limite = Date.now() + this.esperaMaxMs;
+
+    for (;;) {
+      if (await this.reservar(escopo, chave, hash)) {
+        return { resposta: await this.executarReservada(escopo, chave, hash, executar), repetida: false };
+      }
+
+      const registro = await this.prisma.idempotencyKey.findUnique({
+        where: { escopo_chave: { escopo, chave } },
+      });
+      if (registro) {
+        this.conferirHash(registro.hash, hash);
+        if (registro.status === 'CONCLUIDA') {
+          const resposta = registro.resposta === null ? undefined : JSON.parse(registro.resposta);
+          this.concluidas.set(id, { hash, resposta });
+          return { resposta, repetida: true };
+        }
+      }
+      // Sem registro: a original falhou e liberou a chave; a próxima volta reserva
+
+      if (Date.now() >= limite) {
+        throw new ConflictException('Requisição com esta Idempotency-Key ainda em processamento');
+      }
+      await new Promise((resolve) => setTimeout(resolve, INTERVALO_ESPERA_MS));
+    }
+  }
+
+  /** Reserva a chave (nova ou expirada). Retorna false se outra requisição a detém. */
+  private async reservar(escopo: string, chave: string, hash: string): Promise<boolean> {
+    // Datas sempre do relógio do Node, como em executarReservada e limparExpiradas:
+    // CURRENT_TIMESTAMP segue o fuso da sessão e as colunas guardam UTC sem fuso
+    const agora = new Date();
+    const reservadas = await this.prisma.$queryRaw<{ escopo: string }[]>`
+      INSERT INTO "idempotency_keys" ("escopo", "chave", "hash", "status", "expira_em", "created_at")
+      VALUES (${escopo}, ${chave}, ${hash}, 'EM_ANDAMENTO', ${new Date(agora.getTime() + RESERVA_MS)}, ${agora})
+      ON CONFLICT ("escopo", "chave") DO UPDATE
+      SET "hash" = EXCLUDED."hash",
+          "status" = 'EM_ANDAMENTO',
+          "resposta" = NULL,
+          "expira_em" = EXCLUDED."expira_em",
+          "created_at" = EXCLUDED."created_at"
+      WHERE "idempotency_keys"."expira_em" < ${agora}
+      RETURNING "escopo"`;
+    return reservadas.length > 0;
+  }
+
+  private async executarReservada(
+    escopo: string,
+    chave: string,
+    hash: string,
+    executar: () => Promise<unknown>,
+  ): Promise<unknown> {
+    let resposta: unknown;
+    try {
+      resposta = await executar();
+    } catch (err) {
+      await this.prisma.idempotencyKey
+        .delete({ where: { escopo_chave: { escopo, chave } } })
+        .catch(() => undefined);
+      throw err;
+    }
+
+    // O que vai para o banco é o JSON que o cliente recebe; a repetição devolve o mesmo corpo
+    const corpo = resposta === undefined ? null : JSON.stringify(resposta);
+    this.concluidas.set(`${escopo}:${chave}`, {
+      hash,
+      resposta: corpo === null ? undefined : JSON.parse(corpo),
+    });
+    try {
+      await this.prisma.idempotencyKey.update({
+        where: { escopo_chave: { escopo, chave } },
+        data: { status: 'CONCLUIDA', resposta: corpo, expiraEm: new Date(Date.now() + this.ttlMs) },
+      });
+    } catch (err) {
+      // A operação já aconteceu: não transformar o sucesso em erro para o cliente
+      this.logger.error(`Falha ao guardar resposta da Idempotency-Key ${chave} (${escopo})`, err as any);
+    }
+    return resposta;
+  }
+
+  private conferirHash(esperado: string, recebido: string): void {
+    if (esperado !== recebido) {
+      throw new UnprocessableEntityException('Idempotency-Key já usada com outra requisição');
+    }
+  }
+
+  private async limparExpiradas(): Promise<void> {
+    const removidas = await this.prisma.idempotencyKey.deleteMany({
+      where: { expiraEm: { lt: new Date() } },
+    });
+    if (removidas.count > 0) this.logger.debug(`${removidas.count} Idempotency-Keys expiradas removidas`);
+  }
+}
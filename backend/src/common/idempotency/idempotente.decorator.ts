@@ -0,0 +1,10 @@
+import { applyDecorators, SetMetadata, UseInterceptors } from '@nestjs/common';
+import { IDEMPOTENTE_KEY, IdempotencyInterceptor } from './idempotency.interceptor';
+
+/**
+ * Aceita o header Idempotency-Key na rota: repetições com a mesma chave recebem
+ * a resposta original sem executar o handler de novo. `escopo` separa as rotas
+ * (a chave vale por rota e por usuário).
+ */
+export const Idempotente = (escopo: string) =>
+  applyDecorators(SetMetadata(IDEMPOTENTE_KEY, escopo), UseInterceptors(IdempotencyInterceptor));
@@ -0,0 +1,44 @@
+/**
+ * Token bucket: até `capacidade` operações de uma vez (rajada) e, depois,
+ * `porSegundo` operações por segundo. Os tokens são repostos sob demanda, a
+ * partir do tempo decorrido desde a última leitura, sem timers.
+ */
+export class TokenBucket {
+  private tokens: number;
+  private atualizadoEm = Date.now();
+
+  constructor(
+    private readonly capacidade: number,
+    private readonly porSegundo: number,
+  ) {
+    this.tokens = capacidade;
+  }
+
+  /** Consome um token se houver. */
+  tentarConsumir(): boolean {
+    this.repor();
+    if (this.tokens < 1) return false;
+    this.tokens -= 1;
+    return true;
+  }
+
+  /** Quanto falta (ms) para haver um token disponível; 0 se já houver. */
+  esperaMs(): number {
+    this.repor();
+    if (this.tokens >= 1) return 0;
+    return Math.ceil(((1 - this.tokens) / this.porSegundo) * 1000);
+  }
+
+  /** Espera um token e o consome. */
+  async consumir(): Promise<void> {
+    while (!this.tentarConsumir()) {
+      await new Promise((resolve) => setTimeout(resolve, this.esperaMs()));
+    }
+  }
+
+  private repor(): void {
+    const agora = Date.now();
+    this.tokens = Math.min(this.capacidade, this.tokens + ((agora - this.atualizadoEm) / 1000) * this.porSegundo);
+    this.atualizadoEm = agora;
+  }
+}
@@ -0,0 +1,127 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { PrismaService } from '../../database/prisma.service';
+import { TtlLruCache } from '../cache/ttl-lru-cache';
+
+export interface TenantInfo {
+  id: string;
+  nome: string;
+  slug: string | null;
+  subdominio: string | null;
+  ativo: boolean;
+}
+
+type Chave = `slug:${string}` | `sub:${string}`;
+
+const ESCRITAS_EMPRESA = new Set(['create', 'createMany', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany']);
+
+/**
+ * Resolve empresas por slug ou subdomínio sem ir ao banco a cada request.
+ *
+ * - Entradas positivas vivem TENANT_CACHE_TTL_MS (padrão 60s) e o cache guarda
+ *   no máximo TENANT_CACHE_MAX lojas (LRU).
+ * - Hosts desconhecidos também são guardados (como `null`) por
+ *   TENANT_CACHE_NEGATIVE_TTL_MS (padrão 10s), para que bots varrendo
+ *   subdomínios não cheguem ao Postgres.
+ * - Qualquer escrita em Empresa feita por este processo invalida as chaves
+ *   afetadas (middleware do Prisma). Outras instâncias enxergam a mudança
+ *   quando o TTL expira.
+ * - Buscas simultâneas pela mesma chave compartilham a mesma consulta.
+ */
+@Injectable()
+export class TenantRegistry {
+  private readonly logger = new Logger('TenantRegistry');
+  private readonly ttlNegativoMs = Number(process.env.TENANT_CACHE_NEGATIVE_TTL_MS || 10_000);
+  private readonly cache = new TtlLruCache<Chave, TenantInfo | null>(
+    Number(process.env.TENANT_CACHE_MAX || 10_000),
+    Number(process.env.TENANT_CACHE_TTL_MS || 60_000),
+  );
+  // Chaves em cache de cada empresa, para invalidar também o slug antigo quando ele muda
+  private readonly chavesPorEmpresa = new Map<string, Set<Chave>>();
+  private readonly emAndamento = new Map<Chave, Promise<TenantInfo | null>>();
+  // Incrementada a cada invalidação: uma busca iniciada antes dela não grava no cache
+  private geracao = 0;
+
+  constructor(private readonly prisma: PrismaService) {
+    this.prisma.$use(async (params, next) => {
+      const result = await next(params);
+      if (params.model === 'Empresa' && ESCRITAS_EMPRESA.has(params.action)) {
+        this.invalidarPorEscrita(params.action, result);
+      }
+      return result;
+    });
+  }
+
+  porSlug(slug: string): Promise<TenantInfo | null> {
+    return this.resolver(`slug:${slug}`, { slug });
+  }
+
+  porSubdominio(subdominio: string): Promise<TenantInfo | null> {
+    return this.resolver(`sub:${subdominio}`, { subdominio });
+  }
+
+  /** Remove a empresa do cache (todas as chaves conhecidas dela). */
+  invalidar(empresa: { id?: string; slug?: string | null; subdominio?: string | null }): void {
+    this.geracao++;
+    if (empresa.id) {
+      for (const chave of this.chavesPorEmpresa.get(empresa.id) ?? []) {
+        this.cache.delete(chave);
+      }
+      this.chavesPorEmpresa.delete(empresa.id);
+    }
+    if (empresa.slug) this.cache.delete(`slug:${empresa.slug}`);
+    if (empresa.subdominio) this.cache.delete(`sub:${empresa.subdominio}`);
+  }
+
+  invalidarTudo(): void {
+    this.geracao++;
+    this.cache.clear();
+    this.chavesPorEmpresa.clear();
+  }
+
+  private resolver(chave: Chave, where: { slug: string } | { subdominio: string }): Promise<TenantInfo | null> {
+    const emCache = this.cache.get(chave);
+    if (emCache !== undefined) return Promise.resolve(emCache);
+    const pendente = this.emAndamento.get(chave);
+    if (pendente) return pendente;
+
+    const geracao = this.geracao;
+    const busca = this.prisma.empresa
+      .findUnique({
+        where: where as any,
+        select: { id: true, nome: true, slug: true, subdominio: true, ativo: true },
+      })
+      .then((empresa) => {
+        if (geracao === this.geracao) this.guardar(chave, empresa);
+        return empresa;
+      })
+      .finally(() => this.emAndamento.delete(chave));
+    this.emAndamento.set(chave, busca);
+    return busca;
+  }
+
+  private guardar(chave: Chave, empresa: TenantInfo | null): void {
+    if (!empresa) {
+      this.cache.set(chave, null, this.ttlNegativoMs);
+      return;
+    }
+    this.cache.set(chave, empresa);
+    const chaves = this.chavesPorEmpresa.get(empresa.id) ?? new Set<Chave>();
+    chaves.add(chave);
+    this.chavesPorEmpresa.set(empresa.id, chaves);
+    // O índice não pode crescer além do próprio cache
+    if (this.chavesPorEmpresa.size > this.cache.size * 2) {
+      for (const [id, conjunto] of this.chavesPorEmpresa) {
+        if (![...conjunto].some((c) => this.cache.has(c))) this.chavesPorEmpresa.delete(id);
+      }
+    }
+  }
+
+  private invalidarPorEscrita(action: string, result: any): void {
+    if (action === 'updateMany' || action === 'deleteMany' || action === 'createMany' || !result) {
+      this.logger.debug(`Empresa.${action}: cache de tenants limpo`);
+      this.invalidarTudo();
+      return;
+    }
+    this.invalidar(result);
+  }
+}
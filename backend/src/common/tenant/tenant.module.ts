@@ -0,0 +1,9 @@
+import { Global, Module } from '@nestjs/common';
+import { TenantRegistry } from './tenant-registry.service';
+
+@Global()
+@Module({
+  providers: [TenantRegistry],
+  exports: [TenantRegistry],
+})
+export class TenantModule {}
@@ -1,5 +1,6 @@
 
 import { Injectable, BadRequestException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../database/prisma.service';
 import { CreateCupomDto } from './dto/create-cupom.dto';
 import { UpdateCupomDto } from './dto/update-cupom.dto';
@@ -99,12 +100,7 @@ export class CuponsService {
       );
     }
 
-    let desconto = 0;
-    if (cupom.tipo === 'PERCENTUAL') {
-      desconto = (validarCupomDto.valorCompra * Number(cupom.valor)) / 100;
-    } else {
-      desconto = Number(cupom.valor);
-    }
+    const desconto = this.calcularDesconto(cupom, validarCupomDto.valorCompra);
 
     return {
       cupom,
@@ -113,6 +109,42 @@ export class CuponsService {
     };
   }
 
+  /**
+   * Valida e registra o uso do cupom num único UPDATE condicional, dentro da
+   * transação do checkout. Dois checkouts simultâneos não passam de
+   * `usoMaximo`: o segundo espera o lock da linha e reavalia a condição.
+   * Retorna o desconto para `valorCompra`.
+   */
+  async consumir(tx: Prisma.TransactionClient, codigo: string, empresaId: string, valorCompra: number) {
+    // Relógio do Node, como nas datas que o Prisma grava: CURRENT_TIMESTAMP depende do fuso da sessão
+    const agora = new Date();
+    const [cupom] = await tx.$queryRaw<{ tipo: string; valor: number }[]>`
+      UPDATE "cupons"
+      SET "uso_atual" = "uso_atual" + 1, "updated_at" = ${agora}
+      WHERE "empresa_id" = ${empresaId}
+        AND "codigo" = ${codigo}
+        AND "ativo"
+        AND ${agora} BETWEEN "data_inicio" AND "data_fim"
+        AND ("uso_maximo" IS NULL OR "uso_atual" < "uso_maximo")
+        AND ("valor_minimo" IS NULL OR "valor_minimo" <= ${valorCompra})
+      RETURNING "tipo", "valor"`;
+
+    if (!cupom) {
+      // Nada foi alterado: `validar` explica o motivo (não encontrado, vencido, valor mínimo...)
+      await this.validar({ codigo, valorCompra }, empresaId);
+      throw new BadRequestException('Cupom atingiu o limite de uso');
+    }
+
+    return this.calcularDesconto(cupom, valorCompra);
+  }
+
+  private calcularDesconto(cupom: { tipo: string; valor: number }, valorCompra: number) {
+    if (cupom.tipo === 'PERCENTUAL') {
+      return (valorCompra * Number(cupom.valor)) / 100;
+    }
+    return Number(cupom.valor);
+  }
+
   async incrementarUso(codigo: string, empresaId: string) {
     // Buscar cupom específico da empresa
     const cupom = await this.prisma.cupom.findFirst({
@@ -2,9 +2,10 @@ import { Module } from '@nestjs/common';
 import { DashboardController } from './dashboard.controller';
 import { DashboardService } from './dashboard.service';
 import { PrismaModule } from '../database/prisma.module';
+import { VendasDiariasModule } from './vendas-diarias.module';
 
 @Module({
-  imports: [PrismaModule],
+  imports: [PrismaModule, VendasDiariasModule],
   controllers: [DashboardController],
   providers: [DashboardService]
 })
@@ -1,6 +1,22 @@
 
 import { Injectable, InternalServerErrorException, Logger } from '@nestjs/common';
 import { PrismaService } from '../database/prisma.service';
+import { Prisma } from '@prisma/client';
+import { diaLocal } from './vendas-diarias.service';
+
+type Agrupamento = 'day' | 'week' | 'month';
+
+// Chave de cada período no formato que o gráfico já usava: dia e semana (iniciada
+// no domingo) como YYYY-MM-DD, mês como YYYY-MM
+const AGRUPAMENTOS: Record<Agrupamento, { bucket: (dia: Prisma.Sql) => Prisma.Sql; passo: string; formato: string }> = {
+  day: { bucket: (dia) => Prisma.sql`(${dia})::date`, passo: '1 day', formato: 'YYYY-MM-DD' },
+  week: {
+    bucket: (dia) => Prisma.sql`(date_trunc('week', (${dia}) + 1) - interval '1 day')::date`,
+    passo: '1 week',
+    formato: 'YYYY-MM-DD',
+  },
+  month: { bucket: (dia) => Prisma.sql`date_trunc('month', ${dia})::date`, passo: '1 month', formato: 'YYYY-MM' },
+};
 
 @Injectable()
 export class DashboardService {
@@ -9,137 +25,60 @@ export class DashboardService {
   constructor(private prisma: PrismaService) {}
 
   async getEstatisticas(empresaId: string) {
-    const hoje = new Date();
-    hoje.setHours(0, 0, 0, 0);
-
-    const inicioSemana = new Date(hoje);
-    inicioSemana.setDate(hoje.getDate() - hoje.getDay());
-
-    const inicioMes = new Date(hoje.getFullYear(), hoje.getMonth(), 1);
-
-    // Otimização: Executar todas as queries em paralelo
-    const [
-      pedidosHoje,
-      pedidosSemana,
-      pedidosMes,
-      vendasHoje,
-      vendasSemana,
-      vendasMes,
-      pedidosPorStatus,
-    ] = await Promise.all([
-      // Pedidos de hoje
-      this.prisma.pedido.count({
-        where: {
-          empresaId,
-          createdAt: { gte: hoje },
-        },
-      }),
-      // Pedidos da semana
-      this.prisma.pedido.count({
-        where: {
-          empresaId,
-          createdAt: { gte: inicioSemana },
-        },
-      }),
-      // Pedidos do mês
-      this.prisma.pedido.count({
-        where: {
-          empresaId,
-          createdAt: { gte: inicioMes },
-        },
-      }),
-      // Vendas de hoje
-      this.prisma.pedido.aggregate({
-        where: {
-          empresaId,
-          createdAt: { gte: hoje },
-          status: { notIn: ['CANCELADO'] },
-        },
-        _sum: { total: true },
-      }),
-      // Vendas da semana
-      this.prisma.pedido.aggregate({
-        where: {
-          empresaId,
-          createdAt: { gte: inicioSemana },
-          status: { notIn: ['CANCELADO'] },
-        },
-        _sum: { total: true },
+    // Limites em dias civis no fuso da loja (mesmo critério do rollup)
+    const hoje = diaLocal(new Date());
+    const diaDaSemana = new Date(`${hoje}T00:00:00Z`).getUTCDay();
+    const inicioSemana = this.somarDias(hoje, -diaDaSemana);
+    const inicioMes = `${hoje.slice(0, 8)}01`;
+    const desde = inicioSemana < inicioMes ? inicioSemana : inicioMes;
+
+    // Poucas dezenas de linhas do rollup (dias do período × status) em vez de varrer pedidos
+    const [linhas, pedidosPorStatus, produtosMaisVendidos] = await Promise.all([
+      this.prisma.vendaDiaria.findMany({
+        where: { empresaId, dia: { gte: new Date(`${desde}T00:00:00Z`) } },
+        select: { dia: true, status: true, pedidos: true, total: true },
       }),
-      // Vendas do mês
-      this.prisma.pedido.aggregate({
-        where: {
-          empresaId,
-          createdAt: { gte: inicioMes },
-          status: { notIn: ['CANCELADO'] },
-        },
-        _sum: { total: true },
-      }),
-      // Pedidos por status
-      this.prisma.pedido.groupBy({
+      this.prisma.vendaDiaria.groupBy({
         by: ['status'],
         where: { empresaId },
-        _count: true,
+        _sum: { pedidos: true },
       }),
+      this.maisVendidos(empresaId, 10),
     ]);
 
-    // Ticket médio
-    const ticketMedio = pedidosMes > 0 
-      ? Number(vendasMes._sum.total || 0) / pedidosMes 
-      : 0;
-
-    // Produtos mais vendidos
-    const produtosMaisVendidos = await this.prisma.itemPedido.groupBy({
-      by: ['produtoId'],
-      where: {
-        pedido: {
-          empresaId,
-          status: { notIn: ['CANCELADO'] },
-        },
-      },
-      _sum: { quantidade: true },
-      orderBy: { _sum: { quantidade: 'desc' } },
-      take: 10,
-    });
-
-    // Buscar todos os produtos de uma vez (otimização N+1)
-    const produtoIds = produtosMaisVendidos.map((item) => item.produtoId);
-    const produtos = await this.prisma.produto.findMany({
-      where: { 
-        id: { in: produtoIds },
-        empresaId 
-      },
-      select: { id: true, nome: true, imagem: true, preco: true },
-    });
-
-    // Criar mapa para lookup rápido
-    const produtosMap = new Map(produtos.map(p => [p.id, p]));
+    const pedidos = { hoje: 0, semana: 0, mes: 0 };
+    const vendas = { hoje: 0, semana: 0, mes: 0 };
+    for (const linha of linhas) {
+      const dia = linha.dia.toISOString().slice(0, 10);
+      const valor = linha.status === 'CANCELADO' ? 0 : Number(linha.total);
+      if (dia >= hoje) {
+        pedidos.hoje += linha.pedidos;
+        vendas.hoje += valor;
+      }
+      if (dia >= inicioSemana) {
+        pedidos.semana += linha.pedidos;
+        vendas.semana += valor;
+      }
+      if (dia >= inicioMes) {
+        pedidos.mes += linha.pedidos;
+        vendas.mes += valor;
+      }
+    }
 
-    const produtosDetalhes = produtosMaisVendidos.map((item) => {
-      const produto = produtosMap.get(item.produtoId);
-      return {
-        ...produto,
-        quantidadeVendida: item._sum.quantidade,
-      };
-    }).filter(p => p.id); // Filtrar produtos não encontrados
+    // Ticket médio
+    const ticketMedio = pedidos.mes > 0 ? vendas.mes / pedidos.mes : 0;
 
     return {
-      pedidos: {
-        hoje: pedidosHoje,
-        semana: pedidosSemana,
-        mes: pedidosMes,
-      },
-      vendas: {
-        hoje: Number(vendasHoje._sum.total || 0),
-        semana: Number(vendasSemana._sum.total || 0),
-        mes: Number(vendasMes._sum.total || 0),
-      },
+      pedidos,
+      vendas,
       ticketMedio: Number(ticketMedio.toFixed(2)),
-      pedidosPorStatus: pedidosPorStatus.map((item) => ({
-        status: item.status,
-        quantidade: item._count,
-      })),
-      produtosMaisVendidos: produtosDetalhes,
+      pedidosPorStatus: pedidosPorStatus
+        .filter((item) => item._sum.pedidos > 0)
+        .map((item) => ({
+          status: item.status,
+          quantidade: item._sum.pedidos,
+        })),
+      produtosMaisVendidos: produtosMaisVendidos.map(({ totalVendido, categoria, ...produto }) => produto),
     };
   }
 
@@ -150,80 +89,60 @@ export class DashboardService {
     endDate?: Date,
   ) {
     try {
-      const hoje = new Date();
-      let dataInicio: Date;
-      let dataFim: Date = hoje;
-      let groupBy: string;
+      // Dias civis no fuso da loja, como no rollup
+      const hoje = diaLocal(new Date());
+      let dataInicio: string;
+      let dataFim: string = hoje;
+      let agrupamento: Agrupamento;
 
       // If custom date range is provided, use it
       if (startDate && endDate) {
-        dataInicio = new Date(startDate);
-        dataFim = new Date(endDate);
-        groupBy = 'day';
+        dataInicio = diaLocal(new Date(startDate));
+        dataFim = diaLocal(new Date(endDate));
+        agrupamento = 'day';
       } else if (periodo === 'dia') {
-        dataInicio = new Date(hoje);
-        dataInicio.setDate(hoje.getDate() - 30);
-        groupBy = 'day';
+        dataInicio = this.somarDias(hoje, -30);
+        agrupamento = 'day';
       } else if (periodo === 'semana') {
-        dataInicio = new Date(hoje);
-        dataInicio.setDate(hoje.getDate() - 90);
-        groupBy = 'week';
+        dataInicio = this.somarDias(hoje, -90);
+        agrupamento = 'week';
       } else {
-        dataInicio = new Date(hoje);
-        dataInicio.setMonth(hoje.getMonth() - 12);
-        groupBy = 'month';
+        const data = new Date(`${hoje}T00:00:00Z`);
+        data.setUTCMonth(data.getUTCMonth() - 12);
+        dataInicio = data.toISOString().slice(0, 10);
+        agrupamento = 'month';
       }
 
-      const pedidos = await this.prisma.pedido.findMany({
-        where: {
-          empresaId,
-          createdAt: { 
-            gte: dataInicio,
-            lte: dataFim,
-          },
-          status: { notIn: ['CANCELADO'] },
-        },
-        select: {
-          createdAt: true,
-          total: true,
-        },
-        orderBy: { createdAt: 'asc' },
-      });
-
-      const vendas = pedidos.reduce((acc, pedido) => {
-        try {
-          let chave: string;
-          const data = new Date(pedido.createdAt);
-
-          if (groupBy === 'day') {
-            chave = data.toISOString().split('T')[0];
-          } else if (groupBy === 'week') {
-            const inicioSemana = new Date(data);
-            inicioSemana.setDate(data.getDate() - data.getDay());
-            chave = inicioSemana.toISOString().split('T')[0];
-          } else {
-            chave = `${data.getFullYear()}-${String(data.getMonth() + 1).padStart(2, '0')}`;
-          }
-
-          if (!acc[chave]) {
-            acc[chave] = 0;
-          }
-          
-          const total = Number(pedido.total);
-          if (!isNaN(total) && isFinite(total)) {
-            acc[chave] += total;
-          }
-
-          return acc;
-        } catch (itemError) {
-          this.logger.error(`Erro processando pedido: ${pedido?.createdAt}`, itemError);
-          return acc;
-        }
-      }, {});
+      if (dataInicio > dataFim) {
+        return [];
+      }
 
-      return Object.entries(vendas).map(([data, total]) => ({
-        data,
-        total: Number(total),
+      // Agrupa no Postgres (date_trunc sobre o rollup diário) e completa os períodos sem venda com zero
+      const { bucket, passo, formato } = AGRUPAMENTOS[agrupamento];
+      const linhas = await this.prisma.$queryRaw<{ data: string; total: number }[]>`
+        WITH periodos AS (
+          SELECT generate_series(
+            ${bucket(Prisma.sql`${dataInicio}::date`)},
+            ${bucket(Prisma.sql`${dataFim}::date`)},
+            ${Prisma.raw(`interval '${passo}'`)}
+          )::date AS periodo
+        ),
+        vendas AS (
+          SELECT ${bucket(Prisma.sql`"dia"`)} AS periodo, sum("total") AS total
+          FROM "vendas_diarias"
+          WHERE "empresaId" = ${empresaId}
+            AND "dia" BETWEEN ${dataInicio}::date AND ${dataFim}::date
+            AND "status" <> 'CANCELADO'
+          GROUP BY 1
+        )
+        SELECT to_char(p.periodo, ${formato}) AS data, coalesce(v.total, 0)::float8 AS total
+        FROM periodos p
+        LEFT JOIN vendas v ON v.periodo = p.periodo
+        ORDER BY p.periodo`;
+
+      return linhas.map((linha) => ({
+        data: linha.data,
+        total: Number(linha.total),
       }));
     } catch (error) {
       this.logger.error('Erro em getGraficoVendas', error);
@@ -232,15 +151,18 @@ export class DashboardService {
   }
 
   async getProdutosPopulares(empresaId: string, limit: number = 10) {
-    const produtosMaisVendidos = await this.prisma.itemPedido.groupBy({
+    return this.maisVendidos(empresaId, limit);
+  }
+
+  private async maisVendidos(empresaId: string, limit: number) {
+    const produtosMaisVendidos = await this.prisma.vendaDiariaProduto.groupBy({
       by: ['produtoId'],
       where: {
-        pedido: {
-          empresaId,
-          status: { notIn: ['CANCELADO'] },
-        },
+        empresaId,
+        status: { not: 'CANCELADO' },
       },
       _sum: { quantidade: true, subtotal: true },
+      having: { quantidade: { _sum: { gt: 0 } } },
       orderBy: { _sum: { quantidade: 'desc' } },
       take: limit,
     });
@@ -275,4 +197,10 @@ export class DashboardService {
 
     return produtosDetalhes;
   }
+
+  private somarDias(dia: string, dias: number): string {
+    const data = new Date(`${dia}T00:00:00Z`);
+    data.setUTCDate(data.getUTCDate() + dias);
+    return data.toISOString().slice(0, 10);
+  }
 }
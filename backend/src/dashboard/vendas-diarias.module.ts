@@ -0,0 +1,10 @@
+import { Module } from '@nestjs/common';
+import { PrismaModule } from '../database/prisma.module';
+import { VendasDiariasService } from './vendas-diarias.service';
+
+@Module({
+  imports: [PrismaModule],
+  providers: [VendasDiariasService],
+  exports: [VendasDiariasService],
+})
+export class VendasDiariasModule {}
@@ -0,0 +1,124 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { Prisma, PrismaClient } from '@prisma/client';
+import { PrismaService } from '../database/prisma.service';
+
+// Fuso usado para decidir a que dia um pedido pertence (hoje/semana/mês do dashboard)
+export const FUSO_HORARIO = process.env.DASHBOARD_TIMEZONE || 'America/Sao_Paulo';
+
+type Tx = Prisma.TransactionClient | PrismaClient;
+
+export interface PedidoRollup {
+  empresaId: string;
+  createdAt: Date;
+  status: string;
+  total: number;
+  itens: { produtoId: string; quantidade: number; subtotal: number }[];
+}
+
+const formatoDia = new Intl.DateTimeFormat('en-CA', {
+  timeZone: FUSO_HORARIO,
+  year: 'numeric',
+  month: '2-digit',
+  day: '2-digit',
+});
+
+/** Dia civil (YYYY-MM-DD) de `data` no fuso do dashboard. */
+export function diaLocal(data: Date): string {
+  return formatoDia.format(data);
+}
+
+/**
+ * Mantém as tabelas vendas_diarias e vendas_diarias_produtos.
+ *
+ * Cada pedido conta uma vez na linha (empresa, dia, status) em que está: o
+ * checkout soma, uma mudança de status tira da linha antiga e soma na nova.
+ * As chamadas devem rodar na mesma transação que grava o pedido, para que o
+ * rollup nunca divirja de `pedidos`.
+ */
+@Injectable()
+export class VendasDiariasService {
+  private readonly logger = new Logger(VendasDiariasService.name);
+
+  constructor(private readonly prisma: PrismaService) {}
+
+  async registrar(tx: Tx, pedido: PedidoRollup, sinal: 1 | -1 = 1): Promise<void> {
+    const dia = diaLocal(pedido.createdAt);
+
+    await tx.$executeRaw`
+      INSERT INTO "vendas_diarias" ("empresaId", "dia", "status", "pedidos", "total")
+      VALUES (${pedido.empresaId}, ${dia}::date, ${pedido.status}, ${sinal}, ${sinal * Number(pedido.total)})
+      ON CONFLICT ("empresaId", "dia", "status") DO UPDATE
+      SET "pedidos" = "vendas_diarias"."pedidos" + EXCLUDED."pedidos",
+          "total" = "vendas_diarias"."total" + EXCLUDED."total"`;
+
+    // Um INSERT ... ON CONFLICT não pode tocar a mesma linha duas vezes: somar por produto antes
+    const porProduto = new Map<string, { quantidade: number; subtotal: number }>();
+    for (const item of pedido.itens) {
+      const acc = porProduto.get(item.produtoId) ?? { quantidade: 0, subtotal: 0 };
+      acc.quantidade += item.quantidade;
+      acc.subtotal += Number(item.subtotal);
+      porProduto.set(item.produtoId, acc);
+    }
+    if (porProduto.size === 0) return;
+
+    const produtoIds = [...porProduto.keys()];
+    const quantidades = produtoIds.map((id) => sinal * porProduto.get(id).quantidade);
+    const subtotais = produtoIds.map((id) => sinal * porProduto.get(id).subtotal);
+
+    await tx.$executeRaw`
+      INSERT INTO "vendas_diarias_produtos" ("empresaId", "dia", "status", "produtoId", "quantidade", "subtotal")
+      SELECT ${pedido.empresaId}, ${dia}::date, ${pedido.status}, t.produto_id, t.quantidade, t.subtotal
+      FROM unnest(${produtoIds}::text[], ${quantidades}::int[], ${subtotais}::float8[])
+        AS t(produto_id, quantidade, subtotal)
+      ON CONFLICT ("empresaId", "dia", "status", "produtoId") DO UPDATE
+      SET "quantidade" = "vendas_diarias_produtos"."quantidade" + EXCLUDED."quantidade",
+          "subtotal" = "vendas_diarias_produtos"."subtotal" + EXCLUDED."subtotal"`;
+  }
+
+  /** Move o pedido (já com o status novo) da linha `statusAnterior` para a do status atual. */
+  async moverStatus(tx: Tx, pedido: PedidoRollup, statusAnterior: string): Promise<void> {
+    if (statusAnterior === pedido.status) return;
+    await this.registrar(tx, { ...pedido, status: statusAnterior }, -1);
+    await this.registrar(tx, pedido, 1);
+  }
+
+  async reconstruir(empresaId?: string): Promise<void> {
+    await reconstruirVendasDiarias(this.prisma, empresaId);
+    this.logger.log(`Rollup de vendas reconstruído${empresaId ? ` para empresa ${empresaId}` : ''}`);
+  }
+}
+
+/**
+ * Recalcula o rollup a partir de pedidos/itens_pedido (todas as empresas ou uma).
+ *
+ * Bloqueia escritas em `pedidos` (LOCK SHARE) até terminar, para que nenhum
+ * checkout ou mudança de status aconteça entre o DELETE e o INSERT.
+ */
+export async function reconstruirVendasDiarias(prisma: PrismaClient, empresaId?: string): Promise<void> {
+  const empresa = empresaId ?? null;
+  await prisma.$transaction(
+    async (tx) => {
+      await tx.$executeRaw`LOCK TABLE "pedidos" IN SHARE MODE`;
+      await tx.$executeRaw`
+        DELETE FROM "vendas_diarias_produtos" WHERE ${empresa}::text IS NULL OR "empresaId" = ${empresa}`;
+      await tx.$executeRaw`
+        DELETE FROM "vendas_diarias" WHERE ${empresa}::text IS NULL OR "empresaId" = ${empresa}`;
+      await tx.$executeRaw`
+        INSERT INTO "vendas_diarias" ("empresaId", "dia", "status", "pedidos", "total")
+        SELECT p."empresaId", (p."createdAt" AT TIME ZONE 'UTC' AT TIME ZONE ${FUSO_HORARIO})::date, p."status",
+               count(*), coalesce(sum(p."total"), 0)
+        FROM "pedidos" p
+        WHERE ${empresa}::text IS NULL OR p."empresaId" = ${empresa}
+        GROUP BY 1, 2, 3`;
+      await tx.$executeRaw`
+        INSERT INTO "vendas_diarias_produtos" ("empresaId", "dia", "status", "produtoId", "quantidade", "subtotal")
+        SELECT p."empresaId", (p."createdAt" AT TIME ZONE 'UTC' AT TIME ZONE ${FUSO_HORARIO})::date, p."status",
+               i."produtoId", sum(i."quantidade"), coalesce(sum(i."subtotal"), 0)
+        FROM "itens_pedido" i
+        JOIN "pedidos" p ON p."id" = i."pedidoId"
+        WHERE ${empresa}::text IS NULL OR p."empresaId" = ${empresa}
+        GROUP BY 1, 2, 3, 4`;
+    },
+    { timeout: 10 * 60_000 },
+  );
+}
@@ -1,4 +1,5 @@
 import { NestFactory } from '@nestjs/core';
+import { NestExpressApplication } from '@nestjs/platform-express';
 import { ValidationPipe, Logger } from '@nestjs/common';
 import { AppModule } from './app.module';
 import { checkPortStatus, findAvailablePort } from './utils/port-checker';
@@ -39,7 +40,16 @@ async function bootstrap() {
       environment: process.env.NODE_ENV,
       tracesSampleRate: 0.1,
     });
-    const app = await NestFactory.create(AppModule);
+    const app = await NestFactory.create<NestExpressApplication>(AppModule);
+
+    // Atrás do proxy (Render) o IP do cliente vem em X-Forwarded-For; sem isso
+    // req.ip é o do proxy e o limite de login por IP vira um limite global.
+    // TRUST_PROXY = número de proxies à frente (padrão 1), 'false' ou uma lista de IPs/sub-redes
+    const trustProxy = process.env.TRUST_PROXY ?? '1';
+    app.set(
+      'trust proxy',
+      /^\d+$/.test(trustProxy) ? Number(trustProxy) : trustProxy === 'false' ? false : trustProxy,
+    );
 
     // Filtro global de exceções para respostas padronizadas
     app.useGlobalFilters(new AllExceptionsFilter());
@@ -74,7 +84,8 @@ async function bootstrap() {
       },
       credentials: true,
       methods: ['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
-      allowedHeaders: ['Content-Type', 'Authorization', 'Accept', 'X-Tenant-Slug', 'x-tenant-slug'],
+      allowedHeaders: ['Content-Type', 'Authorization', 'Accept', 'X-Tenant-Slug', 'x-tenant-slug', 'Idempotency-Key'],
+      exposedHeaders: ['Idempotent-Replayed'],
     });
 
     // Garantir headers CORS sempre presentes e OPTIONS respondido corretamente
@@ -98,7 +109,8 @@ async function bootstrap() {
         res.header('Access-Control-Allow-Credentials', 'true');
       }
       res.header('Access-Control-Allow-Methods', 'GET,POST,PUT,PATCH,DELETE,OPTIONS');
-      res.header('Access-Control-Allow-Headers', 'Content-Type,Authorization,Accept,X-Tenant-Slug,x-tenant-slug');
+      res.header('Access-Control-Allow-Headers', 'Content-Type,Authorization,Accept,X-Tenant-Slug,x-tenant-slug,Idempotency-Key');
+      res.header('Access-Control-Expose-Headers', 'Idempotent-Replayed');
       if (req.method === 'OPTIONS') {
         return res.sendStatus(204);
       }
@@ -1,10 +1,10 @@
 import { Injectable, NestMiddleware, NotFoundException } from '@nestjs/common';
 import { Request, Response, NextFunction } from 'express';
-import { PrismaService } from '../database/prisma.service';
+import { TenantRegistry } from '../common/tenant/tenant-registry.service';
 
 @Injectable()
 export class TenantMiddleware implements NestMiddleware {
-  constructor(private readonly prisma: PrismaService) {}
+  constructor(private readonly tenants: TenantRegistry) {}
 
   async use(req: Request, res: Response, next: NextFunction) {
     // Primeiro, tentar obter o tenant do header (útil para desenvolvimento e APIs)
@@ -13,10 +13,8 @@ export class TenantMiddleware implements NestMiddleware {
     let empresa;
     
     if (tenantSlug) {
-      // Buscar empresa pelo slug do header
-      empresa = await this.prisma.empresa.findUnique({
-        where: { slug: tenantSlug },
-      });
+      // Buscar empresa pelo slug do header (cache em memória, ver TenantRegistry)
+      empresa = await this.tenants.porSlug(tenantSlug);
     } else {
       // Extrair host do request
       const host = req.get('host') || req.hostname;
@@ -31,10 +29,8 @@ export class TenantMiddleware implements NestMiddleware {
         return next();
       }
 
-      // Buscar empresa pelo subdomínio
-      empresa = await this.prisma.empresa.findUnique({
-        where: { subdominio: subdomain },
-      });
+      // Buscar empresa pelo subdomínio (inclusive os inexistentes ficam em cache)
+      empresa = await this.tenants.porSubdominio(subdomain);
     }
 
     if (!empresa) {
@@ -1,4 +1,4 @@
-import { Controller, Post, Body, HttpCode, HttpStatus } from '@nestjs/common';
+import { Controller, Post, Body, HttpCode, HttpStatus, Ip } from '@nestjs/common';
 import { AuthService } from './auth.service';
 import { LoginDto, SignupDto, RefreshTokenDto, CreateAccountFromOrderDto, CadastroEmpresaDto } from './dto';
 import { Public } from '../../decorators/public.decorator';
@@ -10,8 +10,8 @@ export class AuthController {
   @Public()
   @Post('login')
   @HttpCode(HttpStatus.OK)
-  async login(@Body() loginDto: LoginDto) {
-    return this.authService.login(loginDto);
+  async login(@Body() loginDto: LoginDto, @Ip() ip: string) {
+    return this.authService.login(loginDto, ip);
   }
 
   @Public()
@@ -6,6 +6,10 @@ import { AuthService } from './auth.service';
 import { AuthController } from './auth.controller';
 import { JwtStrategy } from './strategies/jwt.strategy';
 import { LocalStrategy } from './strategies/local.strategy';
+import { PrincipalCache } from './principal-cache.service';
+import { SenhaHasher } from './senha-hasher.service';
+import { LoginAdmissao } from './login-admissao.service';
+import { RefreshTokenStore } from './refresh-token-store.service';
 
 @Module({
   imports: [
@@ -22,7 +26,7 @@ import { LocalStrategy } from './strategies/local.strategy';
     }),
   ],
   controllers: [AuthController],
-  providers: [AuthService, JwtStrategy, LocalStrategy],
-  exports: [AuthService],
+  providers: [AuthService, JwtStrategy, LocalStrategy, PrincipalCache, SenhaHasher, LoginAdmissao, RefreshTokenStore],
+  exports: [AuthService, PrincipalCache, SenhaHasher],
 })
 export class AuthModule {}
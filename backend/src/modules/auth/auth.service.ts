@@ -1,5 +1,6 @@
 import {
   Injectable,
+  Logger,
   UnauthorizedException,
   ConflictException,
   BadRequestException,
@@ -7,17 +8,24 @@ import {
 import { JwtService } from '@nestjs/jwt';
 import { ConfigService } from '@nestjs/config';
 import { PrismaService } from '../../database/prisma.service';
-import * as bcrypt from 'bcrypt';
 import { v4 as uuidv4 } from 'uuid';
 import { LoginDto, SignupDto, CreateAccountFromOrderDto, CadastroEmpresaDto } from './dto';
 import { JwtPayload } from './interfaces/jwt-payload.interface';
+import { SenhaHasher } from './senha-hasher.service';
+import { LoginAdmissao } from './login-admissao.service';
+import { RefreshTokenStore } from './refresh-token-store.service';
 
 @Injectable()
 export class AuthService {
+  private readonly logger = new Logger(AuthService.name);
+
   constructor(
     private readonly prisma: PrismaService,
     private jwtService: JwtService,
     private configService: ConfigService,
+    private readonly senhas: SenhaHasher,
+    private readonly admissao: LoginAdmissao,
+    private readonly refreshTokens: RefreshTokenStore,
   ) {}
 
   // Modo mock desativado por política
@@ -29,6 +37,28 @@ export class AuthService {
     return { id: 'dev-empresa', nome: 'Empresa Dev', slug: this.devSlug(), subdominio: this.devSlug(), ativo: true, telefone: '', endereco: '' };
   }
 
+  /**
+   * Claims do access token. Com JWT_EMBED_CLAIMS=true o token também leva
+   * nome e slug da empresa, e o JwtStrategy monta o usuário sem ir ao banco;
+   * nesse modo uma desativação só vale quando o token expira (JWT_EXPIRES_IN).
+   */
+  private buildPayload(
+    usuario: { id: string; email: string; nome: string; tipo: string; empresaId: string | null },
+    empresa?: { slug: string | null } | null,
+  ): JwtPayload {
+    const payload: JwtPayload = {
+      sub: usuario.id,
+      email: usuario.email,
+      role: usuario.tipo,
+      empresaId: usuario.empresaId,
+    };
+    if (this.configService.get<string>('JWT_EMBED_CLAIMS') === 'true') {
+      payload.nome = usuario.nome;
+      payload.empresaSlug = empresa?.slug ?? null;
+    }
+    return payload;
+  }
+
   async validateUser(email: string, senha: string): Promise<any> {
     if (this.useMockAuth) {
       throw new UnauthorizedException('Mock auth está desativada.');
@@ -67,17 +97,28 @@ export class AuthService {
       throw new UnauthorizedException('Usuário inativo');
     }
 
-    const senhaValida = await bcrypt.compare(senha, usuario.senha);
+    const senhaValida = await this.senhas.compare(senha, usuario.senha);
 
     if (!senhaValida) {
       throw new UnauthorizedException('Senha inválida');
     }
 
+    // BCRYPT_COST mudou desde o cadastro: refaz o hash com a senha que acabou de ser conferida
+    if (this.senhas.precisaRehash(usuario.senha)) {
+      this.senhas
+        .hash(senha)
+        .then((novoHash) =>
+          // Condição na senha antiga: não sobrescreve uma troca de senha feita no meio tempo
+          this.prisma.usuario.update({ where: { id: usuario.id, senha: usuario.senha }, data: { senha: novoHash } }),
+        )
+        .catch((err) => this.logger.warn(`Falha ao refazer o hash da senha do usuário ${usuario.id}: ${err}`));
+    }
+
     const { senha: _, ...result } = usuario;
     return result;
   }
 
-  async login(loginDto: LoginDto) {
+  async login(loginDto: LoginDto, ip?: string) {
     if (!this.prisma.connected) {
       const usuario = {
         id: 'dev-user',
@@ -111,14 +152,17 @@ export class AuthService {
         empresa: usuario.empresa,
       };
     }
-    const usuario = await this.validateUser(loginDto.email, loginDto.senha);
+    this.admissao.admitir(ip, loginDto.email);
+    let usuario: any;
+    try {
+      usuario = await this.validateUser(loginDto.email, loginDto.senha);
+    } catch (error) {
+      if (error instanceof UnauthorizedException) this.admissao.registrarFalha(ip);
+      throw error;
+    }
+    this.admissao.liberar(loginDto.email);
 
-    const payload: JwtPayload = {
-      sub: usuario.id,
-      email: usuario.email,
-      role: usuario.tipo,
-      empresaId: usuario.empresaId,
-    };
+    const payload = this.buildPayload(usuario, usuario.empresa);
 
     const accessToken = this.jwtService.sign(payload);
     const refreshToken = await this.generateRefreshToken(usuario.id);
@@ -164,7 +208,7 @@ export class AuthService {
     }
 
     // Hash da senha
-    const hashedPassword = await bcrypt.hash(signupDto.senha, 10);
+    const hashedPassword = await this.senhas.hash(signupDto.senha);
 
     // Criar usuário
     const usuario = await this.prisma.usuario.create({
@@ -193,12 +237,7 @@ export class AuthService {
       },
     });
 
-    const payload: JwtPayload = {
-      sub: usuario.id,
-      email: usuario.email,
-      role: usuario.tipo,
-      empresaId: usuario.empresaId,
-    };
+    const payload = this.buildPayload(usuario, usuario.empresa);
 
     const accessToken = this.jwtService.sign(payload);
     const refreshToken = await this.generateRefreshToken(usuario.id);
@@ -225,39 +264,23 @@ export class AuthService {
       throw new UnauthorizedException('Indisponível no modo desenvolvimento');
     }
 
-    const storedToken = await this.prisma.refreshToken.findUnique({
-      where: { token: refreshToken },
-    });
-
-    if (!storedToken) {
-      throw new UnauthorizedException('Token inválido');
-    }
-
-    if (new Date() > storedToken.expiresAt) {
-      await this.prisma.refreshToken.delete({
-        where: { token: refreshToken },
-      });
-      throw new UnauthorizedException('Token expirado');
-    }
+    // Rotação: o token recebido deixa de valer e o cliente passa a usar o novo
+    const rotacao = await this.refreshTokens.rotacionar(refreshToken);
 
     const usuario = await this.prisma.usuario.findUnique({
-      where: { id: storedToken.usuarioId },
+      where: { id: rotacao.usuarioId },
+      include: { empresa: { select: { slug: true } } },
     });
 
     if (!usuario || !usuario.ativo) {
       throw new UnauthorizedException('Usuário inválido ou inativo');
     }
 
-    const payload: JwtPayload = {
-      sub: usuario.id,
-      email: usuario.email,
-      role: usuario.tipo,
-      empresaId: usuario.empresaId,
-    };
+    const payload = this.buildPayload(usuario, usuario.empresa);
 
     const accessToken = this.jwtService.sign(payload);
 
-    return { accessToken };
+    return { accessToken, refreshToken: rotacao.refreshToken };
   }
 
   async logout(refreshToken: string) {
@@ -265,14 +288,8 @@ export class AuthService {
       throw new UnauthorizedException('Mock auth está desativada.');
     }
 
-    const storedToken = await this.prisma.refreshToken.findUnique({
-      where: { token: refreshToken },
-    });
-
-    if (storedToken) {
-      await this.prisma.refreshToken.delete({
-        where: { token: refreshToken },
-      });
+    if (refreshToken) {
+      await this.refreshTokens.revogar(refreshToken);
     }
 
     return { message: 'Logout realizado com sucesso' };
@@ -286,22 +303,7 @@ export class AuthService {
       return uuidv4();
     }
 
-    const token = uuidv4();
-    const expiresIn = this.configService.get<string>('JWT_REFRESH_EXPIRES_IN', '7d');
-    
-    // Converter expiresIn para milissegundos
-    const expiresInMs = this.parseTimeToMs(expiresIn);
-    const expiresAt = new Date(Date.now() + expiresInMs);
-
-    await this.prisma.refreshToken.create({
-      data: {
-        token,
-        usuarioId,
-        expiresAt,
-      },
-    });
-
-    return token;
+    return this.refreshTokens.emitir(usuarioId);
   }
 
   async createAccountFromOrder(createAccountDto: CreateAccountFromOrderDto) {
@@ -315,7 +317,7 @@ export class AuthService {
     }
 
     // Hash da senha
-    const hashedPassword = await bcrypt.hash(createAccountDto.senha, 10);
+    const hashedPassword = await this.senhas.hash(createAccountDto.senha);
 
     // Criar usuário
     const usuario = await this.prisma.usuario.create({
@@ -329,12 +331,7 @@ export class AuthService {
       include: { empresa: true, endereco: true },
     });
 
-    const payload: JwtPayload = {
-      sub: usuario.id,
-      email: usuario.email,
-      role: usuario.tipo,
-      empresaId: usuario.empresaId,
-    };
+    const payload = this.buildPayload(usuario, usuario.empresa);
 
     const accessToken = this.jwtService.sign(payload);
     const refreshToken = await this.generateRefreshToken(usuario.id);
@@ -372,7 +369,7 @@ export class AuthService {
     }
 
     // Hash da senha do admin
-    const hashedPassword = await bcrypt.hash(cadastroEmpresaDto.senhaAdmin, 10);
+    const hashedPassword = await this.senhas.hash(cadastroEmpresaDto.senhaAdmin);
 
     // Criar empresa e usuário admin em uma transação
     const resultado = await this.prisma.$transaction(async (tx) => {
@@ -429,12 +426,7 @@ export class AuthService {
     });
 
     // Gerar tokens JWT
-    const payload: JwtPayload = {
-      sub: resultado.usuarioAdmin.id,
-      email: resultado.usuarioAdmin.email,
-      role: resultado.usuarioAdmin.tipo,
-      empresaId: resultado.usuarioAdmin.empresaId,
-    };
+    const payload = this.buildPayload(resultado.usuarioAdmin, resultado.empresa);
 
     const accessToken = this.jwtService.sign(payload);
     const refreshToken = await this.generateRefreshToken(resultado.usuarioAdmin.id);
@@ -457,25 +449,4 @@ export class AuthService {
       },
     };
   }
-
-  private parseTimeToMs(time: string): number {
-    const match = time.match(/^(\d+)([dhms])$/);
-    if (!match) return 7 * 24 * 60 * 60 * 1000; // Default 7 dias
-
-    const value = parseInt(match[1]);
-    const unit = match[2];
-
-    switch (unit) {
-      case 'd':
-        return value * 24 * 60 * 60 * 1000;
-      case 'h':
-        return value * 60 * 60 * 1000;
-      case 'm':
-        return value * 60 * 1000;
-      case 's':
-        return value * 1000;
-      default:
-        return 7 * 24 * 60 * 60 * 1000;
-    }
-  }
 }
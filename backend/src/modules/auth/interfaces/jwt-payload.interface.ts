@@ -3,4 +3,8 @@ export interface JwtPayload {
   email: string;
   role: string;
   empresaId?: string;
+  iat?: number; // preenchido na assinatura
+  // Só com JWT_EMBED_CLAIMS=true (ver AuthService.buildPayload)
+  nome?: string;
+  empresaSlug?: string | null;
 }
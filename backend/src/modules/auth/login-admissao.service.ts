@@ -0,0 +1,75 @@
+import { HttpException, HttpStatus, Injectable } from '@nestjs/common';
+import { TtlLruCache } from '../../common/cache/ttl-lru-cache';
+
+interface Contador {
+  total: number;
+  inicio: number;
+}
+
+/**
+ * Controle de admissão do login: cada tentativa custa um bcrypt, então IPs e
+ * e-mails têm um limite por janela fixa (LOGIN_JANELA_MS, padrão 60s) antes
+ * de chegar ao SenhaHasher.
+ *
+ * - LOGIN_MAX_POR_IP (padrão 30): conta só logins que falharam, então uma loja
+ *   inteira atrás do mesmo NAT não esbarra no limite entrando normalmente
+ * - LOGIN_MAX_POR_EMAIL (padrão 10): conta toda tentativa (inclusive as
+ *   simultâneas) e zera no login certo; segura força bruta numa conta
+ *
+ * O IP vem de `req.ip`, que respeita o `trust proxy` configurado em main.ts.
+ * Contadores em memória, por instância.
+ */
+@Injectable()
+export class LoginAdmissao {
+  private readonly janelaMs = Number(process.env.LOGIN_JANELA_MS || 60_000);
+  private readonly maxPorIp = Number(process.env.LOGIN_MAX_POR_IP || 30);
+  private readonly maxPorEmail = Number(process.env.LOGIN_MAX_POR_EMAIL || 10);
+  // A entrada expira junto com a janela; o contador é alterado no lugar para não renovar o TTL
+  private readonly contadores = new TtlLruCache<string, Contador>(100_000, this.janelaMs);
+
+  /** Conta a tentativa no e-mail ou recusa com 429 se o IP ou o e-mail passou do limite. */
+  admitir(ip: string | undefined, email: string): void {
+    const agora = Date.now();
+    const porEmail = this.contador(chaveEmail(email), agora);
+    const porIp = ip ? this.contador(`ip:${ip}`, agora) : undefined;
+
+    const estourado =
+      porEmail.total >= this.maxPorEmail ? porEmail : porIp && porIp.total >= this.maxPorIp ? porIp : undefined;
+    if (estourado) {
+      const retryAfter = Math.max(1, Math.ceil((estourado.inicio + this.janelaMs - agora) / 1000));
+      throw new HttpException(
+        {
+          statusCode: HttpStatus.TOO_MANY_REQUESTS,
+          message: 'Muitas tentativas de login. Tente novamente em instantes.',
+          retryAfter,
+        },
+        HttpStatus.TOO_MANY_REQUESTS,
+      );
+    }
+
+    porEmail.total++;
+  }
+
+  /** Login recusado (usuário ou senha): conta contra o IP. */
+  registrarFalha(ip: string | undefined): void {
+    if (ip) this.contador(`ip:${ip}`, Date.now()).total++;
+  }
+
+  /** Login bem-sucedido: as tentativas anteriores do e-mail deixam de contar. */
+  liberar(email: string): void {
+    this.contadores.delete(chaveEmail(email));
+  }
+
+  private contador(chave: string, agora: number): Contador {
+    let contador = this.contadores.get(chave);
+    if (!contador) {
+      contador = { total: 0, inicio: agora };
+      this.contadores.set(chave, contador);
+    }
+    return contador;
+  }
+}
+
+function chaveEmail(email: string): string {
+  return `email:${email.trim().toLowerCase()}`;
+}
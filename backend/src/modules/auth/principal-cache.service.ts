@@ -0,0 +1,97 @@
+import { Injectable } from '@nestjs/common';
+import { PrismaService } from '../../database/prisma.service';
+import { TtlLruCache } from '../../common/cache/ttl-lru-cache';
+
+export interface AuthPrincipal {
+  sub: string;
+  id: string;
+  email: string;
+  nome: string;
+  role: string;
+  empresaId: string | null;
+  empresa: {
+    id: string;
+    nome?: string;
+    slug: string | null;
+    subdominio?: string | null;
+    ativo?: boolean;
+  } | null;
+}
+
+const ESCRITAS = new Set(['update', 'updateMany', 'upsert', 'delete', 'deleteMany']);
+
+/**
+ * Cache curto do usuário autenticado (request.user), chaveado por `sub` + `iat`
+ * do access token.
+ *
+ * O TTL (AUTH_PRINCIPAL_CACHE_TTL_MS, padrão 30s) limita quanto tempo uma
+ * mudança feita por outra instância leva para valer. Neste processo, qualquer
+ * escrita em Usuario remove as entradas daquele usuário na hora (desativação,
+ * troca de tipo ou de empresa). Uma escrita em Empresa limpa tudo, porque o
+ * principal carrega os dados da empresa.
+ */
+@Injectable()
+export class PrincipalCache {
+  private readonly cache = new TtlLruCache<string, AuthPrincipal>(
+    Number(process.env.AUTH_PRINCIPAL_CACHE_MAX || 50_000),
+    Number(process.env.AUTH_PRINCIPAL_CACHE_TTL_MS || 30_000),
+  );
+  // Tokens em cache de cada usuário (um por sessão/refresh)
+  private readonly chavesPorUsuario = new Map<string, Set<string>>();
+  private geracao = 0;
+
+  constructor(private readonly prisma: PrismaService) {
+    this.prisma.$use(async (params, next) => {
+      const result = await next(params);
+      if (ESCRITAS.has(params.action)) {
+        if (params.model === 'Usuario' && result?.id && !params.action.endsWith('Many')) {
+          this.invalidar(result.id);
+        } else if (params.model === 'Usuario' || params.model === 'Empresa') {
+          this.invalidarTudo();
+        }
+      }
+      return result;
+    });
+  }
+
+  /** Retorna o principal em cache ou o carrega com `carregar` (que pode lançar). */
+  async obter(sub: string, iat: number | undefined, carregar: () => Promise<AuthPrincipal>): Promise<AuthPrincipal> {
+    const chave = `${sub}:${iat ?? ''}`;
+    const emCache = this.cache.get(chave);
+    if (emCache) return emCache;
+
+    const geracao = this.geracao;
+    const principal = await carregar();
+    if (geracao === this.geracao) {
+      this.cache.set(chave, principal);
+      const chaves = this.chavesPorUsuario.get(sub) ?? new Set<string>();
+      chaves.add(chave);
+      this.chavesPorUsuario.set(sub, chaves);
+      if (this.chavesPorUsuario.size > this.cache.size * 2) this.podarIndice();
+    }
+    return principal;
+  }
+
+  invalidar(usuarioId: string): void {
+    this.geracao++;
+    for (const chave of this.chavesPorUsuario.get(usuarioId) ?? []) {
+      this.cache.delete(chave);
+    }
+    this.chavesPorUsuario.delete(usuarioId);
+  }
+
+  invalidarTudo(): void {
+    this.geracao++;
+    this.cache.clear();
+    this.chavesPorUsuario.clear();
+  }
+
+  private podarIndice(): void {
+    for (const [usuarioId, chaves] of this.chavesPorUsuario) {
+      for (const chave of chaves) {
+        if (!this.cache.has(chave)) chaves.delete(chave);
+      }
+      if (chaves.size === 0) this.chavesPorUsuario.delete(usuarioId);
+    }
+  }
+}
@@ -0,0 +1,187 @@
+import { Injectable, Logger, OnModuleDestroy, OnModuleInit, UnauthorizedException } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { createHash, randomBytes, randomUUID } from 'crypto';
+import { PrismaService } from '../../database/prisma.service';
+
+const LOTE_LIMPEZA = 1_000;
+const PAUSA_ENTRE_LOTES_MS = 50;
+
+/**
+ * Refresh tokens: emissão, rotação e revogação (tabela refresh_tokens).
+ *
+ * - O banco guarda só o sha256 do token; a busca é pelo índice único do hash.
+ * - Cada login abre uma família. O refresh marca o token como usado e emite o
+ *   próximo da mesma família; a família guarda só o token atual e o anterior.
+ *   A família vence JWT_REFRESH_EXPIRES_IN depois do login: a rotação não estende o prazo.
+ * - Datas comparadas com o relógio do Node (parâmetro), não CURRENT_TIMESTAMP:
+ *   as colunas guardam UTC sem fuso e o fuso da sessão pode ser outro.
+ * - Apresentar de novo um token já usado é sinal de vazamento: a família
+ *   inteira é revogada. A exceção são refreshes simultâneos (duas abas) dentro
+ *   de REFRESH_REUSE_GRACE_MS, que recebem outro token da mesma família.
+ * - Cada usuário tem no máximo REFRESH_MAX_SESSOES famílias; um login além
+ *   disso encerra as sessões menos recentes.
+ * - Tokens expirados são apagados em lotes pequenos (FOR UPDATE SKIP LOCKED)
+ *   a cada REFRESH_SWEEP_INTERVAL_MS, sem travar a tabela.
+ */
+@Injectable()
+export class RefreshTokenStore implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(RefreshTokenStore.name);
+  private readonly ttlMs: number;
+  private readonly graceMs = Number(process.env.REFRESH_REUSE_GRACE_MS || 30_000);
+  private readonly maxSessoes = Math.max(1, Number(process.env.REFRESH_MAX_SESSOES || 10));
+  private readonly intervaloLimpezaMs = Number(process.env.REFRESH_SWEEP_INTERVAL_MS || 5 * 60_000);
+  private limpeza?: NodeJS.Timeout;
+  private limpando = false;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    configService: ConfigService,
+  ) {
+    this.ttlMs = parseTimeToMs(configService.get<string>('JWT_REFRESH_EXPIRES_IN', '7d'));
+  }
+
+  onModuleInit() {
+    this.limpeza = setInterval(() => void this.limparExpirados(), this.intervaloLimpezaMs);
+    this.limpeza.unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.limpeza);
+  }
+
+  /** Novo login: abre uma família, respeitando o limite de sessões do usuário. */
+  async emitir(usuarioId: string): Promise<string> {
+    // Mantém as maxSessoes - 1 famílias mais recentes; a nova completa o limite
+    await this.prisma.$executeRaw`
+      DELETE FROM "refresh_tokens"
+      WHERE "usuarioId" = ${usuarioId}
+        AND "familia" IN (
+          SELECT "familia" FROM "refresh_tokens"
+          WHERE "usuarioId" = ${usuarioId}
+          GROUP BY "familia"
+          ORDER BY max("createdAt") DESC
+          OFFSET ${this.maxSessoes - 1}
+        )`;
+    return this.criar(usuarioId, randomUUID(), new Date(Date.now() + this.ttlMs));
+  }
+
+  /** Troca `token` pelo próximo da família. Lança 401 se inválido, expirado ou reutilizado. */
+  async rotacionar(token: string): Promise<{ usuarioId: string; refreshToken: string }> {
+    const tokenHash = hashToken(token);
+
+    // Marca como usado só se ainda não foi: dois refreshes com o mesmo token não passam os dois por aqui
+    const agora = new Date();
+    const [atual] = await this.prisma.$queryRaw<{ id: string; familia: string; usuarioId: string; expiresAt: Date }[]>`
+      UPDATE "refresh_tokens"
+      SET "usadoEm" = ${agora}
+      WHERE "tokenHash" = ${tokenHash} AND "usadoEm" IS NULL AND "expiresAt" > ${agora}
+      RETURNING "id", "familia", "usuarioId", "expiresAt"`;
+
+    if (atual) {
+      const refreshToken = await this.criar(atual.usuarioId, atual.familia, atual.expiresAt);
+      // Da família ficam só o token novo e este (para detectar reuso)
+      await this.prisma.refreshToken.deleteMany({
+        where: { familia: atual.familia, usadoEm: { not: null }, id: { not: atual.id } },
+      });
+      return { usuarioId: atual.usuarioId, refreshToken };
+    }
+
+    const registro = await this.prisma.refreshToken.findUnique({ where: { tokenHash } });
+    if (!registro) {
+      throw new UnauthorizedException('Token inválido');
+    }
+    if (registro.expiresAt <= agora) {
+      await this.prisma.refreshToken.deleteMany({ where: { id: registro.id } });
+      throw new UnauthorizedException('Token expirado');
+    }
+    if (agora.getTime() - registro.usadoEm.getTime() <= this.graceMs) {
+      return {
+        usuarioId: registro.usuarioId,
+        refreshToken: await this.criar(registro.usuarioId, registro.familia, registro.expiresAt),
+      };
+    }
+
+    const revogados = await this.prisma.refreshToken.deleteMany({ where: { familia: registro.familia } });
+    this.logger.warn(
+      `Refresh token reutilizado (usuário ${registro.usuarioId}); ${revogados.count} tokens da família revogados`,
+    );
+    throw new UnauthorizedException('Sessão encerrada por segurança. Faça login novamente.');
+  }
+
+  /** Logout: encerra a sessão (família) do token. */
+  async revogar(token: string): Promise<void> {
+    const registro = await this.prisma.refreshToken.findUnique({
+      where: { tokenHash: hashToken(token) },
+      select: { familia: true },
+    });
+    if (registro) {
+      await this.prisma.refreshToken.deleteMany({ where: { familia: registro.familia } });
+    }
+  }
+
+  /** Apaga tokens expirados em lotes de LOTE_LIMPEZA. */
+  async limparExpirados(): Promise<number> {
+    if (this.limpando) return 0;
+    this.limpando = true;
+    let total = 0;
+    try {
+      for (;;) {
+        const apagados = await this.prisma.$executeRaw`
+          DELETE FROM "refresh_tokens"
+          WHERE "id" IN (
+            SELECT "id" FROM "refresh_tokens"
+            WHERE "expiresAt" < ${new Date()}
+            LIMIT ${LOTE_LIMPEZA}
+            FOR UPDATE SKIP LOCKED
+          )`;
+        total += apagados;
+        if (apagados < LOTE_LIMPEZA) break;
+        await new Promise((resolve) => setTimeout(resolve, PAUSA_ENTRE_LOTES_MS));
+      }
+      if (total > 0) this.logger.log(`${total} refresh tokens expirados removidos`);
+    } catch (err) {
+      this.logger.warn(`Falha ao limpar refresh tokens: ${err}`);
+    } finally {
+      this.limpando = false;
+    }
+    return total;
+  }
+
+  private async criar(usuarioId: string, familia: string, expiresAt: Date): Promise<string> {
+    const token = randomBytes(32).toString('base64url');
+    await this.prisma.refreshToken.create({
+      data: {
+        tokenHash: hashToken(token),
+        familia,
+        usuarioId,
+        expiresAt,
+      },
+    });
+    return token;
+  }
+}
+
+function hashToken(token: string): string {
+  return createHash('sha256').update(token).digest('hex');
+}
+
+function parseTimeToMs(time: string): number {
+  const match = time.match(/^(\d+)([dhms])$/);
+  if (!match) return 7 * 24 * 60 * 60 * 1000; // Default 7 dias
+
+  const value = parseInt(match[1]);
+  const unit = match[2];
+
+  switch (unit) {
+    case 'd':
+      return value * 24 * 60 * 60 * 1000;
+    case 'h':
+      return value * 60 * 60 * 1000;
+    case 'm':
+      return value * 60 * 1000;
+    case 's':
+      return value * 1000;
+    default:
+      return 7 * 24 * 60 * 60 * 1000;
+  }
+}
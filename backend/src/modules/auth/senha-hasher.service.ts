@@ -0,0 +1,167 @@
+import { HttpException, HttpStatus, Injectable, Logger, OnModuleDestroy } from '@nestjs/common';
+import { existsSync } from 'fs';
+import { cpus } from 'os';
+import * as path from 'path';
+import { Worker } from 'worker_threads';
+import * as bcrypt from 'bcrypt';
+
+type Operacao = { op: 'hash'; senha: string; custo: number } | { op: 'compare'; senha: string; hash: string };
+
+interface Tarefa {
+  id: number;
+  operacao: Operacao;
+  enfileiradaEm: number;
+  resolve: (resultado: any) => void;
+  reject: (erro: Error) => void;
+}
+
+interface Trabalhador {
+  worker: Worker;
+  tarefa?: Tarefa;
+}
+
+export interface MetricasSenhaHasher {
+  workers: number;
+  ocupados: number;
+  fila: number;
+  filaMaxima: number;
+  concluidas: number;
+  rejeitadas: number;
+  esperaMediaMs: number;
+}
+
+const ARQUIVO_WORKER = path.join(__dirname, 'senha-hasher.worker.js');
+
+/**
+ * Hash e comparação de senhas (bcrypt) num pool próprio de worker threads.
+ *
+ * O bcrypt assíncrono roda no threadpool do libuv (4 threads por padrão), o
+ * mesmo usado por arquivos, DNS e crypto; um pico de logins na abertura das
+ * lojas travava o resto da API. Aqui cada worker faz um bcrypt por vez e o
+ * excedente espera numa fila limitada:
+ *
+ * - BCRYPT_POOL_SIZE: workers (padrão: núcleos - 1, no máximo 4)
+ * - BCRYPT_QUEUE_MAX: tarefas aguardando (padrão 200); com a fila cheia a
+ *   requisição recebe 429 na hora, em vez de esperar e estourar o p99 de todos
+ * - BCRYPT_COST: custo dos hashes novos (padrão 10); hashes com outro custo
+ *   são refeitos no próximo login (`precisaRehash`)
+ *
+ * Sem o worker compilado (ts-node, jest), usa o bcrypt assíncrono direto.
+ */
+@Injectable()
+export class SenhaHasher implements OnModuleDestroy {
+  private readonly logger = new Logger(SenhaHasher.name);
+  readonly custo = Number(process.env.BCRYPT_COST || 10);
+  private readonly tamanho = Math.max(1, Number(process.env.BCRYPT_POOL_SIZE || Math.min(4, cpus().length - 1)));
+  private readonly filaMaxima = Number(process.env.BCRYPT_QUEUE_MAX || 200);
+  private readonly trabalhadores: Trabalhador[] = [];
+  private readonly fila: Tarefa[] = [];
+  private proximoId = 0;
+  private encerrando = false;
+  private concluidas = 0;
+  private rejeitadas = 0;
+  private esperaTotalMs = 0;
+
+  constructor() {
+    if (!existsSync(ARQUIVO_WORKER)) {
+      this.logger.warn('Worker de senha não encontrado; usando bcrypt no threadpool do libuv');
+      return;
+    }
+    for (let i = 0; i < this.tamanho; i++) {
+      this.trabalhadores.push(this.criarTrabalhador());
+    }
+  }
+
+  hash(senha: string): Promise<string> {
+    return this.executar({ op: 'hash', senha, custo: this.custo });
+  }
+
+  compare(senha: string, hash: string): Promise<boolean> {
+    return this.executar({ op: 'compare', senha, hash });
+  }
+
+  /** O hash foi gerado com um custo diferente do configurado. */
+  precisaRehash(hash: string): boolean {
+    try {
+      return bcrypt.getRounds(hash) !== this.custo;
+    } catch {
+      return false;
+    }
+  }
+
+  metricas(): MetricasSenhaHasher {
+    return {
+      workers: this.trabalhadores.length,
+      ocupados: this.trabalhadores.filter((t) => t.tarefa).length,
+      fila: this.fila.length,
+      filaMaxima: this.filaMaxima,
+      concluidas: this.concluidas,
+      rejeitadas: this.rejeitadas,
+      esperaMediaMs: this.concluidas ? Math.round(this.esperaTotalMs / this.concluidas) : 0,
+    };
+  }
+
+  async onModuleDestroy() {
+    this.encerrando = true;
+    await Promise.all(this.trabalhadores.map((t) => t.worker.terminate()));
+  }
+
+  private executar<T>(operacao: Operacao): Promise<T> {
+    if (this.trabalhadores.length === 0) {
+      return (operacao.op === 'hash'
+        ? bcrypt.hash(operacao.senha, operacao.custo)
+        : bcrypt.compare(operacao.senha, operacao.hash)) as Promise<T>;
+    }
+
+    if (this.fila.length >= this.filaMaxima) {
+      this.rejeitadas++;
+      return Promise.reject(
+        new HttpException('Servidor ocupado. Tente novamente em instantes.', HttpStatus.TOO_MANY_REQUESTS),
+      );
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      this.fila.push({ id: ++this.proximoId, operacao, enfileiradaEm: Date.now(), resolve, reject });
+      this.despachar();
+    });
+  }
+
+  private despachar(): void {
+    for (const trabalhador of this.trabalhadores) {
+      if (this.fila.length === 0) return;
+      if (trabalhador.tarefa) continue;
+      const tarefa = this.fila.shift();
+      trabalhador.tarefa = tarefa;
+      this.esperaTotalMs += Date.now() - tarefa.enfileiradaEm;
+      trabalhador.worker.postMessage({ id: tarefa.id, ...tarefa.operacao });
+    }
+  }
+
+  private criarTrabalhador(): Trabalhador {
+    const trabalhador: Trabalhador = { worker: new Worker(ARQUIVO_WORKER) };
+    trabalhador.worker.unref();
+
+    trabalhador.worker.on('message', (msg: { id: number; resultado?: unknown; erro?: string }) => {
+      const tarefa = trabalhador.tarefa;
+      if (!tarefa || tarefa.id !== msg.id) return;
+      trabalhador.tarefa = undefined;
+      this.concluidas++;
+      if (msg.erro !== undefined) tarefa.reject(new Error(msg.erro));
+      else tarefa.resolve(msg.resultado);
+      this.despachar();
+    });
+
+    // Worker morto: falha a tarefa em curso e coloca outro no lugar
+    trabalhador.worker.on('error', (err) => this.logger.error('Worker de senha falhou', err));
+    trabalhador.worker.on('exit', () => {
+      trabalhador.tarefa?.reject(new Error('Worker de senha encerrado'));
+      trabalhador.tarefa = undefined;
+      if (this.encerrando) return;
+      const indice = this.trabalhadores.indexOf(trabalhador);
+      if (indice >= 0) this.trabalhadores[indice] = this.criarTrabalhador();
+      this.despachar();
+    });
+
+    return trabalhador;
+  }
+}
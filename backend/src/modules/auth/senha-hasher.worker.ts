@@ -0,0 +1,14 @@
+import { parentPort } from 'worker_threads';
+import * as bcrypt from 'bcrypt';
+
+// Roda dentro do pool do SenhaHasher: o bcrypt síncrono ocupa só esta thread,
+// sem disputar o threadpool do libuv com banco, arquivos e DNS
+parentPort.on('message', (tarefa: { id: number; op: 'hash' | 'compare'; senha: string; hash?: string; custo?: number }) => {
+  try {
+    const resultado =
+      tarefa.op === 'hash' ? bcrypt.hashSync(tarefa.senha, tarefa.custo) : bcrypt.compareSync(tarefa.senha, tarefa.hash);
+    parentPort.postMessage({ id: tarefa.id, resultado });
+  } catch (err) {
+    parentPort.postMessage({ id: tarefa.id, erro: String((err as Error)?.message ?? err) });
+  }
+});
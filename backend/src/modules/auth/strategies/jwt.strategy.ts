@@ -4,12 +4,14 @@ import { ExtractJwt, Strategy } from 'passport-jwt';
 import { ConfigService } from '@nestjs/config';
 import { JwtPayload } from '../interfaces/jwt-payload.interface';
 import { PrismaService } from '../../../database/prisma.service';
+import { AuthPrincipal, PrincipalCache } from '../principal-cache.service';
 
 @Injectable()
 export class JwtStrategy extends PassportStrategy(Strategy) {
   constructor(
     private readonly prisma: PrismaService,
     private configService: ConfigService,
+    private readonly principals: PrincipalCache,
   ) {
     super({
       jwtFromRequest: ExtractJwt.fromAuthHeaderAsBearerToken(),
@@ -21,14 +23,31 @@ export class JwtStrategy extends PassportStrategy(Strategy) {
   // Modo mock desativado por política: sempre validar contra o banco
   private readonly useMockAuth = false;
 
-  async validate(payload: JwtPayload) {
+  async validate(payload: JwtPayload): Promise<AuthPrincipal> {
     if (this.useMockAuth) {
       // Mock desativado
       throw new UnauthorizedException('Mock auth está desativada.');
     }
 
+    // Token emitido com JWT_EMBED_CLAIMS=true: tudo que os guards usam já está assinado
+    if (payload.nome !== undefined) {
+      return {
+        sub: payload.sub,
+        id: payload.sub,
+        email: payload.email,
+        nome: payload.nome,
+        role: payload.role,
+        empresaId: payload.empresaId ?? null,
+        empresa: payload.empresaId ? { id: payload.empresaId, slug: payload.empresaSlug ?? null } : null,
+      };
+    }
+
+    return this.principals.obter(payload.sub, payload.iat, () => this.carregarUsuario(payload.sub));
+  }
+
+  private async carregarUsuario(id: string): Promise<AuthPrincipal> {
     const usuario = await this.prisma.usuario.findUnique({
-      where: { id: payload.sub },
+      where: { id },
       select: {
         id: true,
         email: true,
@@ -19,6 +19,7 @@ import {
   AtualizarItemCarrinhoDto,
   CheckoutDto,
 } from './dto';
+import { Idempotente } from '../../common/idempotency/idempotente.decorator';
 
 @ApiTags('Carrinho')
 @ApiBearerAuth()
@@ -82,6 +83,7 @@ export class CarrinhoController {
   }
 
   @Post('checkout')
+  @Idempotente('checkout')
   @ApiOperation({ summary: 'Finalizar pedido (checkout)' })
   async checkout(
     @CurrentUser('id') usuarioId: string,
@@ -4,9 +4,10 @@ import { CarrinhoController } from './carrinho.controller';
 import { CarrinhoService } from './carrinho.service';
 import { PrismaModule } from '../../database/prisma.module';
 import { CuponsModule } from '../../cupons/cupons.module';
+import { VendasDiariasModule } from '../../dashboard/vendas-diarias.module';
 
 @Module({
-  imports: [PrismaModule, CuponsModule],
+  imports: [PrismaModule, CuponsModule, VendasDiariasModule],
   controllers: [CarrinhoController],
   providers: [CarrinhoService],
   exports: [CarrinhoService],
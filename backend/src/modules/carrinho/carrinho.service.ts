@@ -4,7 +4,10 @@ import {
   NotFoundException,
   BadRequestException,
   ForbiddenException,
+  ConflictException,
 } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { randomBytes } from 'crypto';
 import { PrismaService } from '../../database/prisma.service';
 import {
   AdicionarItemCarrinhoDto,
@@ -13,10 +16,15 @@ import {
 } from './dto';
 import { Decimal } from '@prisma/client/runtime/library';
 import { CuponsService } from '../../cupons/cupons.service';
+import { VendasDiariasService } from '../../dashboard/vendas-diarias.service';
 
 @Injectable()
 export class CarrinhoService {
-  constructor(private prisma: PrismaService, private cuponsService: CuponsService) {}
+  constructor(
+    private prisma: PrismaService,
+    private cuponsService: CuponsService,
+    private vendasDiarias: VendasDiariasService,
+  ) {}
 
   async obterCarrinho(usuarioId: string, empresaId: string) {
     let carrinho = await this.prisma.carrinho.findFirst({
@@ -247,7 +255,7 @@ export class CarrinhoService {
       throw new BadRequestException('Carrinho vazio');
     }
 
-    // Validar estoque de todos os itens
+    // Validação rápida com o estoque lido; a garantia vem do UPDATE condicional na transação
     for (const item of carrinho.itens) {
       if (item.produto.estoque < item.quantidade) {
         throw new BadRequestException(
@@ -261,87 +269,121 @@ export class CarrinhoService {
       return acc + Number(item.precoUnitario) * item.quantidade;
     }, 0);
 
-    let desconto = 0;
-    if (dto.cupomDesconto) {
-      const resultado = await this.cuponsService.validar(
-        { codigo: dto.cupomDesconto, valorCompra: subtotal },
-        empresaId,
-      );
-      desconto = resultado.desconto;
+    // Quantidade total por produto (o carrinho pode ter o mesmo produto em mais de uma linha)
+    const porProduto = new Map<string, number>();
+    for (const item of carrinho.itens) {
+      porProduto.set(item.produtoId, (porProduto.get(item.produtoId) ?? 0) + item.quantidade);
     }
-    const total = Math.max(subtotal - desconto, 0);
-
-    // Gerar número do pedido
-    const numeroPedido = `PED-${Date.now()}`;
-
-    // Criar pedido e itens em uma transação
-    const pedido = await this.prisma.$transaction(async (tx) => {
-      // Criar pedido
-      const novoPedido = await tx.pedido.create({
-        data: {
-          numero: numeroPedido,
-          subtotal: subtotal,
-          desconto: desconto,
-          total: total,
-          clienteId: usuarioId,
-          empresaId,
-          enderecoEntrega: [
-            dto.enderecoEntrega.rua,
-            dto.enderecoEntrega.numero,
-            dto.enderecoEntrega.complemento ? `(${dto.enderecoEntrega.complemento})` : '',
-            '-',
-            dto.enderecoEntrega.bairro,
-            '-',
-            `${dto.enderecoEntrega.cidade}/${dto.enderecoEntrega.estado}`,
-            '-',
-            dto.enderecoEntrega.cep,
-          ].filter(Boolean).join(' '),
-          formaPagamento: dto.formaPagamento,
-          cupomDesconto: dto.cupomDesconto,
-          observacoes: dto.observacoes,
-        },
-      });
-
-      // Criar itens do pedido
-      for (const item of carrinho.itens) {
-        await tx.itemPedido.create({
+    const produtoIds = [...porProduto.keys()];
+    const quantidades = produtoIds.map((id) => porProduto.get(id));
+
+    // Gerar número do pedido (o sufixo evita colisão entre checkouts no mesmo milissegundo)
+    const numeroPedido = `PED-${Date.now()}-${randomBytes(3).toString('hex').toUpperCase()}`;
+
+    // Pedido, itens, estoque, cupom, rollup e carrinho numa transação só.
+    // READ COMMITTED basta: estoque e cupom são alterados por UPDATEs condicionais,
+    // e o Postgres reavalia a condição depois de esperar o lock da linha, então
+    // checkouts concorrentes não vendem além do estoque nem passam de usoMaximo.
+    const pedido = await this.prisma.$transaction(
+      async (tx) => {
+        // Baixa de estoque num único UPDATE. Os locks são tomados em ordem de id
+        // para que carrinhos com os mesmos produtos não entrem em deadlock.
+        const baixados = await tx.$queryRaw<{ id: string }[]>`
+          WITH pedido AS (
+            SELECT * FROM unnest(${produtoIds}::text[], ${quantidades}::int[]) AS t(id, quantidade)
+          ), travados AS (
+            SELECT p."id" FROM "produtos" p
+            WHERE p."id" IN (SELECT id FROM pedido)
+            ORDER BY p."id"
+            FOR UPDATE
+          )
+          UPDATE "produtos" p
+          SET "estoque" = p."estoque" - pedido.quantidade, "updatedAt" = ${new Date()}
+          FROM pedido
+          WHERE p."id" = pedido.id
+            AND p."id" IN (SELECT "id" FROM travados)
+            AND p."empresaId" = ${empresaId}
+            AND p."ativo"
+            AND p."estoque" >= pedido.quantidade
+          RETURNING p."id"`;
+
+        if (baixados.length < produtoIds.length) {
+          const ok = new Set(baixados.map((linha) => linha.id));
+          const faltando = carrinho.itens.find((item) => !ok.has(item.produtoId));
+          throw new BadRequestException(
+            `Estoque insuficiente para o produto: ${faltando.produto.nome}`,
+          );
+        }
+
+        const desconto = dto.cupomDesconto
+          ? await this.cuponsService.consumir(tx, dto.cupomDesconto, empresaId, subtotal)
+          : 0;
+        const total = Math.max(subtotal - desconto, 0);
+
+        // Criar pedido
+        const novoPedido = await tx.pedido.create({
           data: {
-            pedidoId: novoPedido.id,
-            produtoId: item.produtoId,
-            quantidade: item.quantidade,
-            precoUnitario: item.precoUnitario,
-            subtotal: Number(item.precoUnitario) * item.quantidade,
+            numero: numeroPedido,
+            subtotal: subtotal,
+            desconto: desconto,
+            total: total,
+            clienteId: usuarioId,
+            empresaId,
+            enderecoEntrega: [
+              dto.enderecoEntrega.rua,
+              dto.enderecoEntrega.numero,
+              dto.enderecoEntrega.complemento ? `(${dto.enderecoEntrega.complemento})` : '',
+              '-',
+              dto.enderecoEntrega.bairro,
+              '-',
+              `${dto.enderecoEntrega.cidade}/${dto.enderecoEntrega.estado}`,
+              '-',
+              dto.enderecoEntrega.cep,
+            ].filter(Boolean).join(' '),
+            formaPagamento: dto.formaPagamento,
+            cupomDesconto: dto.cupomDesconto,
+            observacoes: dto.observacoes,
           },
         });
-      }
-
-      // Atualizar estoque de todos os produtos (otimização: updates em paralelo)
-      await Promise.all(
-        carrinho.itens.map((item) =>
-          tx.produto.update({
-            where: { id: item.produtoId },
-            data: {
-              estoque: {
-                decrement: item.quantidade,
-              },
-            },
-          }),
-        ),
-      );
 
-      // Limpar carrinho
-      await tx.itemCarrinho.deleteMany({
-        where: {
-          carrinhoId: carrinho.id,
-        },
-      });
+        // Criar itens do pedido
+        const itens = carrinho.itens.map((item) => ({
+          pedidoId: novoPedido.id,
+          produtoId: item.produtoId,
+          quantidade: item.quantidade,
+          precoUnitario: item.precoUnitario,
+          subtotal: Number(item.precoUnitario) * item.quantidade,
+        }));
+        await tx.itemPedido.createMany({ data: itens });
+
+        // Rollup do dashboard (mesma transação do pedido)
+        await this.vendasDiarias.registrar(tx, {
+          empresaId,
+          createdAt: novoPedido.createdAt,
+          status: novoPedido.status,
+          total,
+          itens,
+        });
 
-      return novoPedido;
-    });
+        // Limpar carrinho. Se outro checkout do mesmo carrinho já o esvaziou,
+        // este desiste (evita pedido duplicado por duplo clique).
+        const removidos = await tx.itemCarrinho.deleteMany({
+          where: {
+            id: { in: carrinho.itens.map((item) => item.id) },
+          },
+        });
+        if (removidos.count < carrinho.itens.length) {
+          throw new ConflictException('Carrinho alterado durante o checkout');
+        }
 
-    if (dto.cupomDesconto) {
-      await this.cuponsService.incrementarUso(dto.cupomDesconto, empresaId);
-    }
+        return novoPedido;
+      },
+      {
+        isolationLevel: Prisma.TransactionIsolationLevel.ReadCommitted,
+        // Picos de checkout esperam conexão do pool em vez de falhar em 2s
+        maxWait: 10_000,
+      },
+    );
 
     // Buscar pedido completo com itens
     return this.prisma.pedido.findUnique({
@@ -1,13 +1,12 @@
 import { Module } from '@nestjs/common';
 import { CategoriasController } from './categorias.controller';
 import { CategoriasService } from './categorias.service';
-import { PrismaService } from '../../database/prisma.service';
 import { AuthModule } from '../auth/auth.module';
 
 @Module({
   imports: [AuthModule],
   controllers: [CategoriasController],
-  providers: [CategoriasService, PrismaService],
+  providers: [CategoriasService],
   exports: [CategoriasService],
 })
 export class CategoriasModule {}
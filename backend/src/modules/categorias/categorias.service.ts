@@ -1,30 +1,51 @@
 import { Injectable } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../../database/prisma.service';
 
+/** Com produto ativo ou criada pelo admin. */
+const visiveis = (empresaId: string): Prisma.CategoriaWhereInput => ({
+  empresaId,
+  OR: [{ produtosAtivos: { gt: 0 } }, { manual: true }],
+});
+
 @Injectable()
 export class CategoriasService {
   constructor(private prisma: PrismaService) {}
 
+  /**
+   * Categorias do admin: o mesmo conjunto da vitrine, com a contagem de
+   * produtos ativos. As que o gatilho criou e ficaram sem produto não aparecem.
+   */
   async listarPorEmpresa(empresaId: string) {
-    const items = await this.prisma.categoria.findMany({
-      where: { empresaId },
+    return this.prisma.categoria.findMany({
+      where: visiveis(empresaId),
       orderBy: { nome: 'asc' },
-      select: { nome: true },
+      select: { nome: true, produtosAtivos: true, manual: true },
     });
-    return items.map((i) => i.nome);
   }
 
   async adicionar(empresaId: string, nome: string) {
     const sanitized = String(nome || '').trim();
     if (!sanitized) return { sucesso: false, mensagem: 'Nome inválido' };
-    try {
-      await this.prisma.categoria.create({
-        data: { empresaId, nome: sanitized },
-      });
-      return { sucesso: true };
-    } catch {
-      // Se já existir, considerar sucesso idempotente
-      return { sucesso: true };
-    }
+    // Idempotente: se a categoria já existir (inclusive criada por um produto), só passa a ser manual
+    await this.prisma.categoria.upsert({
+      where: { empresaId_nome: { empresaId, nome: sanitized } },
+      create: { empresaId, nome: sanitized, manual: true },
+      update: { manual: true },
+    });
+    return { sucesso: true };
+  }
+
+  /**
+   * Categorias exibidas na vitrine: as que têm produto ativo e as criadas pelo
+   * admin. Uma leitura pelo índice único (empresaId, nome).
+   */
+  async listarVisiveis(empresaId: string) {
+    const items = await this.prisma.categoria.findMany({
+      where: visiveis(empresaId),
+      orderBy: { nome: 'asc' },
+      select: { nome: true },
+    });
+    return items.map((i) => i.nome);
   }
 }
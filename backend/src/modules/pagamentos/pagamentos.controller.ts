@@ -14,6 +14,7 @@ import {
 import { PagamentosService } from './pagamentos.service';
 import { CreatePagamentoDto } from './dto/create-pagamento.dto';
 import { JwtAuthGuard } from '../../guards/jwt-auth.guard';
+import { Idempotente } from '../../common/idempotency/idempotente.decorator';
 
 @Controller('pagamentos')
 @UseGuards(JwtAuthGuard)
@@ -21,6 +22,7 @@ export class PagamentosController {
   constructor(private readonly pagamentosService: PagamentosService) {}
 
   @Post('criar')
+  @Idempotente('pagamento')
   async criarPagamento(@Body() dto: CreatePagamentoDto, @Request() req, @Headers('X-Asaas-Token') asaasToken?: string) {
     return this.pagamentosService.criarPagamento(dto, req.user.empresaId, asaasToken);
   }
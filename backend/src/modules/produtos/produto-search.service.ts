@@ -0,0 +1,83 @@
+import { Injectable } from '@nestjs/common';
+import { Prisma, Produto } from '@prisma/client';
+import { PrismaService } from '../../database/prisma.service';
+
+export interface BuscaProdutosParams {
+  empresaId: string;
+  termo: string;
+  categoria?: string;
+  ativo?: boolean;
+  page: number;
+  limit: number;
+}
+
+/**
+ * Busca de produtos por texto, usada pelo admin (ProdutosService.findAll) e
+ * pela vitrine (PublicService.getProdutosByLoja).
+ *
+ * Apoia-se na migration `produtos_search`:
+ * - `search_vector`: tsvector gerado em português, sem acentos, com o nome
+ *   pesando mais que a descrição (índice GIN). "calabresa" encontra
+ *   "Pizza de Calabresa" e "acai" encontra "Açaí".
+ * - índice trigram sobre o nome normalizado: cobre o texto parcial digitado
+ *   na caixa de busca ("calab") e erros de digitação.
+ *
+ * Resultados vêm por relevância (ts_rank_cd + similaridade do nome).
+ */
+@Injectable()
+export class ProdutoSearchService {
+  constructor(private readonly prisma: PrismaService) {}
+
+  async buscar(params: BuscaProdutosParams): Promise<{ produtos: Produto[]; total: number }> {
+    const termo = params.termo.trim();
+    const skip = (params.page - 1) * params.limit;
+    const filtros: Prisma.Sql[] = [Prisma.sql`p."empresaId" = ${params.empresaId}`];
+    if (params.categoria) filtros.push(Prisma.sql`p."categoria" = ${params.categoria}`);
+    if (params.ativo !== undefined) filtros.push(Prisma.sql`p."ativo" = ${params.ativo}`);
+
+    // Curingas do LIKE digitados pelo usuário valem como texto
+    const parcial = `%${termo.toLowerCase().replace(/[\\%_]/g, (c) => `\\${c}`)}%`;
+
+    const consulta = Prisma.sql`
+      WITH q AS (
+        SELECT websearch_to_tsquery('portuguese', immutable_unaccent(${termo})) AS consulta,
+               immutable_unaccent(lower(${termo})) AS termo,
+               immutable_unaccent(${parcial}) AS parcial
+      )`;
+    const corresponde = Prisma.sql`
+      FROM "produtos" p, q
+      WHERE ${Prisma.join(filtros, ' AND ')}
+        AND (
+          p."search_vector" @@ q.consulta
+          OR immutable_unaccent(lower(p."nome")) LIKE q.parcial
+          OR q.termo <% immutable_unaccent(lower(p."nome"))
+        )`;
+
+    const encontrados = await this.prisma.$queryRaw<{ id: string; total: bigint }[]>`
+      ${consulta}
+      SELECT p."id", count(*) OVER () AS total
+      ${corresponde}
+      ORDER BY ts_rank_cd(p."search_vector", q.consulta) + word_similarity(q.termo, immutable_unaccent(lower(p."nome"))) DESC,
+               p."nome" ASC
+      LIMIT ${params.limit} OFFSET ${skip}`;
+
+    if (encontrados.length === 0) {
+      if (skip === 0) return { produtos: [], total: 0 };
+      // Página além da última: o count(*) OVER () não tem linha onde aparecer
+      const [{ total }] = await this.prisma.$queryRaw<{ total: bigint }[]>`
+        ${consulta}
+        SELECT count(*) AS total
+        ${corresponde}`;
+      return { produtos: [], total: Number(total) };
+    }
+
+    const ids = encontrados.map((linha) => linha.id);
+    const produtos = await this.prisma.produto.findMany({ where: { id: { in: ids } } });
+    const porId = new Map(produtos.map((produto) => [produto.id, produto]));
+
+    return {
+      produtos: ids.map((id) => porId.get(id)).filter(Boolean),
+      total: Number(encontrados[0].total),
+    };
+  }
+}
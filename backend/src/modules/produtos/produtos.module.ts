@@ -1,9 +1,11 @@
 import { Module } from '@nestjs/common';
 import { ProdutosService } from './produtos.service';
 import { ProdutosController } from './produtos.controller';
+import { ProdutoSearchService } from './produto-search.service';
 
 @Module({
   controllers: [ProdutosController],
-  providers: [ProdutosService],
+  providers: [ProdutosService, ProdutoSearchService],
+  exports: [ProdutoSearchService],
 })
 export class ProdutosModule {}
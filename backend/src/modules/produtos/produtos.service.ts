@@ -7,6 +7,7 @@ import {
 import { PrismaService } from '../../database/prisma.service';
 import { CreateProdutoDto, UpdateProdutoDto } from './dto';
 import { paginatedResponse, calculatePagination } from '../../utils';
+import { ProdutoSearchService } from './produto-search.service';
 
 @Injectable()
 export class ProdutosService {
@@ -97,7 +98,10 @@ export class ProdutosService {
     },
   ];
 
-  constructor(private readonly prisma: PrismaService) {
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly search: ProdutoSearchService,
+  ) {
     if (this.useMockData) {
       this.logger.warn('⚠️  Usando dados MOCK para produtos (USE_MOCK_PRODUTOS=true)');
     }
@@ -169,6 +173,12 @@ export class ProdutosService {
       return paginatedResponse(produtos, calculatePagination(total, page, limit));
     }
 
+    // Busca textual: índices full-text/trigram, ordenada por relevância
+    if (search?.trim()) {
+      const { produtos, total } = await this.search.buscar({ empresaId, termo: search, categoria, ativo, page, limit });
+      return paginatedResponse(produtos, calculatePagination(total, page, limit));
+    }
+
     const skip = (page - 1) * limit;
 
     const where: any = {
@@ -179,13 +189,6 @@ export class ProdutosService {
       where.categoria = categoria;
     }
 
-    if (search) {
-      where.OR = [
-        { nome: { contains: search, mode: 'insensitive' } },
-        { descricao: { contains: search, mode: 'insensitive' } },
-      ];
-    }
-
     if (ativo !== undefined) {
       where.ativo = ativo;
     }
@@ -0,0 +1,104 @@
+import { Injectable } from '@nestjs/common';
+import { createHash } from 'crypto';
+import { PrismaService } from '../../database/prisma.service';
+import { TtlLruCache } from '../../common/cache/ttl-lru-cache';
+
+export interface CatalogoEntrada {
+  corpo: string; // JSON já serializado
+  etag: string;
+}
+
+const ESCRITAS = new Set(['create', 'createMany', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany']);
+const MODELOS_CATALOGO = new Set(['Produto', 'Categoria', 'Empresa']);
+
+/**
+ * Cache das respostas públicas da vitrine (info, produtos, categorias, tema).
+ *
+ * Cada empresa tem um número de versão que entra na chave do cache; qualquer
+ * escrita em Produto, Categoria ou Empresa desta instância incrementa a versão
+ * da loja afetada, então a próxima leitura já monta a resposta nova. Outras
+ * instâncias enxergam a mudança quando o TTL expira (CATALOG_CACHE_TTL_MS,
+ * padrão 60s).
+ *
+ * A exceção é a baixa de estoque do checkout (update que só mexe em
+ * `estoque`): invalidar a vitrine a cada pedido anularia o cache, e o
+ * checkout valida o estoque de qualquer forma.
+ *
+ * O ETag é o hash do corpo, igual em todas as instâncias, então navegador e
+ * CDN revalidam com 304 sem depender de qual instância respondeu.
+ */
+@Injectable()
+export class CatalogCacheService {
+  private readonly cache = new TtlLruCache<string, CatalogoEntrada>(
+    Number(process.env.CATALOG_CACHE_MAX || 20_000),
+    Number(process.env.CATALOG_CACHE_TTL_MS || 60_000),
+  );
+  private readonly versoes = new Map<string, number>();
+  private readonly emAndamento = new Map<string, Promise<CatalogoEntrada>>();
+  // Incrementada quando não dá para saber qual loja mudou (updateMany etc.)
+  private epoca = 0;
+
+  constructor(private readonly prisma: PrismaService) {
+    this.prisma.$use(async (params, next) => {
+      const result = await next(params);
+      if (MODELOS_CATALOGO.has(params.model) && ESCRITAS.has(params.action)) {
+        this.invalidarPorEscrita(params, result);
+      }
+      return result;
+    });
+  }
+
+  /** Resposta de `recurso` da loja, montada por `carregar` quando não está em cache. */
+  obter(empresaId: string, recurso: string, carregar: () => Promise<unknown>): Promise<CatalogoEntrada> {
+    const chave = `${empresaId}:${this.epoca}.${this.versoes.get(empresaId) ?? 0}:${recurso}`;
+    const emCache = this.cache.get(chave);
+    if (emCache) return Promise.resolve(emCache);
+
+    const pendente = this.emAndamento.get(chave);
+    if (pendente) return pendente;
+
+    // Montada com a versão lida acima: se a loja mudar no meio, a entrada fica
+    // sob a chave antiga e nunca é servida
+    const busca = carregar()
+      .then((dados) => {
+        const corpo = JSON.stringify(dados);
+        const entrada = { corpo, etag: `"${createHash('sha1').update(corpo).digest('base64url')}"` };
+        this.cache.set(chave, entrada);
+        return entrada;
+      })
+      .finally(() => this.emAndamento.delete(chave));
+    this.emAndamento.set(chave, busca);
+    return busca;
+  }
+
+  invalidar(empresaId: string): void {
+    this.versoes.set(empresaId, (this.versoes.get(empresaId) ?? 0) + 1);
+  }
+
+  invalidarTudo(): void {
+    this.epoca++;
+  }
+
+  private invalidarPorEscrita(params: { model?: string; action: string; args?: any }, result: any): void {
+    const data = params.args?.data;
+    if (
+      params.model === 'Produto' &&
+      params.action === 'update' &&
+      data &&
+      Object.keys(data).every((campo) => campo === 'estoque' || campo === 'updatedAt')
+    ) {
+      return;
+    }
+
+    const empresaId =
+      params.model === 'Empresa'
+        ? result?.id ?? params.args?.where?.id
+        : result?.empresaId ?? params.args?.where?.empresaId ?? params.args?.data?.empresaId;
+
+    if (typeof empresaId === 'string') {
+      this.invalidar(empresaId);
+    } else {
+      this.invalidarTudo();
+    }
+  }
+}
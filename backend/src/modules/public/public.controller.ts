@@ -5,19 +5,32 @@ import {
   Query,
   ParseIntPipe,
   DefaultValuePipe,
+  Req,
+  Res,
 } from '@nestjs/common';
+import { Request, Response } from 'express';
 import { PublicService } from './public.service';
-import { Header } from '@nestjs/common';
+import { CatalogCacheService, CatalogoEntrada } from './catalog-cache.service';
 import { Public } from '../../decorators/public.decorator';
 
+// Navegador/CDN podem reaproveitar o catálogo por alguns segundos e depois revalidar (304)
+const CACHE_CATALOGO = `public, max-age=${Number(process.env.CATALOG_MAX_AGE_S || 60)}, stale-while-revalidate=300`;
+// O tema é editado com a vitrine aberta: sempre revalidar
+const CACHE_TEMA = 'no-cache';
+
 @Controller('public')
 @Public()
 export class PublicController {
-  constructor(private readonly publicService: PublicService) {}
+  constructor(
+    private readonly publicService: PublicService,
+    private readonly catalogo: CatalogCacheService,
+  ) {}
 
   @Get(':slug/info')
-  async getLojaInfo(@Param('slug') slug: string) {
-    return this.publicService.getLojaBySlug(slug);
+  async getLojaInfo(@Param('slug') slug: string, @Req() req: Request, @Res() res: Response) {
+    const loja = await this.publicService.getLojaBySlug(slug);
+    const entrada = await this.catalogo.obter(loja.id, 'info', () => this.publicService.getLojaBySlug(slug));
+    this.enviar(req, res, entrada, CACHE_CATALOGO);
   }
 
   @Get(':slug/produtos')
@@ -25,28 +38,65 @@ export class PublicController {
     @Param('slug') slug: string,
     @Query('page', new DefaultValuePipe(1), ParseIntPipe) page: number,
     @Query('limit', new DefaultValuePipe(20), ParseIntPipe) limit: number,
+    @Req() req: Request,
+    @Res() res: Response,
     @Query('categoria') categoria?: string,
     @Query('search') search?: string,
   ) {
-    return this.publicService.getProdutosByLoja(slug, page, limit, categoria, search);
+    const loja = await this.publicService.getLojaBySlug(slug);
+    const recurso = `produtos:${JSON.stringify([page, limit, categoria ?? null, search ?? null])}`;
+    const entrada = await this.catalogo.obter(loja.id, recurso, () =>
+      this.publicService.getProdutosByLoja(slug, page, limit, categoria, search),
+    );
+    this.enviar(req, res, entrada, CACHE_CATALOGO);
   }
 
   @Get(':slug/produtos/:id')
   async getProdutoById(
     @Param('slug') slug: string,
     @Param('id') id: string,
+    @Req() req: Request,
+    @Res() res: Response,
   ) {
-    return this.publicService.getProdutoById(slug, id);
+    const loja = await this.publicService.getLojaBySlug(slug);
+    const entrada = await this.catalogo.obter(loja.id, `produto:${id}`, () =>
+      this.publicService.getProdutoById(slug, id),
+    );
+    this.enviar(req, res, entrada, CACHE_CATALOGO);
   }
 
   @Get(':slug/categorias')
-  async getCategorias(@Param('slug') slug: string) {
-    return this.publicService.getCategorias(slug);
+  async getCategorias(@Param('slug') slug: string, @Req() req: Request, @Res() res: Response) {
+    const loja = await this.publicService.getLojaBySlug(slug);
+    const entrada = await this.catalogo.obter(loja.id, 'categorias', () => this.publicService.getCategorias(slug));
+    this.enviar(req, res, entrada, CACHE_CATALOGO);
   }
 
   @Get(':slug/theme')
-  @Header('Cache-Control', 'no-store')
-  async getTheme(@Param('slug') slug: string) {
-    return this.publicService.getTheme(slug);
+  async getTheme(@Param('slug') slug: string, @Req() req: Request, @Res() res: Response) {
+    // Loja inexistente ou inativa recebe o tema padrão (sem cache), como antes
+    const loja = await this.publicService.getLojaBySlug(slug).catch(() => null);
+    if (!loja) {
+      res.setHeader('Cache-Control', CACHE_TEMA);
+      res.json(await this.publicService.getTheme(slug));
+      return;
+    }
+    const entrada = await this.catalogo.obter(loja.id, 'theme', () => this.publicService.getTheme(slug));
+    this.enviar(req, res, entrada, CACHE_TEMA);
+  }
+
+  private enviar(req: Request, res: Response, entrada: CatalogoEntrada, cacheControl: string) {
+    res.setHeader('ETag', entrada.etag);
+    res.setHeader('Cache-Control', cacheControl);
+
+    // If-None-Match pode trazer vários ETags; proxies com compressão costumam enfraquecê-los (W/)
+    const ifNoneMatch = req.headers['if-none-match'];
+    const etags = (ifNoneMatch ?? '').split(',').map((etag) => etag.trim().replace(/^W\//, ''));
+    if (etags.includes(entrada.etag) || etags.includes('*')) {
+      res.status(304).end();
+      return;
+    }
+
+    res.status(200).type('application/json').send(entrada.corpo);
   }
 }
@@ -1,9 +1,13 @@
 import { Module } from '@nestjs/common';
 import { PublicService } from './public.service';
 import { PublicController } from './public.controller';
+import { ProdutosModule } from '../produtos/produtos.module';
+import { CategoriasModule } from '../categorias/categorias.module';
+import { CatalogCacheService } from './catalog-cache.service';
 
 @Module({
+  imports: [ProdutosModule, CategoriasModule],
   controllers: [PublicController],
-  providers: [PublicService],
+  providers: [PublicService, CatalogCacheService],
 })
 export class PublicModule {}
@@ -1,10 +1,18 @@
 import { Injectable, NotFoundException } from '@nestjs/common';
 import { PrismaService } from '../../database/prisma.service';
 import { StorefrontThemeSettings } from '../theme/theme.service';
+import { TenantRegistry } from '../../common/tenant/tenant-registry.service';
+import { ProdutoSearchService } from '../produtos/produto-search.service';
+import { CategoriasService } from '../categorias/categorias.service';
 
 @Injectable()
 export class PublicService {
-  constructor(private readonly prisma: PrismaService) {}
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly tenants: TenantRegistry,
+    private readonly search: ProdutoSearchService,
+    private readonly categorias: CategoriasService,
+  ) {}
   private readonly defaultTheme: StorefrontThemeSettings = {
     primaryColor: '#111827',
     secondaryColor: '#F9FAFB',
@@ -13,9 +21,7 @@ export class PublicService {
   };
 
   async getLojaBySlug(slug: string) {
-    const empresa = await this.prisma.empresa.findUnique({
-      where: { slug },
-    });
+    const empresa = await this.tenants.porSlug(slug);
 
     if (!empresa) {
       throw new NotFoundException('Loja não encontrada');
@@ -42,10 +48,27 @@ export class PublicService {
   ) {
     const empresa = await this.getLojaBySlug(slug);
 
+    // Busca textual compartilhada com o admin (full-text + trigram, por relevância)
+    const { produtos, total } = search?.trim()
+      ? await this.search.buscar({ empresaId: empresa.id, termo: search, categoria, ativo: true, page, limit })
+      : await this.listarProdutos(empresa.id, page, limit, categoria);
+
+    return {
+      data: produtos,
+      meta: {
+        total,
+        page,
+        limit,
+        totalPages: Math.ceil(total / limit),
+      },
+    };
+  }
+
+  private async listarProdutos(empresaId: string, page: number, limit: number, categoria?: string) {
     const skip = (page - 1) * limit;
 
     const where: any = {
-      empresaId: empresa.id,
+      empresaId,
       ativo: true,
     };
 
@@ -53,13 +76,6 @@ export class PublicService {
       where.categoria = categoria;
     }
 
-    if (search) {
-      where.OR = [
-        { nome: { contains: search, mode: 'insensitive' } },
-        { descricao: { contains: search, mode: 'insensitive' } },
-      ];
-    }
-
     const [produtos, total] = await Promise.all([
       this.prisma.produto.findMany({
         where,
@@ -69,16 +85,7 @@ export class PublicService {
       }),
       this.prisma.produto.count({ where }),
     ]);
-
-    return {
-      data: produtos,
-      meta: {
-        total,
-        page,
-        limit,
-        totalPages: Math.ceil(total / limit),
-      },
-    };
+    return { produtos, total };
   }
 
   async getProdutoById(slug: string, produtoId: string) {
@@ -101,35 +108,15 @@ export class PublicService {
 
   async getCategorias(slug: string) {
     const empresa = await this.getLojaBySlug(slug);
-
-    const categoriasProdutos = await this.prisma.produto.findMany({
-      where: {
-        empresaId: empresa.id,
-        ativo: true,
-        categoria: { not: null },
-      },
-      select: {
-        categoria: true,
-      },
-      distinct: ['categoria'],
-    });
-
-    const categoriasSalvas = await this.prisma.categoria.findMany({
-      where: { empresaId: empresa.id },
-      select: { nome: true },
-    });
-
-    const set = new Set<string>();
-    categoriasProdutos.forEach((c) => c.categoria && set.add(c.categoria));
-    categoriasSalvas.forEach((c) => c.nome && set.add(c.nome));
-    return Array.from(set).sort((a, b) => a.localeCompare(b));
+    return this.categorias.listarVisiveis(empresa.id);
   }
 
   async getTheme(slug: string): Promise<{ settings: StorefrontThemeSettings | null }> {
     try {
-      const empresa = await this.prisma.empresa.findUnique({
-        where: { slug },
-      });
+      const loja = await this.tenants.porSlug(slug);
+      const empresa = loja
+        ? { ...loja, ...(await this.prisma.empresa.findUnique({ where: { id: loja.id }, select: { vitrineTheme: true } })) }
+        : null;
       if (!empresa) {
         throw new NotFoundException('Loja não encontrada');
       }
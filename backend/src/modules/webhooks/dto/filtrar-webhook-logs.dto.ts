@@ -0,0 +1,25 @@
+import { IsOptional, IsIn, IsBoolean, IsString, IsInt, Min, Max } from 'class-validator';
+import { Transform, Type } from 'class-transformer';
+
+export class FiltrarWebhookLogsDto {
+  @IsOptional()
+  @IsIn(['STRIPE', 'ASAAS'])
+  origem?: string;
+
+  @IsOptional()
+  @Transform(({ value }) => (value === 'true' ? true : value === 'false' ? false : value))
+  @IsBoolean()
+  processado?: boolean;
+
+  // `pagination.nextCursor` da página anterior; sem cursor começa dos mais recentes
+  @IsOptional()
+  @IsString()
+  cursor?: string;
+
+  @IsOptional()
+  @Type(() => Number)
+  @IsInt()
+  @Min(1)
+  @Max(100)
+  limit?: number = 20;
+}
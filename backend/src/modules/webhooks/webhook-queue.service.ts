@@ -0,0 +1,176 @@
+import { Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../../database/prisma.service';
+import { PagamentosService } from '../pagamentos/pagamentos.service';
+
+export interface NovoWebhook {
+  origem: string;
+  evento: string;
+  eventoId?: string | null;
+  chaveOrdem?: string | null;
+  payload: unknown;
+}
+
+interface Job {
+  id: string;
+  origem: string;
+  evento: string;
+  payload: string;
+  tentativas: number;
+}
+
+/**
+ * Fila dos webhooks recebidos, sobre a própria tabela webhook_logs.
+ *
+ * O endpoint só enfileira (um INSERT, deduplicado por origem + id do evento
+ * no gateway) e responde; o processamento acontece aqui, em WEBHOOK_WORKERS
+ * loops por instância que pegam um evento por vez com FOR UPDATE SKIP LOCKED,
+ * então várias instâncias dividem a fila sem disputa.
+ *
+ * - Ordem por pagamento: um evento só é pego quando não há evento anterior
+ *   pendente com a mesma `chaveOrdem`.
+ * - Falhas voltam para a fila com backoff exponencial (WEBHOOK_BACKOFF_MS,
+ *   padrão 5s, dobrando até 1h) e desistem depois de WEBHOOK_MAX_TENTATIVAS,
+ *   ficando com o erro no log.
+ * - Um evento pego tem prazo (WEBHOOK_LEASE_MS); se a instância cair no meio,
+ *   ele volta para a fila quando o prazo vence.
+ * - Todas as datas vêm do relógio do Node (parâmetros), não de CURRENT_TIMESTAMP:
+ *   as colunas guardam UTC sem fuso e o fuso da sessão pode ser outro.
+ */
+@Injectable()
+export class WebhookQueue implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(WebhookQueue.name);
+  // 0 desliga o processamento nesta instância (só recebe e enfileira)
+  private readonly workers = Number(process.env.WEBHOOK_WORKERS ?? 4);
+  private readonly maxTentativas = Number(process.env.WEBHOOK_MAX_TENTATIVAS || 8);
+  private readonly leaseMs = Number(process.env.WEBHOOK_LEASE_MS || 5 * 60_000);
+  private readonly backoffMs = Number(process.env.WEBHOOK_BACKOFF_MS || 5_000);
+  private readonly pollMs = Number(process.env.WEBHOOK_POLL_MS || 2_000);
+  private readonly processadores: Record<string, (payload: any) => Promise<unknown>>;
+  private ativo = false;
+  private loops: Promise<void>[] = [];
+  private despertar: (() => void)[] = [];
+
+  constructor(
+    private readonly prisma: PrismaService,
+    pagamentosService: PagamentosService,
+  ) {
+    this.processadores = {
+      ASAAS: (payload) => pagamentosService.processarEventoAsaas(payload),
+    };
+  }
+
+  onModuleInit() {
+    this.ativo = true;
+    for (let i = 0; i < this.workers; i++) {
+      this.loops.push(this.executarLoop());
+    }
+  }
+
+  async onModuleDestroy() {
+    this.ativo = false;
+    this.acordar(this.despertar.length);
+    await Promise.all(this.loops);
+  }
+
+  /** Grava o evento na fila. Retorna false se o mesmo evento já tinha sido recebido. */
+  async enfileirar(webhook: NovoWebhook): Promise<boolean> {
+    const agora = new Date();
+    const inseridos = await this.prisma.$executeRaw`
+      INSERT INTO "webhook_logs" ("id", "origem", "evento", "eventoId", "chaveOrdem", "payload", "disponivelEm", "createdAt")
+      VALUES (${randomUUID()}, ${webhook.origem}, ${webhook.evento}, ${webhook.eventoId ?? null},
+              ${webhook.chaveOrdem ?? null}, ${JSON.stringify(webhook.payload)}, ${agora}, ${agora})
+      ON CONFLICT ("origem", "eventoId") DO NOTHING`;
+    if (inseridos > 0) this.acordar(1);
+    return inseridos > 0;
+  }
+
+  private async executarLoop(): Promise<void> {
+    while (this.ativo) {
+      let job: Job | undefined;
+      try {
+        job = await this.pegarProximo();
+      } catch (err) {
+        this.logger.warn(`Falha ao ler a fila de webhooks: ${err}`);
+      }
+      if (job) {
+        await this.processar(job);
+      } else {
+        await this.aguardar();
+      }
+    }
+  }
+
+  private async pegarProximo(): Promise<Job | undefined> {
+    const agora = new Date();
+    const [job] = await this.prisma.$queryRaw<Job[]>`
+      UPDATE "webhook_logs"
+      SET "tentativas" = "tentativas" + 1,
+          "travadoAte" = ${new Date(agora.getTime() + this.leaseMs)}
+      WHERE "id" = (
+        SELECT w."id" FROM "webhook_logs" w
+        WHERE w."disponivelEm" <= ${agora}
+          AND (w."travadoAte" IS NULL OR w."travadoAte" < ${agora})
+          AND NOT EXISTS (
+            SELECT 1 FROM "webhook_logs" a
+            WHERE a."origem" = w."origem"
+              AND a."chaveOrdem" = w."chaveOrdem"
+              AND a."disponivelEm" IS NOT NULL
+              AND (a."createdAt", a."id") < (w."createdAt", w."id")
+          )
+        ORDER BY w."disponivelEm", w."createdAt"
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+      )
+      RETURNING "id", "origem", "evento", "payload", "tentativas"`;
+    return job;
+  }
+
+  private async processar(job: Job): Promise<void> {
+    try {
+      const processador = this.processadores[job.origem];
+      if (!processador) throw new Error(`Sem processador para webhooks de ${job.origem}`);
+      await processador(JSON.parse(job.payload));
+
+      await this.prisma.webhookLog.update({
+        where: { id: job.id },
+        data: { processado: true, processadoEm: new Date(), erro: null, disponivelEm: null, travadoAte: null },
+      });
+    } catch (error) {
+      const desistir = job.tentativas >= this.maxTentativas;
+      const esperaMs = Math.min(this.backoffMs * 2 ** (job.tentativas - 1), 60 * 60_000);
+      if (desistir) {
+        this.logger.error(`Webhook ${job.origem} ${job.evento} (${job.id}) falhou ${job.tentativas} vezes: ${error.message}`);
+      }
+      await this.prisma.webhookLog
+        .update({
+          where: { id: job.id },
+          data: {
+            erro: String(error?.message ?? error),
+            disponivelEm: desistir ? null : new Date(Date.now() + esperaMs),
+            travadoAte: null,
+          },
+        })
+        .catch((err) => this.logger.warn(`Falha ao registrar erro do webhook ${job.id}: ${err}`));
+    }
+  }
+
+  /** Dorme até um novo evento desta instância ou até o próximo poll (retries, outras instâncias). */
+  private aguardar(): Promise<void> {
+    return new Promise((resolve) => {
+      const timer = setTimeout(acordar, this.pollMs);
+      const despertar = this.despertar;
+      function acordar() {
+        clearTimeout(timer);
+        const i = despertar.indexOf(acordar);
+        if (i >= 0) despertar.splice(i, 1);
+        resolve();
+      }
+      despertar.push(acordar);
+    });
+  }
+
+  private acordar(quantos: number): void {
+    for (const acordar of this.despertar.slice(0, quantos)) acordar();
+  }
+}
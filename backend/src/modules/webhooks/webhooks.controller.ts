@@ -9,10 +9,14 @@ import {
   Get,
   UseGuards,
   Query,
+  Param,
 } from '@nestjs/common';
 import { Request } from 'express';
 import { WebhooksService } from './webhooks.service';
 import { JwtAuthGuard } from '../../guards/jwt-auth.guard';
+import { RolesGuard } from '../../guards/roles.guard';
+import { Roles } from '../../decorators/roles.decorator';
+import { FiltrarWebhookLogsDto } from './dto/filtrar-webhook-logs.dto';
 
 @Controller('webhooks')
 export class WebhooksController {
@@ -37,12 +41,18 @@ export class WebhooksController {
     return this.webhooksService.processarWebhookAsaas(body, token);
   }
 
+  // webhook_logs não tem empresa (payloads de todas as lojas): só SUPER_ADMIN
   @Get('logs')
-  @UseGuards(JwtAuthGuard)
-  async listarLogs(
-    @Query('origem') origem?: string,
-    @Query('processado') processado?: string,
-  ) {
-    return this.webhooksService.listarLogs(origem, processado === 'true');
+  @UseGuards(JwtAuthGuard, RolesGuard)
+  @Roles('SUPER_ADMIN')
+  async listarLogs(@Query() filtros: FiltrarWebhookLogsDto) {
+    return this.webhooksService.listarLogs(filtros);
+  }
+
+  @Get('logs/:id')
+  @UseGuards(JwtAuthGuard, RolesGuard)
+  @Roles('SUPER_ADMIN')
+  async buscarLog(@Param('id') id: string) {
+    return this.webhooksService.buscarLog(id);
   }
 }
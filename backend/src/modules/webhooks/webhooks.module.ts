@@ -2,6 +2,7 @@
 import { Module } from '@nestjs/common';
 import { WebhooksController } from './webhooks.controller';
 import { WebhooksService } from './webhooks.service';
+import { WebhookQueue } from './webhook-queue.service';
 import { PrismaService } from '../../database/prisma.service';
 // import { AssinaturasModule } from '../assinaturas/assinaturas.module';
 import { PagamentosModule } from '../pagamentos/pagamentos.module';
@@ -9,6 +10,6 @@ import { PagamentosModule } from '../pagamentos/pagamentos.module';
 @Module({
   imports: [/* AssinaturasModule, */ PagamentosModule],
   controllers: [WebhooksController],
-  providers: [WebhooksService, PrismaService],
+  providers: [WebhooksService, WebhookQueue, PrismaService],
 })
 export class WebhooksModule {}
@@ -1,19 +1,59 @@
 
-import { Injectable, BadRequestException } from '@nestjs/common';
+import {
+  Injectable,
+  BadRequestException,
+  NotFoundException,
+  Logger,
+  OnModuleInit,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../../database/prisma.service';
 // import { AssinaturasService } from '../assinaturas/assinaturas.service';
-import { PagamentosService } from '../pagamentos/pagamentos.service';
+import { WebhookQueue } from './webhook-queue.service';
 // import { StripeService } from '../assinaturas/stripe.service';
+import { FiltrarWebhookLogsDto } from './dto/filtrar-webhook-logs.dto';
+
+// Listagem sem o payload: o detalhe vem de GET /webhooks/logs/:id
+const WEBHOOK_LOG_RESUMO = {
+  id: true,
+  origem: true,
+  evento: true,
+  eventoId: true,
+  processado: true,
+  erro: true,
+  tentativas: true,
+  processadoEm: true,
+  createdAt: true,
+} satisfies Prisma.WebhookLogSelect;
+
+const LOTE_PODA = 5_000;
+const INTERVALO_PODA_MS = 60 * 60_000;
 
 @Injectable()
-export class WebhooksService {
+export class WebhooksService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(WebhooksService.name);
+  private readonly retencaoDias = Number(process.env.WEBHOOK_LOG_RETENCAO_DIAS || 30);
+  private poda?: NodeJS.Timeout;
+
   constructor(
     private prisma: PrismaService,
     // private assinaturasService: AssinaturasService,
-    private pagamentosService: PagamentosService,
+    private fila: WebhookQueue,
     // private stripeService: StripeService,
   ) {}
 
+  onModuleInit() {
+    this.poda = setInterval(() => {
+      this.podarLogs().catch((err) => this.logger.warn(`Falha ao podar webhook_logs: ${err}`));
+    }, INTERVALO_PODA_MS);
+    this.poda.unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.poda);
+  }
+
   async processarWebhookStripe(payload: string, signature: string) {
     // Temporariamente desabilitado - módulo de assinaturas não implementado
     throw new BadRequestException('Webhook Stripe temporariamente desabilitado');
@@ -68,55 +108,116 @@ export class WebhooksService {
       throw new BadRequestException('Token do webhook inválido');
     }
 
-    // Salvar log
-    const log = await this.prisma.webhookLog.create({
-      data: {
-        origem: 'ASAAS',
-        evento: body.event,
-        payload: body,
-        processado: false,
-      },
+    if (!body?.event) {
+      throw new BadRequestException('Evento do webhook ausente');
+    }
+
+    // Só enfileira: o Asaas recebe a resposta na hora e o WebhookQueue processa
+    // depois. Reenvios do mesmo evento (mesmo id) não entram de novo.
+    await this.fila.enfileirar({
+      origem: 'ASAAS',
+      evento: body.event,
+      eventoId: body.id ?? null,
+      chaveOrdem: body.payment?.id ?? null,
+      payload: body,
     });
 
-    try {
-      // Processar evento
-      await this.pagamentosService.processarEventoAsaas(body);
+    return { received: true };
+  }
 
-      // Marcar como processado
-      await this.prisma.webhookLog.update({
-        where: { id: log.id },
-        data: { processado: true },
-      });
+  async listarLogs(filtros: FiltrarWebhookLogsDto) {
+    const limit = filtros.limit ?? 20;
+    const where: Prisma.WebhookLogWhereInput = {};
 
-      return { received: true };
-    } catch (error) {
-      // Salvar erro
-      await this.prisma.webhookLog.update({
-        where: { id: log.id },
-        data: { erro: error.message },
-      });
+    if (filtros.origem) {
+      where.origem = filtros.origem;
+    }
 
-      throw error;
+    if (filtros.processado !== undefined) {
+      where.processado = filtros.processado;
+    }
+
+    // Keyset: (createdAt, id) abaixo do último item da página anterior
+    if (filtros.cursor) {
+      const cursor = this.decodificarCursor(filtros.cursor);
+      where.OR = [
+        { createdAt: { lt: cursor.createdAt } },
+        { createdAt: cursor.createdAt, id: { lt: cursor.id } },
+      ];
     }
+
+    const logs = await this.prisma.webhookLog.findMany({
+      where,
+      select: WEBHOOK_LOG_RESUMO,
+      orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+      take: limit + 1,
+    });
+
+    const hasNextPage = logs.length > limit;
+    const data = hasNextPage ? logs.slice(0, limit) : logs;
+
+    return {
+      data,
+      pagination: {
+        itemsPerPage: limit,
+        hasNextPage,
+        nextCursor: hasNextPage ? this.codificarCursor(data[data.length - 1]) : null,
+      },
+    };
   }
 
-  async listarLogs(origem?: string, processado?: boolean) {
-    const where: any = {};
+  /** Log completo, com o payload (a listagem não traz). */
+  async buscarLog(id: string) {
+    const log = await this.prisma.webhookLog.findUnique({ where: { id } });
+    if (!log) {
+      throw new NotFoundException('Log de webhook não encontrado');
+    }
 
-    if (origem) {
-      where.origem = origem;
+    let payload: unknown = log.payload;
+    try {
+      payload = JSON.parse(log.payload);
+    } catch {
+      // Logs antigos podem não ser JSON válido; devolve o texto
     }
+    return { ...log, payload };
+  }
 
-    if (processado !== undefined) {
-      where.processado = processado;
+  /**
+   * Apaga logs processados mais antigos que WEBHOOK_LOG_RETENCAO_DIAS, em lotes
+   * pequenos (FOR UPDATE SKIP LOCKED) para não segurar locks na tabela.
+   * Logs com erro ou ainda na fila ficam.
+   */
+  async podarLogs(): Promise<number> {
+    const limite = new Date(Date.now() - this.retencaoDias * 24 * 60 * 60_000);
+    let total = 0;
+    for (;;) {
+      const apagados = await this.prisma.$executeRaw`
+        DELETE FROM "webhook_logs"
+        WHERE "id" IN (
+          SELECT "id" FROM "webhook_logs"
+          WHERE "createdAt" < ${limite} AND "processado"
+          ORDER BY "createdAt"
+          LIMIT ${LOTE_PODA}
+          FOR UPDATE SKIP LOCKED
+        )`;
+      total += apagados;
+      if (apagados < LOTE_PODA) break;
+      await new Promise((resolve) => setTimeout(resolve, 50));
     }
+    if (total > 0) this.logger.log(`${total} logs de webhook com mais de ${this.retencaoDias} dias removidos`);
+    return total;
+  }
 
-    return this.prisma.webhookLog.findMany({
-      where,
-      orderBy: {
-        createdAt: 'desc',
-      },
-      take: 100,
-    });
+  private codificarCursor(log: { createdAt: Date; id: string }): string {
+    return Buffer.from(`${log.createdAt.toISOString()}|${log.id}`).toString('base64url');
+  }
+
+  private decodificarCursor(cursor: string): { createdAt: Date; id: string } {
+    const [data, id] = Buffer.from(cursor, 'base64url').toString('utf8').split('|');
+    const createdAt = new Date(data);
+    if (!id || isNaN(createdAt.getTime())) {
+      throw new BadRequestException('Cursor inválido');
+    }
+    return { createdAt, id };
   }
 }
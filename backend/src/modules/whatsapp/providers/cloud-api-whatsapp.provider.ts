@@ -0,0 +1,52 @@
+import { Injectable } from '@nestjs/common';
+import { HttpService } from '@nestjs/axios';
+import { firstValueFrom } from 'rxjs';
+import { ErroEnvioWhatsapp, MensagemParaEnvio, WhatsappProvider } from './whatsapp-provider';
+
+/**
+ * WhatsApp Cloud API (Meta). As conexões vêm do HttpService do módulo, com
+ * agente keep-alive: o dispatcher reaproveita os sockets entre envios.
+ */
+@Injectable()
+export class CloudApiWhatsappProvider implements WhatsappProvider {
+  readonly nome = 'cloud-api';
+  private readonly baseUrl = process.env.WHATSAPP_API_URL || 'https://graph.facebook.com/v19.0';
+  private readonly phoneNumberId = process.env.WHATSAPP_PHONE_NUMBER_ID;
+  private readonly token = process.env.WHATSAPP_TOKEN;
+
+  constructor(private readonly httpService: HttpService) {}
+
+  async enviar(mensagem: MensagemParaEnvio): Promise<string> {
+    try {
+      const response = await firstValueFrom(
+        this.httpService.post(
+          `${this.baseUrl}/${this.phoneNumberId}/messages`,
+          {
+            messaging_product: 'whatsapp',
+            to: mensagem.telefone.replace(/\D/g, ''),
+            type: 'text',
+            text: { body: mensagem.mensagem },
+          },
+          {
+            headers: {
+              Authorization: `Bearer ${this.token}`,
+              'Content-Type': 'application/json',
+            },
+          },
+        ),
+      );
+      return response.data?.messages?.[0]?.id;
+    } catch (error) {
+      const status: number | undefined = error.response?.status;
+      const detalhe = error.response?.data?.error?.message ?? error.message;
+      // Sem resposta (timeout, conexão), 429 e 5xx: tentar de novo
+      const temporaria = status === undefined || status === 429 || status >= 500;
+      const retryAfter = Number(error.response?.headers?.['retry-after']);
+      throw new ErroEnvioWhatsapp(
+        `WhatsApp ${status ?? 'sem resposta'}: ${detalhe}`,
+        temporaria,
+        retryAfter > 0 ? retryAfter * 1000 : undefined,
+      );
+    }
+  }
+}
@@ -0,0 +1,31 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { randomUUID } from 'crypto';
+import { ErroEnvioWhatsapp, MensagemParaEnvio, WhatsappProvider } from './whatsapp-provider';
+
+/**
+ * Provedor local: não envia nada, só registra. É o padrão sem credenciais
+ * (desenvolvimento) e o usado nos testes do dispatcher, que podem simular
+ * latência e falhas.
+ */
+@Injectable()
+export class FakeWhatsappProvider implements WhatsappProvider {
+  readonly nome = 'fake';
+  private readonly logger = new Logger(FakeWhatsappProvider.name);
+  readonly enviadas: (MensagemParaEnvio & { provedorId: string; enviadaEm: Date })[] = [];
+  latenciaMs = 0;
+  /** Se definido, é chamado antes de cada envio; o erro devolvido vira a falha do envio. */
+  falhar?: (mensagem: MensagemParaEnvio) => ErroEnvioWhatsapp | undefined;
+
+  async enviar(mensagem: MensagemParaEnvio): Promise<string> {
+    if (this.latenciaMs > 0) {
+      await new Promise((resolve) => setTimeout(resolve, this.latenciaMs));
+    }
+    const erro = this.falhar?.(mensagem);
+    if (erro) throw erro;
+
+    const provedorId = `fake-${randomUUID()}`;
+    this.enviadas.push({ ...mensagem, provedorId, enviadaEm: new Date() });
+    this.logger.debug(`Mensagem WhatsApp (fake) para ${mensagem.telefone}`);
+    return provedorId;
+  }
+}
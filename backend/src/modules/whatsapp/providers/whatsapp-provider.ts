@@ -0,0 +1,29 @@
+export interface MensagemParaEnvio {
+  id: string;
+  telefone: string;
+  mensagem: string;
+}
+
+/** Provedor de envio (WhatsApp Cloud API, fake local...). */
+export interface WhatsappProvider {
+  readonly nome: string;
+  /** Envia a mensagem e devolve o id dela no provedor. Falhas lançam ErroEnvioWhatsapp. */
+  enviar(mensagem: MensagemParaEnvio): Promise<string>;
+}
+
+export const WHATSAPP_PROVIDER = Symbol('WHATSAPP_PROVIDER');
+
+/**
+ * Falha de envio. `temporaria` = vale tentar de novo (timeout, 429, 5xx);
+ * senão a mensagem vai direto para FALHOU (número inválido, token recusado...).
+ */
+export class ErroEnvioWhatsapp extends Error {
+  constructor(
+    message: string,
+    readonly temporaria: boolean,
+    readonly aguardarMs?: number,
+  ) {
+    super(message);
+    this.name = 'ErroEnvioWhatsapp';
+  }
+}
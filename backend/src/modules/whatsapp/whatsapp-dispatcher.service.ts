@@ -0,0 +1,208 @@
+import { Inject, Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { PrismaService } from '../../database/prisma.service';
+import { TtlLruCache } from '../../common/cache/ttl-lru-cache';
+import { TokenBucket } from '../../common/rate-limit/token-bucket';
+import { ErroEnvioWhatsapp, MensagemParaEnvio, WHATSAPP_PROVIDER, WhatsappProvider } from './providers/whatsapp-provider';
+
+interface MensagemPendente extends MensagemParaEnvio {
+  empresaId: string;
+  tentativas: number;
+}
+
+/**
+ * Envia as mensagens do outbox (mensagens_whatsapp) pelo provedor configurado.
+ *
+ * Quem gera a mensagem só grava a linha PENDENTE, na mesma transação da
+ * mudança no pedido; nada espera o provedor. Aqui, WHATSAPP_WORKERS loops por
+ * instância pegam lotes de até WHATSAPP_LOTE mensagens com FOR UPDATE SKIP
+ * LOCKED, enviam o lote em paralelo e gravam o resultado em poucos UPDATEs.
+ *
+ * - Limites (token bucket, por instância): WHATSAPP_RATE_POR_SEGUNDO para o
+ *   provedor e WHATSAPP_RATE_EMPRESA_POR_MINUTO (rajada WHATSAPP_RAJADA_EMPRESA)
+ *   por empresa. Uma empresa acima do limite tem as mensagens adiadas sem
+ *   gastar tentativa; as outras seguem.
+ * - Falhas temporárias voltam para a fila com backoff exponencial a partir de
+ *   WHATSAPP_BACKOFF_MS; falhas definitivas, ou depois de
+ *   WHATSAPP_MAX_TENTATIVAS, ficam como FALHOU com o erro.
+ * - Um lote pego tem prazo (WHATSAPP_LEASE_MS); se a instância cair no meio,
+ *   as mensagens voltam para a fila quando o prazo vence.
+ * - Todas as datas vêm do relógio do Node (parâmetros), não de CURRENT_TIMESTAMP:
+ *   as colunas guardam UTC sem fuso e o fuso da sessão pode ser outro.
+ */
+@Injectable()
+export class WhatsappDispatcher implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(WhatsappDispatcher.name);
+  // 0 desliga o envio nesta instância (as mensagens ficam para as outras)
+  private readonly workers = Number(process.env.WHATSAPP_WORKERS ?? 1);
+  private readonly lote = Number(process.env.WHATSAPP_LOTE || 50);
+  private readonly maxTentativas = Number(process.env.WHATSAPP_MAX_TENTATIVAS || 5);
+  private readonly backoffMs = Number(process.env.WHATSAPP_BACKOFF_MS || 10_000);
+  private readonly leaseMs = Number(process.env.WHATSAPP_LEASE_MS || 60_000);
+  private readonly pollMs = Number(process.env.WHATSAPP_POLL_MS || 1_000);
+  private readonly limiteProvedor: TokenBucket;
+  private readonly limitesEmpresa = new TtlLruCache<string, TokenBucket>(10_000, 10 * 60_000);
+  private readonly porMinutoEmpresa = Number(process.env.WHATSAPP_RATE_EMPRESA_POR_MINUTO || 30);
+  private readonly rajadaEmpresa = Number(process.env.WHATSAPP_RAJADA_EMPRESA || 10);
+  private ativo = false;
+  private loops: Promise<void>[] = [];
+  private despertar: (() => void)[] = [];
+
+  constructor(
+    private readonly prisma: PrismaService,
+    @Inject(WHATSAPP_PROVIDER) private readonly provedor: WhatsappProvider,
+  ) {
+    const porSegundo = Number(process.env.WHATSAPP_RATE_POR_SEGUNDO || 20);
+    this.limiteProvedor = new TokenBucket(porSegundo, porSegundo);
+  }
+
+  onModuleInit() {
+    this.ativo = true;
+    for (let i = 0; i < this.workers; i++) {
+      this.loops.push(this.executarLoop());
+    }
+  }
+
+  async onModuleDestroy() {
+    this.ativo = false;
+    this.acordar(this.despertar.length);
+    await Promise.all(this.loops);
+  }
+
+  /** Avisa que há mensagens novas (chamar depois do commit que as gravou). */
+  acordar(quantos = 1): void {
+    for (const acordar of this.despertar.slice(0, quantos)) acordar();
+  }
+
+  private async executarLoop(): Promise<void> {
+    while (this.ativo) {
+      let lote: MensagemPendente[] = [];
+      try {
+        lote = await this.pegarLote();
+        if (lote.length > 0) await this.enviarLote(lote);
+      } catch (err) {
+        this.logger.warn(`Falha no envio de mensagens WhatsApp: ${err}`);
+        lote = [];
+      }
+      // Lote cheio: provavelmente há mais na fila, segue sem esperar
+      if (lote.length < this.lote) await this.aguardar();
+    }
+  }
+
+  private pegarLote(): Promise<MensagemPendente[]> {
+    const agora = new Date();
+    return this.prisma.$queryRaw<MensagemPendente[]>`
+      UPDATE "mensagens_whatsapp"
+      SET "tentativas" = "tentativas" + 1,
+          "travado_ate" = ${new Date(agora.getTime() + this.leaseMs)}
+      WHERE "id" IN (
+        SELECT "id" FROM "mensagens_whatsapp"
+        WHERE "disponivel_em" <= ${agora}
+          AND ("travado_ate" IS NULL OR "travado_ate" < ${agora})
+        ORDER BY "disponivel_em"
+        LIMIT ${this.lote}
+        FOR UPDATE SKIP LOCKED
+      )
+      RETURNING "id", "empresa_id" AS "empresaId", "telefone", "mensagem", "tentativas"`;
+  }
+
+  private async enviarLote(lote: MensagemPendente[]): Promise<void> {
+    const adiadas: { id: string; disponivelEm: string }[] = [];
+    const liberadas: MensagemPendente[] = [];
+    for (const mensagem of lote) {
+      const limite = this.limiteEmpresa(mensagem.empresaId);
+      if (limite.tentarConsumir()) liberadas.push(mensagem);
+      else adiadas.push({ id: mensagem.id, disponivelEm: new Date(Date.now() + limite.esperaMs()).toISOString() });
+    }
+
+    const enviadas: { id: string; provedorId: string }[] = [];
+    const falhas: { mensagem: MensagemPendente; erro: ErroEnvioWhatsapp }[] = [];
+    await Promise.all(
+      liberadas.map(async (mensagem) => {
+        await this.limiteProvedor.consumir();
+        try {
+          const provedorId = await this.provedor.enviar(mensagem);
+          enviadas.push({ id: mensagem.id, provedorId: provedorId ?? null });
+        } catch (error) {
+          falhas.push({
+            mensagem,
+            erro: error instanceof ErroEnvioWhatsapp ? error : new ErroEnvioWhatsapp(String(error?.message ?? error), true),
+          });
+        }
+      }),
+    );
+
+    if (enviadas.length > 0) {
+      await this.prisma.$executeRaw`
+        UPDATE "mensagens_whatsapp" m
+        SET "status" = 'ENVIADO', "provedor_id" = e."provedorId", "enviado_em" = ${new Date()},
+            "erro" = NULL, "disponivel_em" = NULL, "travado_ate" = NULL
+        FROM unnest(${enviadas.map((e) => e.id)}::text[], ${enviadas.map((e) => e.provedorId)}::text[])
+          AS e("id", "provedorId")
+        WHERE m."id" = e."id"`;
+    }
+
+    if (adiadas.length > 0) {
+      // Limite da empresa não é falha: devolve a tentativa. As datas vão como ISO
+      // (UTC); o cast para timestamp descarta o "Z", como o Prisma grava as colunas
+      await this.prisma.$executeRaw`
+        UPDATE "mensagens_whatsapp" m
+        SET "tentativas" = m."tentativas" - 1, "travado_ate" = NULL,
+            "disponivel_em" = a."disponivelEm"::timestamp(3)
+        FROM unnest(${adiadas.map((a) => a.id)}::text[], ${adiadas.map((a) => a.disponivelEm)}::text[])
+          AS a("id", "disponivelEm")
+        WHERE m."id" = a."id"`;
+    }
+
+    for (const { mensagem, erro } of falhas) {
+      await this.registrarFalha(mensagem, erro);
+    }
+  }
+
+  private async registrarFalha(mensagem: MensagemPendente, erro: ErroEnvioWhatsapp): Promise<void> {
+    const desistir = !erro.temporaria || mensagem.tentativas >= this.maxTentativas;
+    const esperaMs = Math.max(
+      erro.aguardarMs ?? 0,
+      Math.min(this.backoffMs * 2 ** (mensagem.tentativas - 1), 60 * 60_000),
+    );
+    if (desistir) {
+      this.logger.error(
+        `Mensagem WhatsApp ${mensagem.id} para ${mensagem.telefone} falhou (${mensagem.tentativas} tentativas): ${erro.message}`,
+      );
+    }
+    await this.prisma.mensagemWhatsApp
+      .update({
+        where: { id: mensagem.id },
+        data: {
+          status: desistir ? 'FALHOU' : 'PENDENTE',
+          erro: erro.message,
+          disponivelEm: desistir ? null : new Date(Date.now() + esperaMs),
+          travadoAte: null,
+        },
+      })
+      .catch((err) => this.logger.warn(`Falha ao registrar erro da mensagem ${mensagem.id}: ${err}`));
+  }
+
+  private limiteEmpresa(empresaId: string): TokenBucket {
+    let limite = this.limitesEmpresa.get(empresaId);
+    if (!limite) {
+      limite = new TokenBucket(this.rajadaEmpresa, this.porMinutoEmpresa / 60);
+      this.limitesEmpresa.set(empresaId, limite);
+    }
+    return limite;
+  }
+
+  /** Dorme até uma mensagem nova desta instância ou até o próximo poll. */
+  private aguardar(): Promise<void> {
+    return new Promise((resolve) => {
+      const timer = setTimeout(acordar, this.pollMs);
+      const despertar = this.despertar;
+      function acordar() {
+        clearTimeout(timer);
+        const i = despertar.indexOf(acordar);
+        if (i >= 0) despertar.splice(i, 1);
+        resolve();
+      }
+      despertar.push(acordar);
+    });
+  }
+}
@@ -1,9 +1,33 @@
-
 import { Module } from '@nestjs/common';
+import { HttpModule } from '@nestjs/axios';
+import { Agent } from 'https';
 import { WhatsappService } from './whatsapp.service';
+import { WhatsappDispatcher } from './whatsapp-dispatcher.service';
+import { WHATSAPP_PROVIDER } from './providers/whatsapp-provider';
+import { FakeWhatsappProvider } from './providers/fake-whatsapp.provider';
+import { CloudApiWhatsappProvider } from './providers/cloud-api-whatsapp.provider';
 
 @Module({
-  providers: [WhatsappService],
+  imports: [
+    HttpModule.register({
+      timeout: Number(process.env.WHATSAPP_TIMEOUT_MS || 10_000),
+      // Conexões reaproveitadas entre envios (e no máximo tantas em paralelo)
+      httpsAgent: new Agent({ keepAlive: true, maxSockets: Number(process.env.WHATSAPP_MAX_CONEXOES || 20) }),
+    }),
+  ],
+  providers: [
+    WhatsappService,
+    WhatsappDispatcher,
+    FakeWhatsappProvider,
+    CloudApiWhatsappProvider,
+    {
+      provide: WHATSAPP_PROVIDER,
+      // Padrão é o fake: sem credenciais, as mensagens são só registradas
+      useFactory: (fake: FakeWhatsappProvider, cloudApi: CloudApiWhatsappProvider) =>
+        process.env.WHATSAPP_PROVIDER === 'cloud-api' ? cloudApi : fake,
+      inject: [FakeWhatsappProvider, CloudApiWhatsappProvider],
+    },
+  ],
   exports: [WhatsappService],
 })
 export class WhatsappModule {}
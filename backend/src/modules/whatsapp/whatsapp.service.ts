@@ -1,64 +1,80 @@
-import { Injectable, Logger } from '@nestjs/common';
+import { BadRequestException, Injectable, Logger } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { randomUUID } from 'crypto';
 import { PrismaService } from '../../database/prisma.service';
+import { WhatsappDispatcher } from './whatsapp-dispatcher.service';
 
+type Cliente = PrismaService | Prisma.TransactionClient;
+
+/**
+ * Mensagens WhatsApp. Nada aqui chama o provedor: as mensagens são gravadas
+ * PENDENTE em mensagens_whatsapp (o outbox) e o WhatsappDispatcher as envia.
+ */
 @Injectable()
 export class WhatsappService {
   private readonly logger = new Logger(WhatsappService.name);
 
-  constructor(private prisma: PrismaService) {}
+  constructor(
+    private prisma: PrismaService,
+    private readonly dispatcher: WhatsappDispatcher,
+  ) {}
+
+  /**
+   * Grava a notificação de mudança de status para o cliente do pedido. Feita
+   * com o `tx` da mudança: a mensagem só existe se o novo status for gravado.
+   * Retorna false se o cliente não tem telefone.
+   */
+  async enfileirarNotificacaoStatus(
+    tx: Cliente,
+    pedido: { id: string; numero: string; empresaId: string; clienteId: string },
+    novoStatus: string,
+  ): Promise<boolean> {
+    const mensagem = this.gerarMensagemStatus(pedido.numero, novoStatus);
+    // Datas pelo relógio do Node, o mesmo que o WhatsappDispatcher compara
+    const agora = new Date();
+    const inseridas = await tx.$executeRaw`
+      INSERT INTO "mensagens_whatsapp"
+        ("id", "pedido_id", "empresa_id", "telefone", "mensagem", "disponivel_em", "created_at")
+      SELECT ${randomUUID()}, ${pedido.id}, ${pedido.empresaId}, u."telefone", ${mensagem}, ${agora}, ${agora}
+      FROM "usuarios" u
+      WHERE u."id" = ${pedido.clienteId} AND coalesce(u."telefone", '') <> ''`;
+    return inseridas > 0;
+  }
+
+  /** Acorda o dispatcher; chamar depois do commit da transação que enfileirou. */
+  despachar(): void {
+    this.dispatcher.acordar();
+  }
 
   async enviarMensagemPedido(pedidoId: string, telefone: string, mensagem: string, empresaId: string) {
     try {
-      // Implementação básica para envio de mensagens WhatsApp
-      this.logger.log(`Mensagem WhatsApp enviada para ${telefone} sobre pedido ${pedidoId}`);
-      
-      // Salvar mensagem no banco para histórico
-      await this.prisma.mensagemWhatsApp.create({
-        data: {
-          telefone,
-          mensagem,
-          pedidoId,
-          status: 'ENVIADO',
-        },
+      const registro = await this.prisma.mensagemWhatsApp.create({
+        data: { pedidoId, empresaId, telefone, mensagem },
+        select: { id: true },
       });
+      this.despachar();
+      this.logger.log(`Mensagem WhatsApp para ${telefone} sobre pedido ${pedidoId} enfileirada`);
 
-      // Aqui você implementaria a integração com a API do WhatsApp
-      // Por exemplo: WhatsApp Business API, Twilio, etc.
-      
-      return { success: true, message: 'Mensagem enviada com sucesso' };
+      return { success: true, message: 'Mensagem enfileirada para envio', id: registro.id };
     } catch (error) {
-      this.logger.error(`Erro ao enviar mensagem WhatsApp: ${error.message}`);
+      this.logger.error(`Erro ao enfileirar mensagem WhatsApp: ${error.message}`);
       throw error;
     }
   }
 
   async enviarNotificacaoStatus(pedidoId: string, novoStatus: string, empresaId: string) {
-    try {
-      // Buscar dados do pedido
-      const pedido = await this.prisma.pedido.findUnique({
-        where: { id: pedidoId },
-        include: {
-          cliente: true,
-        },
-      });
-
-      if (!pedido || !pedido.cliente?.telefone) {
-        this.logger.warn(`Pedido ${pedidoId} não encontrado ou cliente sem telefone`);
-        return { success: false, message: 'Dados insuficientes para envio' };
-      }
-
-      const mensagem = this.gerarMensagemStatus(pedido.numero, novoStatus);
-      
-      return await this.enviarMensagemPedido(
-        pedidoId,
-        pedido.cliente.telefone,
-        mensagem,
-        empresaId
-      );
-    } catch (error) {
-      this.logger.error(`Erro ao enviar notificação de status: ${error.message}`);
-      throw error;
+    const pedido = await this.prisma.pedido.findFirst({
+      where: { id: pedidoId, empresaId },
+      select: { id: true, numero: true, empresaId: true, clienteId: true },
+    });
+
+    if (!pedido || !(await this.enfileirarNotificacaoStatus(this.prisma, pedido, novoStatus))) {
+      this.logger.warn(`Pedido ${pedidoId} não encontrado ou cliente sem telefone`);
+      return { success: false, message: 'Dados insuficientes para envio' };
     }
+
+    this.despachar();
+    return { success: true, message: 'Mensagem enfileirada para envio' };
   }
 
   private gerarMensagemStatus(numeroPedido: string, status: string): string {
@@ -74,32 +90,14 @@ export class WhatsappService {
   }
 
   async enviarMensagem(empresaId: string, telefone: string, mensagem: string, pedidoId?: string) {
-    try {
-      this.logger.log(`Enviando mensagem WhatsApp para ${telefone}`);
-      
-      // Salvar mensagem no banco para histórico
-      const mensagemData: any = {
-        telefone,
-        mensagem,
-        status: 'ENVIADO',
-      };
-
-      if (pedidoId) {
-        mensagemData.pedidoId = pedidoId;
-      }
-
-      await this.prisma.mensagemWhatsApp.create({
-        data: mensagemData,
-      });
-
-      // Aqui você implementaria a integração com a API do WhatsApp
-      // Por exemplo: WhatsApp Business API, Twilio, etc.
-      
-      return { success: true, message: 'Mensagem enviada com sucesso' };
-    } catch (error) {
-      this.logger.error(`Erro ao enviar mensagem WhatsApp: ${error.message}`);
-      throw error;
+    if (!pedidoId) {
+      throw new BadRequestException('pedidoId é obrigatório');
+    }
+    const pedido = await this.prisma.pedido.findFirst({ where: { id: pedidoId, empresaId }, select: { id: true } });
+    if (!pedido) {
+      throw new BadRequestException('Pedido não encontrado');
     }
+    return this.enviarMensagemPedido(pedidoId, telefone, mensagem, empresaId);
   }
 
   async listarMensagens(empresaId: string) {
@@ -114,9 +112,7 @@ export class WhatsappService {
           },
         },
         where: {
-          pedido: {
-            empresaId,
-          },
+          empresaId,
         },
         orderBy: {
           createdAt: 'desc',
@@ -135,9 +131,7 @@ export class WhatsappService {
       const mensagens = await this.prisma.mensagemWhatsApp.findMany({
         where: {
           pedidoId,
-          pedido: {
-            empresaId,
-          },
+          empresaId,
         },
         orderBy: {
           createdAt: 'desc',
@@ -1,4 +1,4 @@
-import { IsOptional, IsEnum, IsString, IsDateString, IsInt, Min } from 'class-validator';
+import { IsOptional, IsEnum, IsString, IsDateString, IsInt, Min, Max } from 'class-validator';
 import { Type } from 'class-transformer';
 
 // Enum StatusPedido como constantes para compatibilidade com SQLite
@@ -26,10 +26,17 @@ export class FiltrarPedidosDto {
   @IsDateString()
   dataFim?: string;
 
+  // Cliente do pedido
   @IsOptional()
   @IsString()
   usuarioId?: string;
 
+  // `pagination.nextCursor` da página anterior; sem cursor começa dos mais recentes
+  @IsOptional()
+  @IsString()
+  cursor?: string;
+
+  // Paginação por offset, mantida para clientes antigos; ignorada quando há cursor
   @IsOptional()
   @Type(() => Number)
   @IsInt()
@@ -40,5 +47,6 @@ export class FiltrarPedidosDto {
   @Type(() => Number)
   @IsInt()
   @Min(1)
+  @Max(100)
   limit?: number = 10;
 }
\ No newline at end of file
@@ -5,9 +5,10 @@ import { PedidosController } from './pedidos.controller';
 import { PrismaModule } from '../database/prisma.module';
 import { NotificacoesModule } from '../modules/notificacoes/notificacoes.module';
 import { WhatsappModule } from '../modules/whatsapp/whatsapp.module';
+import { VendasDiariasModule } from '../dashboard/vendas-diarias.module';
 
 @Module({
-  imports: [PrismaModule, NotificacoesModule, WhatsappModule],
+  imports: [PrismaModule, NotificacoesModule, WhatsappModule, VendasDiariasModule],
   controllers: [PedidosController],
   providers: [PedidosService],
   exports: [PedidosService],
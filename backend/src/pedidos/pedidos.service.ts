@@ -1,8 +1,36 @@
 
-import { Injectable, NotFoundException, Logger } from '@nestjs/common';
+import { Injectable, NotFoundException, BadRequestException, Logger } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../database/prisma.service';
 import { UpdateStatusPedidoDto } from './dto/update-status-pedido.dto';
 import { FiltrarPedidosDto } from './dto/filtrar-pedidos.dto';
+import { VendasDiariasService } from '../dashboard/vendas-diarias.service';
+import { WhatsappService } from '../modules/whatsapp/whatsapp.service';
+
+// Projeção da listagem: sem itens (carregados só em findOne), apenas a contagem
+const PEDIDO_LISTAGEM = {
+  id: true,
+  numero: true,
+  status: true,
+  subtotal: true,
+  desconto: true,
+  frete: true,
+  total: true,
+  formaPagamento: true,
+  empresaId: true,
+  createdAt: true,
+  updatedAt: true,
+  cliente: {
+    select: {
+      id: true,
+      nome: true,
+      email: true,
+    },
+  },
+  _count: {
+    select: { itens: true },
+  },
+} satisfies Prisma.PedidoSelect;
 
 @Injectable()
 export class PedidosService {
@@ -10,51 +38,79 @@ export class PedidosService {
 
   constructor(
     private readonly prisma: PrismaService,
+    private readonly vendasDiarias: VendasDiariasService,
+    private readonly whatsapp: WhatsappService,
   ) {}
 
   async findAll(filtros: FiltrarPedidosDto, empresaId?: string) {
     this.logger.log('Buscando pedidos com filtros:', filtros);
-    
-    // Implementação básica sem paginação por enquanto
-    const pedidos = await this.prisma.pedido.findMany({
-      include: {
-        cliente: {
-          select: {
-            id: true,
-            nome: true,
-            email: true,
-          },
-        },
-        itens: {
-          include: {
-            produto: {
-              select: {
-                id: true,
-                nome: true,
-                imagem: true,
-              },
+
+    const limit = filtros.limit ?? 10;
+    const where: Prisma.PedidoWhereInput = {};
+
+    // SUPER_ADMIN sem empresa enxerga todas as lojas; os demais só a própria
+    if (empresaId) where.empresaId = empresaId;
+    if (filtros.status) where.status = filtros.status;
+    if (filtros.usuarioId) where.clienteId = filtros.usuarioId;
+    if (filtros.dataInicio || filtros.dataFim) {
+      where.createdAt = {
+        ...(filtros.dataInicio && { gte: new Date(filtros.dataInicio) }),
+        ...(filtros.dataFim && { lte: new Date(filtros.dataFim) }),
+      };
+    }
+
+    // Keyset sobre (createdAt, id) desc, coberto pelo índice (empresaId, createdAt, id)
+    const cursor = filtros.cursor ? this.decodificarCursor(filtros.cursor) : null;
+    const pagina: Prisma.PedidoWhereInput = cursor
+      ? {
+          AND: [
+            where,
+            {
+              OR: [
+                { createdAt: { lt: cursor.createdAt } },
+                { createdAt: cursor.createdAt, id: { lt: cursor.id } },
+              ],
             },
-          },
-        },
-      },
-      orderBy: {
-         createdAt: 'desc',
-       },
+          ],
+        }
+      : where;
+
+    // Uma linha a mais diz se existe próxima página sem precisar de count()
+    const pedidos = await this.prisma.pedido.findMany({
+      where: pagina,
+      select: PEDIDO_LISTAGEM,
+      orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+      take: limit + 1,
+      skip: cursor ? 0 : ((filtros.page ?? 1) - 1) * limit,
     });
 
+    const hasNextPage = pedidos.length > limit;
+    const data = hasNextPage ? pedidos.slice(0, limit) : pedidos;
+    const ultimo = data[data.length - 1];
+
     return {
-      data: pedidos,
+      data,
       pagination: {
-        currentPage: 1,
-        totalPages: 1,
-        totalItems: pedidos.length,
-        itemsPerPage: pedidos.length,
-        hasNextPage: false,
-        hasPreviousPage: false,
+        itemsPerPage: limit,
+        hasNextPage,
+        nextCursor: hasNextPage ? this.codificarCursor(ultimo) : null,
       },
     };
   }
 
+  private codificarCursor(pedido: { createdAt: Date; id: string }): string {
+    return Buffer.from(`${pedido.createdAt.toISOString()}|${pedido.id}`).toString('base64url');
+  }
+
+  private decodificarCursor(cursor: string): { createdAt: Date; id: string } {
+    const [data, id] = Buffer.from(cursor, 'base64url').toString('utf8').split('|');
+    const createdAt = new Date(data);
+    if (!id || isNaN(createdAt.getTime())) {
+      throw new BadRequestException('Cursor inválido');
+    }
+    return { createdAt, id };
+  }
+
   async findMeusPedidos(userId: string, empresaId: string, page: number = 1, limit: number = 10) {
     this.logger.log(`Buscando pedidos do usuário ${userId}`);
     
@@ -135,7 +191,8 @@ export class PedidosService {
       },
     });
 
-    if (!pedido) {
+    // Pedido de outra loja (ou de outro cliente) responde como inexistente
+    if (!pedido || (empresaId && pedido.empresaId !== empresaId) || (userId && pedido.clienteId !== userId)) {
       throw new NotFoundException(`Pedido com ID ${id} não encontrado`);
     }
 
@@ -145,35 +202,11 @@ export class PedidosService {
   async updateStatus(id: string, updateStatusDto: UpdateStatusPedidoDto, empresaId?: string) {
     this.logger.log(`Atualizando status do pedido ${id} para: ${updateStatusDto.status}`);
     
-    const pedido = await this.findOne(id);
+    const pedido = await this.findOne(id, empresaId);
     
-    const pedidoAtualizado = await this.prisma.pedido.update({
-      where: { id },
-      data: {
-         status: updateStatusDto.status as any,
-         observacoes: updateStatusDto.observacoes,
-         updatedAt: new Date(),
-       },
-      include: {
-        cliente: {
-          select: {
-            id: true,
-            nome: true,
-            email: true,
-          },
-        },
-        itens: {
-          include: {
-            produto: {
-              select: {
-                id: true,
-                nome: true,
-                imagem: true,
-              },
-            },
-          },
-        },
-      },
+    const pedidoAtualizado = await this.gravarStatus(id, {
+      status: updateStatusDto.status as any,
+      observacoes: updateStatusDto.observacoes,
     });
 
     this.logger.log(`Status do pedido ${id} atualizado com sucesso`);
@@ -194,37 +227,63 @@ export class PedidosService {
       throw new Error('Não é possível cancelar um pedido já entregue');
     }
     
-    const pedidoCancelado = await this.prisma.pedido.update({
-      where: { id },
-      data: {
-        status: 'CANCELADO',
-        observacoes: 'Pedido cancelado',
-        updatedAt: new Date(),
-      },
-      include: {
-        cliente: {
-          select: {
-            id: true,
-            nome: true,
-            email: true,
-          },
+    const pedidoCancelado = await this.gravarStatus(id, {
+      status: 'CANCELADO',
+      observacoes: 'Pedido cancelado',
+    });
+
+    this.logger.log(`Pedido ${id} cancelado com sucesso`);
+    
+    return pedidoCancelado;
+  }
+
+  // Atualiza o status, move o pedido no rollup do dashboard e enfileira a notificação
+  // WhatsApp do cliente, na mesma transação; o envio fica com o WhatsappDispatcher.
+  // A linha fica travada (FOR UPDATE) para que duas mudanças simultâneas vejam o status anterior correto.
+  private async gravarStatus(id: string, data: { status: string; observacoes?: string }) {
+    let notificar = false;
+    const pedidoAtualizado = await this.prisma.$transaction(async (tx) => {
+      const [anterior] = await tx.$queryRaw<{ status: string }[]>`
+        SELECT "status" FROM "pedidos" WHERE "id" = ${id} FOR UPDATE`;
+
+      const pedido = await tx.pedido.update({
+        where: { id },
+        data: {
+          ...data,
+          updatedAt: new Date(),
         },
-        itens: {
-          include: {
-            produto: {
-              select: {
-                id: true,
-                nome: true,
-                imagem: true,
+        include: {
+          cliente: {
+            select: {
+              id: true,
+              nome: true,
+              email: true,
+            },
+          },
+          itens: {
+            include: {
+              produto: {
+                select: {
+                  id: true,
+                  nome: true,
+                  imagem: true,
+                },
               },
             },
           },
         },
-      },
+      });
+
+      if (anterior) {
+        await this.vendasDiarias.moverStatus(tx, pedido, anterior.status);
+      }
+      if (anterior?.status !== pedido.status) {
+        notificar = await this.whatsapp.enfileirarNotificacaoStatus(tx, pedido, pedido.status);
+      }
+      return pedido;
     });
 
-    this.logger.log(`Pedido ${id} cancelado com sucesso`);
-    
-    return pedidoCancelado;
+    if (notificar) this.whatsapp.despachar();
+    return pedidoAtualizado;
   }
 }
@@ -0,0 +1,129 @@
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../src/database/prisma.service';
+import { CarrinhoService } from '../src/modules/carrinho/carrinho.service';
+import { CuponsService } from '../src/cupons/cupons.service';
+import { VendasDiariasService } from '../src/dashboard/vendas-diarias.service';
+import { CheckoutDto } from '../src/modules/carrinho/dto';
+
+// Precisa de um Postgres com as migrations aplicadas: TEST_DATABASE_URL=... npm test
+const DATABASE_URL = process.env.TEST_DATABASE_URL;
+const describeComBanco = DATABASE_URL ? describe : describe.skip;
+
+const CHECKOUTS = 100;
+
+const dto: CheckoutDto = {
+  enderecoEntrega: {
+    rua: 'Rua Teste',
+    numero: '1',
+    bairro: 'Centro',
+    cidade: 'São Paulo',
+    estado: 'SP',
+    cep: '01000-000',
+  },
+  formaPagamento: 'PIX',
+} as CheckoutDto;
+
+describeComBanco('CarrinhoService.checkout (concorrência)', () => {
+  jest.setTimeout(120_000);
+
+  let prisma: PrismaService;
+  let service: CarrinhoService;
+  let empresaId: string;
+
+  beforeAll(async () => {
+    prisma = new PrismaService({ datasources: { db: { url: DATABASE_URL } } } as any);
+    await prisma.$connect();
+    service = new CarrinhoService(prisma, new CuponsService(prisma), new VendasDiariasService(prisma));
+  });
+
+  beforeEach(async () => {
+    const sufixo = randomUUID().slice(0, 8);
+    const empresa = await prisma.empresa.create({
+      data: { nome: `Concorrência ${sufixo}`, email: `concorrencia-${sufixo}@teste.local` },
+    });
+    empresaId = empresa.id;
+  });
+
+  afterEach(async () => {
+    // Usuários, pedidos, produtos e cupons caem em cascata
+    await prisma.empresa.delete({ where: { id: empresaId } });
+  });
+
+  afterAll(async () => {
+    await prisma.$disconnect();
+  });
+
+  /** Cria `CHECKOUTS` clientes, cada um com o produto no carrinho. */
+  async function prepararClientes(produtoId: string) {
+    const clientes: string[] = [];
+    for (let i = 0; i < CHECKOUTS; i++) {
+      const usuario = await prisma.usuario.create({
+        data: {
+          nome: `Cliente ${i}`,
+          email: `cliente-${i}-${empresaId}@teste.local`,
+          senha: 'x',
+          empresaId,
+          carrinho: {
+            create: { empresaId, itens: { create: { produtoId, quantidade: 1, precoUnitario: 10 } } },
+          },
+        },
+      });
+      clientes.push(usuario.id);
+    }
+    return clientes;
+  }
+
+  it('vende a última unidade para um único cliente', async () => {
+    const produto = await prisma.produto.create({
+      data: { nome: 'Último pedaço', preco: 10, estoque: 1, empresaId },
+    });
+    const clientes = await prepararClientes(produto.id);
+
+    const resultados = await Promise.allSettled(
+      clientes.map((usuarioId) => service.checkout(usuarioId, empresaId, dto)),
+    );
+
+    const aprovados = resultados.filter((r) => r.status === 'fulfilled');
+    const recusados = resultados.filter((r): r is PromiseRejectedResult => r.status === 'rejected');
+    expect(aprovados).toHaveLength(1);
+    expect(recusados).toHaveLength(CHECKOUTS - 1);
+    for (const r of recusados) {
+      expect(r.reason.message).toContain('Estoque insuficiente');
+    }
+
+    const atualizado = await prisma.produto.findUnique({ where: { id: produto.id } });
+    expect(atualizado.estoque).toBe(0);
+    expect(await prisma.pedido.count({ where: { empresaId } })).toBe(1);
+    expect(await prisma.itemPedido.count({ where: { produtoId: produto.id } })).toBe(1);
+  });
+
+  it('não passa do usoMaximo do cupom', async () => {
+    const produto = await prisma.produto.create({
+      data: { nome: 'Com estoque', preco: 10, estoque: CHECKOUTS, empresaId },
+    });
+    await prisma.cupom.create({
+      data: {
+        codigo: 'UMAVEZ',
+        descricao: 'Uso único',
+        tipo: 'VALOR_FIXO',
+        valor: 5,
+        dataInicio: new Date(Date.now() - 60_000),
+        dataFim: new Date(Date.now() + 60_000),
+        usoMaximo: 1,
+        empresaId,
+      },
+    });
+    const clientes = await prepararClientes(produto.id);
+
+    const resultados = await Promise.allSettled(
+      clientes.map((usuarioId) => service.checkout(usuarioId, empresaId, { ...dto, cupomDesconto: 'UMAVEZ' })),
+    );
+
+    expect(resultados.filter((r) => r.status === 'fulfilled')).toHaveLength(1);
+    const cupom = await prisma.cupom.findFirst({ where: { empresaId, codigo: 'UMAVEZ' } });
+    expect(cupom.usoAtual).toBe(1);
+    // Checkouts recusados não baixam estoque
+    const atualizado = await prisma.produto.findUnique({ where: { id: produto.id } });
+    expect(atualizado.estoque).toBe(CHECKOUTS - 1);
+  });
+});
@@ -0,0 +1,131 @@
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../src/database/prisma.service';
+import { WebhookQueue } from '../src/modules/webhooks/webhook-queue.service';
+
+// Precisa de um Postgres com as migrations aplicadas: TEST_DATABASE_URL=... npm test
+const DATABASE_URL = process.env.TEST_DATABASE_URL;
+const describeComBanco = DATABASE_URL ? describe : describe.skip;
+
+describeComBanco('WebhookQueue (fila em webhook_logs)', () => {
+  jest.setTimeout(60_000);
+
+  let prisma: PrismaService;
+  let queue: WebhookQueue;
+  let processar: jest.Mock;
+  let prefixo: string;
+
+  beforeAll(async () => {
+    Object.assign(process.env, {
+      WEBHOOK_WORKERS: '3',
+      WEBHOOK_MAX_TENTATIVAS: '3',
+      WEBHOOK_BACKOFF_MS: '20',
+      WEBHOOK_POLL_MS: '20',
+    });
+    prisma = new PrismaService({ datasources: { db: { url: DATABASE_URL } } } as any);
+    await prisma.$connect();
+  });
+
+  beforeEach(() => {
+    prefixo = `teste-${randomUUID()}`;
+    processar = jest.fn().mockResolvedValue(undefined);
+    queue = new WebhookQueue(prisma, { processarEventoAsaas: processar } as any);
+  });
+
+  afterEach(async () => {
+    await queue.onModuleDestroy();
+    await prisma.webhookLog.deleteMany({ where: { eventoId: { startsWith: prefixo } } });
+  });
+
+  afterAll(async () => {
+    await prisma.$disconnect();
+  });
+
+  async function enfileirar(evento: string, pagamento: string) {
+    const inserido = await queue.enfileirar({
+      origem: 'ASAAS',
+      evento,
+      eventoId: `${prefixo}-${evento}`,
+      chaveOrdem: `${prefixo}-${pagamento}`,
+      payload: { id: `${prefixo}-${evento}`, event: evento, payment: { id: pagamento } },
+    });
+    // createdAt define a ordem por pagamento: eventos em milissegundos distintos
+    await new Promise((resolve) => setTimeout(resolve, 5));
+    return inserido;
+  }
+
+  async function aguardarAte(condicao: () => Promise<boolean>) {
+    const limite = Date.now() + 20_000;
+    while (!(await condicao())) {
+      if (Date.now() > limite) throw new Error('Tempo esgotado esperando a fila');
+      await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+  }
+
+  const logs = () =>
+    prisma.webhookLog.findMany({ where: { eventoId: { startsWith: prefixo } }, orderBy: { createdAt: 'asc' } });
+
+  it('ignora o reenvio do mesmo evento', async () => {
+    expect(await enfileirar('PAYMENT_CREATED', 'pay_1')).toBe(true);
+    expect(await enfileirar('PAYMENT_CREATED', 'pay_1')).toBe(false);
+    expect(await logs()).toHaveLength(1);
+  });
+
+  it('processa os eventos de um pagamento em ordem, mesmo com retry no primeiro', async () => {
+    const processados: string[] = [];
+    let falhou = false;
+    processar.mockImplementation(async (payload) => {
+      if (payload.event === 'PAYMENT_CREATED' && !falhou) {
+        falhou = true;
+        throw new Error('Falha temporária');
+      }
+      processados.push(`${payload.payment.id}:${payload.event}`);
+    });
+
+    await enfileirar('PAYMENT_CREATED', 'pay_1');
+    await enfileirar('PAYMENT_CONFIRMED', 'pay_1');
+    await enfileirar('PAYMENT_RECEIVED', 'pay_1');
+    await enfileirar('OUTRO_PAGAMENTO', 'pay_2');
+    queue.onModuleInit();
+
+    await aguardarAte(async () => (await logs()).every((log) => log.processado));
+
+    // O evento de outro pagamento não espera o retry; os de pay_1 saem na ordem de chegada
+    expect(processados.filter((p) => p.startsWith('pay_1'))).toEqual([
+      'pay_1:PAYMENT_CREATED',
+      'pay_1:PAYMENT_CONFIRMED',
+      'pay_1:PAYMENT_RECEIVED',
+    ]);
+    const [criado, ...demais] = await logs();
+    expect(criado.tentativas).toBe(2);
+    expect(criado.erro).toBeNull();
+    for (const log of demais) {
+      expect(log.tentativas).toBe(1);
+      expect(log.disponivelEm).toBeNull();
+      expect(log.processadoEm).not.toBeNull();
+    }
+  });
+
+  it('espera o backoff entre tentativas e desiste depois de WEBHOOK_MAX_TENTATIVAS', async () => {
+    const tentativasEm: number[] = [];
+    processar.mockImplementation(async () => {
+      tentativasEm.push(Date.now());
+      throw new Error('Gateway fora do ar');
+    });
+
+    await enfileirar('PAYMENT_CREATED', 'pay_1');
+    queue.onModuleInit();
+
+    await aguardarAte(async () => {
+      const [log] = await logs();
+      return log.tentativas === 3 && log.disponivelEm === null && log.travadoAte === null;
+    });
+
+    const [log] = await logs();
+    expect(log.processado).toBe(false);
+    expect(log.erro).toBe('Gateway fora do ar');
+    expect(tentativasEm).toHaveLength(3);
+    // Backoff de 20ms, depois 40ms
+    expect(tentativasEm[1] - tentativasEm[0]).toBeGreaterThanOrEqual(20);
+    expect(tentativasEm[2] - tentativasEm[1]).toBeGreaterThanOrEqual(40);
+  });
+});
@@ -0,0 +1,158 @@
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../src/database/prisma.service';
+import { TokenBucket } from '../src/common/rate-limit/token-bucket';
+import { WhatsappDispatcher } from '../src/modules/whatsapp/whatsapp-dispatcher.service';
+import { WhatsappService } from '../src/modules/whatsapp/whatsapp.service';
+import { FakeWhatsappProvider } from '../src/modules/whatsapp/providers/fake-whatsapp.provider';
+import { ErroEnvioWhatsapp } from '../src/modules/whatsapp/providers/whatsapp-provider';
+
+describe('TokenBucket', () => {
+  afterEach(() => jest.useRealTimers());
+
+  it('libera a rajada e depois repõe na taxa configurada', () => {
+    jest.useFakeTimers({ now: 0 });
+    const limite = new TokenBucket(3, 2);
+
+    expect([1, 2, 3, 4].map(() => limite.tentarConsumir())).toEqual([true, true, true, false]);
+    expect(limite.esperaMs()).toBe(500);
+
+    jest.setSystemTime(500);
+    expect(limite.tentarConsumir()).toBe(true);
+    expect(limite.tentarConsumir()).toBe(false);
+  });
+});
+
+// Precisa de um Postgres com as migrations aplicadas: TEST_DATABASE_URL=... npm test
+const DATABASE_URL = process.env.TEST_DATABASE_URL;
+const describeComBanco = DATABASE_URL ? describe : describe.skip;
+
+describeComBanco('WhatsappDispatcher (outbox)', () => {
+  jest.setTimeout(60_000);
+
+  let prisma: PrismaService;
+  let provedor: FakeWhatsappProvider;
+  let dispatcher: WhatsappDispatcher;
+  let service: WhatsappService;
+  let empresas: string[];
+
+  beforeAll(async () => {
+    Object.assign(process.env, {
+      WHATSAPP_WORKERS: '2',
+      WHATSAPP_LOTE: '10',
+      WHATSAPP_MAX_TENTATIVAS: '3',
+      WHATSAPP_BACKOFF_MS: '10',
+      WHATSAPP_POLL_MS: '20',
+      WHATSAPP_RATE_POR_SEGUNDO: '1000',
+      WHATSAPP_RATE_EMPRESA_POR_MINUTO: '6',
+      WHATSAPP_RAJADA_EMPRESA: '5',
+    });
+    prisma = new PrismaService({ datasources: { db: { url: DATABASE_URL } } } as any);
+    await prisma.$connect();
+  });
+
+  beforeEach(async () => {
+    provedor = new FakeWhatsappProvider();
+    dispatcher = new WhatsappDispatcher(prisma, provedor);
+    service = new WhatsappService(prisma, dispatcher);
+
+    empresas = [];
+    for (let i = 0; i < 2; i++) {
+      const sufixo = randomUUID().slice(0, 8);
+      const empresa = await prisma.empresa.create({
+        data: { nome: `WhatsApp ${sufixo}`, email: `whatsapp-${sufixo}@teste.local` },
+      });
+      empresas.push(empresa.id);
+    }
+  });
+
+  afterEach(async () => {
+    await dispatcher.onModuleDestroy();
+    // Pedidos e mensagens caem em cascata
+    await prisma.empresa.deleteMany({ where: { id: { in: empresas } } });
+  });
+
+  afterAll(async () => {
+    await prisma.$disconnect();
+  });
+
+  /** Cria um pedido na empresa e enfileira `quantidade` mensagens para ele. */
+  async function enfileirar(empresaId: string, quantidade: number) {
+    const cliente = await prisma.usuario.create({
+      data: { nome: 'Cliente', email: `cliente-${randomUUID()}@teste.local`, senha: 'x', telefone: '11999990000', empresaId },
+    });
+    const pedido = await prisma.pedido.create({
+      data: { numero: `PED-${randomUUID()}`, subtotal: 10, total: 10, clienteId: cliente.id, empresaId },
+    });
+    for (let i = 0; i < quantidade; i++) {
+      await service.enfileirarNotificacaoStatus(prisma, pedido, 'CONFIRMADO');
+    }
+    return pedido;
+  }
+
+  async function aguardarAte(condicao: () => Promise<boolean>) {
+    const limite = Date.now() + 20_000;
+    while (!(await condicao())) {
+      if (Date.now() > limite) throw new Error('Tempo esgotado esperando o dispatcher');
+      await new Promise((resolve) => setTimeout(resolve, 50));
+    }
+  }
+
+  const contar = (empresaId: string, status: string) =>
+    prisma.mensagemWhatsApp.count({ where: { empresaId, status } });
+
+  it('envia o outbox respeitando o limite por empresa', async () => {
+    await enfileirar(empresas[0], 5);
+    await enfileirar(empresas[1], 8);
+    dispatcher.onModuleInit();
+
+    await aguardarAte(async () => (await contar(empresas[0], 'ENVIADO')) === 5);
+    // A segunda empresa passa da rajada: 5 na hora, o resto adiado pelo limite, sem gastar tentativa
+    const adiadasWhere = { empresaId: empresas[1], status: 'PENDENTE', tentativas: 0, travadoAte: null };
+    await aguardarAte(async () => (await prisma.mensagemWhatsApp.count({ where: adiadasWhere })) === 3);
+    expect(await contar(empresas[1], 'ENVIADO')).toBe(5);
+
+    const adiadas = await prisma.mensagemWhatsApp.findMany({ where: adiadasWhere });
+    for (const mensagem of adiadas) {
+      expect(mensagem.disponivelEm.getTime()).toBeGreaterThan(Date.now());
+    }
+
+    const enviadas = await prisma.mensagemWhatsApp.findMany({ where: { empresaId: empresas[0] } });
+    expect(provedor.enviadas.map((e) => e.id)).toEqual(expect.arrayContaining(enviadas.map((m) => m.id)));
+    for (const mensagem of enviadas) {
+      expect(mensagem.provedorId).toMatch(/^fake-/);
+      expect(mensagem.disponivelEm).toBeNull();
+    }
+  });
+
+  it('tenta de novo falhas temporárias e marca FALHOU as definitivas', async () => {
+    await enfileirar(empresas[0], 1);
+    await enfileirar(empresas[1], 1);
+    const falhasPorMensagem = new Map<string, number>();
+    provedor.falhar = (mensagem) => {
+      const falhas = falhasPorMensagem.get(mensagem.id) ?? 0;
+      falhasPorMensagem.set(mensagem.id, falhas + 1);
+      if (falhas < 1) return new ErroEnvioWhatsapp('503 do provedor', true);
+      return undefined;
+    };
+    dispatcher.onModuleInit();
+
+    await aguardarAte(async () => (await prisma.mensagemWhatsApp.count({
+      where: { empresaId: { in: empresas }, status: 'ENVIADO' },
+    })) === 2);
+    const mensagens = await prisma.mensagemWhatsApp.findMany({ where: { empresaId: { in: empresas } } });
+    for (const mensagem of mensagens) {
+      expect(mensagem.tentativas).toBe(2);
+      expect(mensagem.erro).toBeNull();
+    }
+
+    provedor.falhar = () => new ErroEnvioWhatsapp('Número inválido', false);
+    await enfileirar(empresas[0], 1);
+    dispatcher.acordar();
+
+    await aguardarAte(async () => (await contar(empresas[0], 'FALHOU')) === 1);
+    const falhou = await prisma.mensagemWhatsApp.findFirst({ where: { empresaId: empresas[0], status: 'FALHOU' } });
+    expect(falhou.tentativas).toBe(1);
+    expect(falhou.erro).toBe('Número inválido');
+    expect(falhou.disponivelEm).toBeNull();
+  });
+});
@@ -46,6 +46,7 @@ export const CartDrawer: React.FC<{
         role="dialog"
         aria-modal="true"
         aria-labelledby="cart-drawer-title"
+        data-testid="cart-drawer"
         className={`fixed inset-y-0 right-0 z-50 w-full max-w-md transform bg-white shadow-2xl transition-transform duration-300 flex flex-col ${
           open ? "translate-x-0" : "translate-x-full"
         }`}
@@ -68,7 +69,7 @@ export const CartDrawer: React.FC<{
           ) : (
             <>
               {items.map((it) => (
-                <div key={it.id} className="mb-3 flex items-center justify-between border-b border-[#E5E7EB] pb-3">
+                <div key={it.id} data-testid="cart-item" className="mb-3 flex items-center justify-between border-b border-[#E5E7EB] pb-3">
                   <div>
                     <div className="font-medium text-[#1F2937]">{it.title}</div>
                     <div className="text-sm text-[#4B5563]">R$ {it.price.toFixed(2)}</div>
@@ -106,12 +107,13 @@ export const CartDrawer: React.FC<{
           <div className="p-4 pb-[calc(env(safe-area-inset-bottom)+16px)]">
             <div className="mb-3 flex items-center justify-between text-sm">
               <span className="text-[#4B5563]">Subtotal</span>
-              <span className="font-semibold text-[#111827]">R$ {subtotal.toFixed(2)}</span>
+              <span data-testid="cart-subtotal" className="font-semibold text-[#111827]">R$ {subtotal.toFixed(2)}</span>
             </div>
             <Button
               variant="primary"
               onClick={onCheckout}
               disabled={items.length === 0}
+              data-testid="cart-checkout"
               className="w-full h-12"
             >
               Ir para checkout
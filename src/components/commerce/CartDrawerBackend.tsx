@@ -55,7 +55,13 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
   return (
     <>
       <div className="fixed inset-0 z-40 bg-black/30" onClick={onClose} />
-      <div className="fixed right-0 top-0 z-50 h-full w-full max-w-md bg-white shadow-xl flex flex-col">
+      <div
+        role="dialog"
+        aria-modal="true"
+        aria-label="Carrinho"
+        data-testid="cart-drawer"
+        className="fixed right-0 top-0 z-50 h-full w-full max-w-md bg-white shadow-xl flex flex-col"
+      >
         {/* Header */}
         <div className="flex items-center justify-between border-b border-[#E5E7EB] p-4">
           <div className="flex items-center gap-2">
@@ -66,6 +72,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
           </div>
           <button
             onClick={onClose}
+            aria-label="Fechar carrinho"
             className="rounded-md p-1 hover:bg-[#F3F4F6] transition-colors"
           >
             <X className="h-5 w-5 text-[#6B7280]" />
@@ -86,6 +93,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
                 {cart.itens.map((item) => (
                   <div
                     key={item.id}
+                    data-testid="cart-item"
                     className="flex gap-3 rounded-md border border-[#E5E7EB] p-3"
                   >
                     <img
@@ -104,6 +112,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
                         <button
                           onClick={() => handleUpdateQty(item.id, -1)}
                           disabled={loading || item.quantidade <= 1}
+                          aria-label={`Diminuir quantidade de ${item.produto.nome}`}
                           className="rounded-md border border-[#E5E7EB] p-1 hover:bg-[#F3F4F6] disabled:opacity-50"
                         >
                           <Minus className="h-4 w-4" />
@@ -114,6 +123,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
                         <button
                           onClick={() => handleUpdateQty(item.id, 1)}
                           disabled={loading}
+                          aria-label={`Aumentar quantidade de ${item.produto.nome}`}
                           className="rounded-md border border-[#E5E7EB] p-1 hover:bg-[#F3F4F6] disabled:opacity-50"
                         >
                           <Plus className="h-4 w-4" />
@@ -121,6 +131,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
                         <button
                           onClick={() => handleRemove(item.id)}
                           disabled={loading}
+                          aria-label={`Remover ${item.produto.nome}`}
                           className="ml-auto rounded-md p-1 text-red-600 hover:bg-red-50 disabled:opacity-50"
                         >
                           <Trash2 className="h-4 w-4" />
@@ -171,7 +182,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
           <div className="border-t border-[#E5E7EB] p-4 space-y-3">
             <div className="flex justify-between text-sm">
               <span className="text-[#6B7280]">Subtotal</span>
-              <span className="font-medium">R$ {cart.subtotal.toFixed(2)}</span>
+              <span data-testid="cart-subtotal" className="font-medium">R$ {cart.subtotal.toFixed(2)}</span>
             </div>
             {cart.desconto && cart.desconto > 0 && (
               <div className="flex justify-between text-sm">
@@ -190,6 +201,7 @@ export function CartDrawerBackend({ open, onClose, onCheckout }: Props) {
               variant="primary"
               className="w-full"
               disabled={loading}
+              data-testid="cart-checkout"
             >
               Finalizar Pedido
             </Button>
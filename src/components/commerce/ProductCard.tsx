@@ -25,7 +25,7 @@ export const ProductCard = ({ product, onAddToCart }: ProductCardProps) => {
   const showStrike = typeof product.strikePrice === 'number' && product.strikePrice! > 0 && product.strikePrice! < product.price;
 
   return (
-    <div className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow">
+    <div data-testid="product-card" className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow">
       <div className="relative aspect-w-1 aspect-h-1 w-full overflow-hidden bg-gray-200">
         {/* Badges de destaque */}
         {(product.promo_tag || product.bestseller_tag || product.new_tag) && (
@@ -32,7 +32,7 @@ export const UpsellStrip: React.FC<{
       <h3 className="mb-2 text-sm font-semibold text-[#1F2937]">{title}</h3>
       <div className="space-y-2">
         {toShow.map((p) => (
-          <div key={p.id} className="flex items-center gap-3">
+          <div key={p.id} data-testid="upsell-item" className="flex items-center gap-3">
             {p.image && (
               <img
                 src={p.image}
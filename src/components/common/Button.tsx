@@ -9,6 +9,7 @@ interface ButtonProps {
   loading?: boolean;
   type?: 'button' | 'submit' | 'reset';
   className?: string;
+  'data-testid'?: string;
 }
 
 export const Button = ({
@@ -20,6 +21,7 @@ export const Button = ({
   loading = false,
   type = 'button',
   className = '',
+  'data-testid': testId,
 }: ButtonProps) => {
   const baseClasses = 'inline-flex items-center justify-center font-medium rounded-lg transition-colors focus:outline-none focus:ring-2 focus:ring-offset-2 disabled:opacity-50 disabled:cursor-not-allowed';
   
@@ -45,6 +47,7 @@ export const Button = ({
       className={classes}
       aria-disabled={disabled || loading}
       aria-busy={loading}
+      data-testid={testId}
     >
       {loading ? (
         <div className="flex items-center gap-2" role="status" aria-label="Carregando">
@@ -150,6 +150,7 @@ export const StorefrontHeader = ({
           ) : (
             <button
               onClick={handleLogin}
+              data-testid="header-login"
               className="flex items-center gap-2 rounded-md px-4 py-2 text-sm font-medium transition-colors"
               style={{ color: primaryColor, borderColor: primaryColor, borderWidth: 1 }}
             >
@@ -12,7 +12,7 @@ export const SuperAdminSidebar: React.FC = () => {
   ];
 
   return (
-    <nav className="p-4">
+    <nav className="p-4" data-testid="admin-sidebar">
       <div className="mb-6 flex items-center gap-2 px-3">
         <div className="h-8 w-8 rounded bg-[#D22630]" />
         <span className="font-bold text-[#D22630]">DELIVEREI</span>
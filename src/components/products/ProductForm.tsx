@@ -202,6 +202,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
               </label>
               <Input
                 placeholder="Ex: Pizza Margherita"
+                data-testid="product-name"
                 value={formData.nome}
                 onChange={(e) => handleChange('nome', e.target.value)}
                 disabled={isLoading}
@@ -220,6 +221,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
               <textarea
                 className="min-h-[120px] w-full rounded-md border border-[#E5E7EB] p-3 text-[#1F2937] placeholder-[#9CA3AF] focus:border-[#D22630] focus:ring-2 focus:ring-[#D22630]/20 outline-none disabled:opacity-50 disabled:cursor-not-allowed"
                 placeholder="Descreva o produto em detalhes..."
+                data-testid="product-description"
                 value={formData.descricao}
                 onChange={(e) => handleChange('descricao', e.target.value)}
                 disabled={isLoading}
@@ -236,6 +238,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
                   type="text"
                   inputMode="decimal"
                   placeholder="29,90"
+                  data-testid="product-price"
                   value={precoStr}
                   onChange={(e) => {
                     const raw = e.target.value;
@@ -260,6 +263,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
                   type="text"
                   inputMode="decimal"
                   placeholder="39,90"
+                  data-testid="product-strike-price"
                   value={precoRiscadoStr}
                   onChange={(e) => {
                     const raw = e.target.value;
@@ -283,6 +287,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
                 {!addingCategory ? (
                   <>
                     <select
+                      data-testid="product-category"
                       value={formData.categoria || ''}
                       onChange={(e) => handleChange('categoria', e.target.value)}
                       disabled={isLoading}
@@ -333,6 +338,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
                 type="number"
                 min="0"
                 placeholder="100"
+                data-testid="product-stock"
                 value={formData.estoque}
                 onChange={(e) =>
                   handleChange('estoque', parseInt(e.target.value || '0'))
@@ -371,6 +377,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
               <label className="inline-flex items-center gap-2">
                 <input
                   type="checkbox"
+                  data-testid="product-active"
                   checked={!!formData.ativo}
                   onChange={(e) => handleChange('ativo', e.target.checked)}
                   disabled={isLoading}
@@ -417,7 +424,7 @@ export const ProductForm: React.FC<ProductFormProps> = ({
 
             <div className="flex items-center gap-2">
               <Button type="button" variant="outline" onClick={onCancel}>Cancelar</Button>
-              <Button type="submit" disabled={isLoading}>
+              <Button type="submit" data-testid="product-submit" disabled={isLoading}>
                 {isLoading ? 'Salvando...' : submitLabel}
               </Button>
             </div>
@@ -31,7 +31,7 @@ export const AdminLayout: React.FC = () => {
           <p className="text-sm text-gray-500 mt-1">{user?.nome}</p>
         </div>
 
-        <nav className="flex-1 p-4">
+        <nav className="flex-1 p-4" data-testid="admin-sidebar">
           <ul className="space-y-2">
             {menuItems.map(item => {
               const Icon = item.icon;
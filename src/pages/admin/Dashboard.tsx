@@ -1,6 +1,6 @@
 
 import React, { useEffect } from 'react';
-import { dashboardApi, pedidosApi, DashboardEstatisticas, VendasPeriodo, ProdutoPopular, Pedido } from '../../services/backendApi';
+import { dashboardApi, pedidosApi, DashboardEstatisticas, VendasPeriodo, ProdutoPopular, PedidoResumo } from '../../services/backendApi';
 import { TrendingUp, ShoppingCart, DollarSign, Package } from 'lucide-react';
 import { LineChart, Line, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { format } from 'date-fns';
@@ -21,7 +21,7 @@ interface DashboardData {
   estatisticas: DashboardEstatisticas;
   vendas: VendasPeriodo[];
   produtosPopulares: ProdutoPopular[];
-  pedidosRecentes: Pedido[];
+  pedidosRecentes: PedidoResumo[];
 }
 
 export const Dashboard: React.FC = () => {
@@ -39,7 +39,7 @@ export const Dashboard: React.FC = () => {
         estatisticas: estatData,
         vendas: vendasData,
         produtosPopulares: produtosData,
-        pedidosRecentes: pedidosData.pedidos,
+        pedidosRecentes: pedidosData.data,
       };
     });
   }, [execute]);
@@ -203,7 +203,7 @@ export const Dashboard: React.FC = () => {
                 <div key={pedido.id} className="flex items-center justify-between">
                   <div className="flex-1 min-w-0">
                     <p className="text-sm font-medium text-gray-900">#{pedido.numero}</p>
-                    <p className="text-xs text-gray-500">{pedido.usuario?.nome}</p>
+                    <p className="text-xs text-gray-500">{pedido.cliente?.nome}</p>
                   </div>
                   <div className="flex items-center gap-3">
                     <span
@@ -1,42 +1,63 @@
 
 import React, { useEffect, useState } from 'react';
-import { pedidosApi, Pedido, PedidosFiltros } from '../../services/backendApi';
+import { pedidosApi, Pedido, PedidoResumo, PedidosFiltros, PedidosPage } from '../../services/backendApi';
 import { Search, Filter, Eye, ChevronLeft, ChevronRight } from 'lucide-react';
 import { format } from 'date-fns';
 import { ptBR } from 'date-fns/locale';
 import { getStatusColor, STATUS_LABELS } from '../../utils/statusColors';
 import { Loading } from '../../components/common';
-import { useApi, usePagination } from '../../hooks';
+import { useApi } from '../../hooks';
 
-interface PedidosResponse {
-  pedidos: Pedido[];
-  total: number;
-}
+const LIMITE = 10;
 
 export const Pedidos: React.FC = () => {
-  const { data, loading, execute } = useApi<PedidosResponse>();
-  const pagination = usePagination(1, 10);
-  const [selectedPedido, setSelectedPedido] = useState<Pedido | null>(null);
+  const { data, loading, execute } = useApi<PedidosPage>();
+  // Cursor de cada página visitada (a primeira não tem); voltar é desempilhar
+  const [cursores, setCursores] = useState<(string | undefined)[]>([undefined]);
+  const [selectedPedido, setSelectedPedido] = useState<PedidoResumo | null>(null);
+  // Detalhe carregado ao abrir o pedido: a listagem não traz itens
+  const [detalhe, setDetalhe] = useState<Pedido | null>(null);
   const [showStatusModal, setShowStatusModal] = useState(false);
-  const [filtros, setFiltros] = useState<Omit<PedidosFiltros, 'page' | 'limit'>>({});
+  const [filtros, setFiltros] = useState<Omit<PedidosFiltros, 'page' | 'limit' | 'cursor'>>({});
+  // A API não filtra por nome: a busca vale para a página carregada
+  const [clienteNome, setClienteNome] = useState('');
+
+  const pagina = cursores.length;
 
   const fetchPedidos = async () => {
-    const result = await execute(() =>
+    await execute(() =>
       pedidosApi.listar({
         ...filtros,
-        page: pagination.page,
-        limit: pagination.limit,
+        limit: LIMITE,
+        cursor: cursores[cursores.length - 1],
       })
     );
-    if (result) {
-      pagination.setTotal(result.total);
-    }
   };
 
   useEffect(() => {
     fetchPedidos();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [filtros, pagination.page, pagination.limit]);
+  }, [filtros, cursores]);
+
+  const alterarFiltros = (novos: Omit<PedidosFiltros, 'page' | 'limit' | 'cursor'>) => {
+    setFiltros(novos);
+    setCursores([undefined]);
+  };
+
+  const abrirDetalhes = async (pedido: PedidoResumo) => {
+    setSelectedPedido(pedido);
+    try {
+      setDetalhe(await pedidosApi.buscar(pedido.id));
+    } catch (error) {
+      console.error('Erro ao carregar pedido:', error);
+      setSelectedPedido(null);
+    }
+  };
+
+  const fecharDetalhes = () => {
+    setSelectedPedido(null);
+    setDetalhe(null);
+  };
 
   const handleStatusChange = async (pedidoId: string, novoStatus: string) => {
     try {
@@ -49,7 +70,11 @@ export const Pedidos: React.FC = () => {
     }
   };
 
-  const pedidos = data?.pedidos || [];
+  const termo = clienteNome.trim().toLowerCase();
+  const pedidos = (data?.data || []).filter(
+    (pedido) => !termo || pedido.cliente?.nome?.toLowerCase().includes(termo)
+  );
+  const nextCursor = data?.pagination.nextCursor ?? null;
 
   const statusOptions = [
     'PENDENTE',
@@ -77,8 +102,7 @@ export const Pedidos: React.FC = () => {
             <select
               value={filtros.status || ''}
               onChange={(e) => {
-                setFiltros({ ...filtros, status: e.target.value || undefined });
-                pagination.goToPage(1);
+                alterarFiltros({ ...filtros, status: e.target.value || undefined });
               }}
               className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
             >
@@ -99,8 +123,7 @@ export const Pedidos: React.FC = () => {
               type="date"
               value={filtros.dataInicio || ''}
               onChange={(e) => {
-                setFiltros({ ...filtros, dataInicio: e.target.value || undefined });
-                pagination.goToPage(1);
+                alterarFiltros({ ...filtros, dataInicio: e.target.value || undefined });
               }}
               className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
             />
@@ -114,8 +137,7 @@ export const Pedidos: React.FC = () => {
               type="date"
               value={filtros.dataFim || ''}
               onChange={(e) => {
-                setFiltros({ ...filtros, dataFim: e.target.value || undefined });
-                pagination.goToPage(1);
+                alterarFiltros({ ...filtros, dataFim: e.target.value || undefined });
               }}
               className="w-full px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
             />
@@ -130,11 +152,8 @@ export const Pedidos: React.FC = () => {
               <input
                 type="text"
                 placeholder="Nome do cliente..."
-                value={filtros.clienteNome || ''}
-                onChange={(e) => {
-                  setFiltros({ ...filtros, clienteNome: e.target.value || undefined });
-                  pagination.goToPage(1);
-                }}
+                value={clienteNome}
+                onChange={(e) => setClienteNome(e.target.value)}
                 className="w-full pl-10 pr-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
               />
             </div>
@@ -189,8 +208,8 @@ export const Pedidos: React.FC = () => {
                           </span>
                         </td>
                         <td className="px-6 py-4 whitespace-nowrap">
-                          <div className="text-sm text-gray-900">{pedido.usuario?.nome}</div>
-                          <div className="text-xs text-gray-500">{pedido.usuario?.email}</div>
+                          <div className="text-sm text-gray-900">{pedido.cliente?.nome}</div>
+                          <div className="text-xs text-gray-500">{pedido.cliente?.email}</div>
                         </td>
                         <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
                           {format(new Date(pedido.createdAt), "dd/MM/yyyy 'às' HH:mm", { locale: ptBR })}
@@ -206,7 +225,7 @@ export const Pedidos: React.FC = () => {
                         <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
                           <div className="flex items-center gap-2">
                             <button
-                              onClick={() => setSelectedPedido(pedido)}
+                              onClick={() => abrirDetalhes(pedido)}
                               className="text-blue-600 hover:text-blue-900"
                               title="Ver detalhes"
                             >
@@ -234,23 +253,22 @@ export const Pedidos: React.FC = () => {
             {/* Paginação */}
             <div className="bg-gray-50 px-6 py-4 flex items-center justify-between border-t border-gray-200">
               <div className="text-sm text-gray-700">
-                Mostrando {(pagination.page - 1) * pagination.limit + 1} até{' '}
-                {Math.min(pagination.page * pagination.limit, pagination.total)} de {pagination.total} pedidos
+                {pedidos.length} pedidos nesta página
               </div>
               <div className="flex items-center gap-2">
                 <button
-                  onClick={pagination.previousPage}
-                  disabled={!pagination.hasPreviousPage}
+                  onClick={() => setCursores(c => c.slice(0, -1))}
+                  disabled={pagina === 1}
                   className="px-3 py-2 border border-gray-300 rounded-lg text-sm font-medium text-gray-700 hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
                 >
                   <ChevronLeft className="w-5 h-5" />
                 </button>
                 <span className="text-sm text-gray-700">
-                  Página {pagination.page} de {pagination.totalPages}
+                  Página {pagina}
                 </span>
                 <button
-                  onClick={pagination.nextPage}
-                  disabled={!pagination.hasNextPage}
+                  onClick={() => nextCursor && setCursores(c => [...c, nextCursor])}
+                  disabled={!nextCursor}
                   className="px-3 py-2 border border-gray-300 rounded-lg text-sm font-medium text-gray-700 hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
                 >
                   <ChevronRight className="w-5 h-5" />
@@ -262,20 +280,20 @@ export const Pedidos: React.FC = () => {
       </div>
 
       {/* Modal de Detalhes */}
-      {selectedPedido && !showStatusModal && (
+      {detalhe && !showStatusModal && (
         <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50 p-4">
           <div className="bg-white rounded-lg max-w-2xl w-full max-h-[90vh] overflow-y-auto">
             <div className="p-6 border-b border-gray-200">
               <h2 className="text-2xl font-bold text-gray-900">
-                Pedido #{selectedPedido.numero}
+                Pedido #{detalhe.numero}
               </h2>
             </div>
             <div className="p-6 space-y-6">
               <div>
                 <h3 className="text-lg font-semibold text-gray-900 mb-3">Informações do Cliente</h3>
                 <div className="bg-gray-50 rounded-lg p-4 space-y-2">
-                  <p className="text-sm"><span className="font-medium">Nome:</span> {selectedPedido.usuario?.nome}</p>
-                  <p className="text-sm"><span className="font-medium">Email:</span> {selectedPedido.usuario?.email}</p>
+                  <p className="text-sm"><span className="font-medium">Nome:</span> {detalhe.cliente?.nome}</p>
+                  <p className="text-sm"><span className="font-medium">Email:</span> {detalhe.cliente?.email}</p>
                 </div>
               </div>
 
@@ -283,20 +301,20 @@ export const Pedidos: React.FC = () => {
                 <h3 className="text-lg font-semibold text-gray-900 mb-3">Endereço de Entrega</h3>
                 <div className="bg-gray-50 rounded-lg p-4">
                   <p className="text-sm">
-                    {selectedPedido.enderecoEntrega.rua}, {selectedPedido.enderecoEntrega.numero}
-                    {selectedPedido.enderecoEntrega.complemento && ` - ${selectedPedido.enderecoEntrega.complemento}`}
+                    {detalhe.enderecoEntrega.rua}, {detalhe.enderecoEntrega.numero}
+                    {detalhe.enderecoEntrega.complemento && ` - ${detalhe.enderecoEntrega.complemento}`}
                   </p>
                   <p className="text-sm">
-                    {selectedPedido.enderecoEntrega.bairro}, {selectedPedido.enderecoEntrega.cidade} - {selectedPedido.enderecoEntrega.estado}
+                    {detalhe.enderecoEntrega.bairro}, {detalhe.enderecoEntrega.cidade} - {detalhe.enderecoEntrega.estado}
                   </p>
-                  <p className="text-sm">CEP: {selectedPedido.enderecoEntrega.cep}</p>
+                  <p className="text-sm">CEP: {detalhe.enderecoEntrega.cep}</p>
                 </div>
               </div>
 
               <div>
                 <h3 className="text-lg font-semibold text-gray-900 mb-3">Itens do Pedido</h3>
                 <div className="space-y-3">
-                  {selectedPedido.itens.map(item => (
+                  {detalhe.itens.map(item => (
                     <div key={item.id} className="flex items-center gap-4 bg-gray-50 rounded-lg p-4">
                       {item.produto.imagemUrl && (
                         <img
@@ -323,24 +341,24 @@ export const Pedidos: React.FC = () => {
                 <div className="space-y-2">
                   <div className="flex justify-between text-sm">
                     <span className="text-gray-600">Subtotal:</span>
-                    <span className="text-gray-900">R$ {selectedPedido.subtotal.toFixed(2)}</span>
+                    <span className="text-gray-900">R$ {detalhe.subtotal.toFixed(2)}</span>
                   </div>
-                  {selectedPedido.desconto > 0 && (
+                  {detalhe.desconto > 0 && (
                     <div className="flex justify-between text-sm">
                       <span className="text-gray-600">Desconto:</span>
-                      <span className="text-green-600">- R$ {selectedPedido.desconto.toFixed(2)}</span>
+                      <span className="text-green-600">- R$ {detalhe.desconto.toFixed(2)}</span>
                     </div>
                   )}
                   <div className="flex justify-between text-lg font-bold">
                     <span className="text-gray-900">Total:</span>
-                    <span className="text-gray-900">R$ {selectedPedido.total.toFixed(2)}</span>
+                    <span className="text-gray-900">R$ {detalhe.total.toFixed(2)}</span>
                   </div>
                 </div>
               </div>
 
               <div className="flex justify-end gap-3">
                 <button
-                  onClick={() => setSelectedPedido(null)}
+                  onClick={fecharDetalhes}
                   className="px-4 py-2 border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50"
                 >
                   Fechar
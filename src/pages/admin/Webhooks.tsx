@@ -1,46 +1,42 @@
 
 import React, { useEffect, useState } from 'react';
 import { Loading } from '../../components/common/Loading';
-import { webhooksApi, WebhookLog } from '../../services/backendApi';
-import { Loading } from '../../components/common/Loading';
-import { Webhook, CheckCircle, XCircle, Filter, Eye } from 'lucide-react';
-import { Loading } from '../../components/common/Loading';
+import { webhooksApi, WebhookLog, WebhookLogDetalhe } from '../../services/backendApi';
+import { Webhook, CheckCircle, XCircle, Filter, Eye, Clock } from 'lucide-react';
 import { useToast } from '../../ui/feedback/ToastContext';
-import { Loading } from '../../components/common/Loading';
 import { format } from 'date-fns';
-import { Loading } from '../../components/common/Loading';
 import { ptBR } from 'date-fns/locale';
-import { Loading } from '../../components/common/Loading';
 
 export const Webhooks: React.FC = () => {
   const [logs, setLogs] = useState<WebhookLog[]>([]);
   const [loading, setLoading] = useState(true);
   const [filtroOrigem, setFiltroOrigem] = useState<string>('');
   const [filtroProcessado, setFiltroProcessado] = useState<string>('');
-  const [logSelecionado, setLogSelecionado] = useState<WebhookLog | null>(null);
-  const [page, setPage] = useState(1);
-  const [total, setTotal] = useState(0);
+  const [logSelecionado, setLogSelecionado] = useState<WebhookLogDetalhe | null>(null);
+  // Cursor de cada página visitada (a primeira não tem); voltar é desempilhar
+  const [cursores, setCursores] = useState<(string | undefined)[]>([undefined]);
+  const [proximoCursor, setProximoCursor] = useState<string | null>(null);
   const { push } = useToast();
 
   const limit = 20;
+  const page = cursores.length;
 
   useEffect(() => {
     fetchLogs();
-  }, [page, filtroOrigem, filtroProcessado]);
+  }, [cursores, filtroOrigem, filtroProcessado]);
 
   const fetchLogs = async () => {
     try {
       setLoading(true);
-      const params: any = {
-        limit,
-        offset: (page - 1) * limit,
-      };
+      const params: any = { limit };
+      const cursor = cursores[cursores.length - 1];
+      if (cursor) params.cursor = cursor;
       if (filtroOrigem) params.origem = filtroOrigem;
       if (filtroProcessado !== '') params.processado = filtroProcessado === 'true';
 
-      const { logs: data, total: totalCount } = await webhooksApi.getLogs(params);
+      const { data, pagination } = await webhooksApi.getLogs(params);
       setLogs(data);
-      setTotal(totalCount);
+      setProximoCursor(pagination.nextCursor);
     } catch (error) {
       console.error('Erro ao carregar logs:', error);
       push({ type: 'error', message: 'Erro ao carregar logs de webhooks' });
@@ -49,7 +45,16 @@ export const Webhooks: React.FC = () => {
     }
   };
 
-  const totalPages = Math.ceil(total / limit);
+  const abrirDetalhes = async (log: WebhookLog) => {
+    try {
+      setLogSelecionado(await webhooksApi.getLog(log.id));
+    } catch (error) {
+      console.error('Erro ao carregar log:', error);
+      push({ type: 'error', message: 'Erro ao carregar detalhes do webhook' });
+    }
+  };
+
+  const reiniciarPaginacao = () => setCursores([undefined]);
 
   if (loading && page === 1) {
     return (
@@ -84,7 +89,7 @@ export const Webhooks: React.FC = () => {
               <label className="block text-sm font-medium text-gray-700 mb-2">Origem</label>
               <select
                 value={filtroOrigem}
-                onChange={(e) => { setFiltroOrigem(e.target.value); setPage(1); }}
+                onChange={(e) => { setFiltroOrigem(e.target.value); reiniciarPaginacao(); }}
                 className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
               >
                 <option value="">Todas</option>
@@ -96,7 +101,7 @@ export const Webhooks: React.FC = () => {
               <label className="block text-sm font-medium text-gray-700 mb-2">Status</label>
               <select
                 value={filtroProcessado}
-                onChange={(e) => { setFiltroProcessado(e.target.value); setPage(1); }}
+                onChange={(e) => { setFiltroProcessado(e.target.value); reiniciarPaginacao(); }}
                 className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
               >
                 <option value="">Todos</option>
@@ -130,7 +135,7 @@ export const Webhooks: React.FC = () => {
                     {logs.map((log) => (
                       <tr key={log.id} className="border-b hover:bg-gray-50">
                         <td className="py-3 px-4 text-sm">
-                          {format(new Date(log.criadoEm), 'dd/MM/yyyy HH:mm:ss', { locale: ptBR })}
+                          {format(new Date(log.createdAt), 'dd/MM/yyyy HH:mm:ss', { locale: ptBR })}
                         </td>
                         <td className="py-3 px-4">
                           <span
@@ -151,17 +156,22 @@ export const Webhooks: React.FC = () => {
                                 <CheckCircle className="w-4 h-4 text-green-600" />
                                 <span className="text-sm text-green-600">Processado</span>
                               </>
-                            ) : (
+                            ) : log.erro ? (
                               <>
                                 <XCircle className="w-4 h-4 text-red-600" />
-                                <span className="text-sm text-red-600">Erro</span>
+                                <span className="text-sm text-red-600">Erro ({log.tentativas}x)</span>
+                              </>
+                            ) : (
+                              <>
+                                <Clock className="w-4 h-4 text-yellow-600" />
+                                <span className="text-sm text-yellow-600">Na fila</span>
                               </>
                             )}
                           </div>
                         </td>
                         <td className="py-3 px-4">
                           <button
-                            onClick={() => setLogSelecionado(log)}
+                            onClick={() => abrirDetalhes(log)}
                             className="text-blue-600 hover:text-blue-800 text-sm font-medium flex items-center gap-1"
                           >
                             <Eye className="w-4 h-4" />
@@ -175,22 +185,20 @@ export const Webhooks: React.FC = () => {
               </div>
 
               {/* Paginação */}
-              {totalPages > 1 && (
+              {(page > 1 || proximoCursor) && (
                 <div className="flex items-center justify-between px-6 py-4 border-t">
-                  <p className="text-sm text-gray-600">
-                    Mostrando {(page - 1) * limit + 1} a {Math.min(page * limit, total)} de {total} logs
-                  </p>
+                  <p className="text-sm text-gray-600">Página {page}</p>
                   <div className="flex gap-2">
                     <button
-                      onClick={() => setPage(p => Math.max(1, p - 1))}
+                      onClick={() => setCursores(c => c.slice(0, -1))}
                       disabled={page === 1}
                       className="px-4 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
                     >
                       Anterior
                     </button>
                     <button
-                      onClick={() => setPage(p => Math.min(totalPages, p + 1))}
-                      disabled={page === totalPages}
+                      onClick={() => proximoCursor && setCursores(c => [...c, proximoCursor])}
+                      disabled={!proximoCursor}
                       className="px-4 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
                     >
                       Próxima
@@ -233,7 +241,7 @@ export const Webhooks: React.FC = () => {
                 <div>
                   <h3 className="text-sm font-medium text-gray-600 mb-1">Data/Hora</h3>
                   <p className="text-lg font-semibold">
-                    {format(new Date(logSelecionado.criadoEm), "dd/MM/yyyy 'às' HH:mm:ss", { locale: ptBR })}
+                    {format(new Date(logSelecionado.createdAt), "dd/MM/yyyy 'às' HH:mm:ss", { locale: ptBR })}
                   </p>
                 </div>
                 <div>
@@ -283,3 +291,5 @@ export const Webhooks: React.FC = () => {
     </div>
   );
 };
+
+export default Webhooks;
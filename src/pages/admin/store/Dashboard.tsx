@@ -127,20 +127,20 @@ export default function StoreDashboard() {
       try {
         // Recent orders (limit and then filter by date range)
         const res = await pedidosApi.listar({ page: 1, limit: 10 });
-        const raw: any[] = Array.isArray(res?.pedidos) ? res.pedidos : [];
+        const raw = Array.isArray(res?.data) ? res.data : [];
         const filtered = raw.filter((p) => {
-          const d = new Date(p.criadoEm);
+          const d = new Date(p.createdAt);
           return d >= dateRange.startDate && d <= dateRange.endDate;
         });
         const recent = filtered
-          .sort((a, b) => new Date(b.criadoEm).getTime() - new Date(a.criadoEm).getTime())
+          .sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime())
           .slice(0, 3)
           .map((p) => ({
             id: p.id,
             cliente: p.cliente?.nome || '',
             total: Number(p.total ?? 0),
             status: String(p.status || '').toLowerCase().replace(/_/g, ' '),
-            criadoEm: new Date(p.criadoEm).toLocaleString('pt-BR'),
+            criadoEm: new Date(p.createdAt).toLocaleString('pt-BR'),
           }));
         setRecentOrders(recent);
       } catch (error) {
@@ -199,7 +199,7 @@ export default function StoreDashboard() {
       {/* Stats Cards */}
       <div className="grid grid-cols-1 gap-4 md:grid-cols-2 lg:grid-cols-4">
         {stats.map((stat, idx) => (
-          <div key={idx} className="rounded-lg border border-[#E5E7EB] bg-white p-4">
+          <div key={idx} data-testid="dashboard-stat" className="rounded-lg border border-[#E5E7EB] bg-white p-4">
             <div className="flex items-center gap-3">
               <stat.icon className={`h-5 w-5 ${stat.color}`} />
               <div>
@@ -212,7 +212,7 @@ export default function StoreDashboard() {
       </div>
 
       {/* Sales Chart */}
-      <div className="mt-6 rounded-lg border border-[#E5E7EB] bg-white">
+      <div data-testid="dashboard-sales" className="mt-6 rounded-lg border border-[#E5E7EB] bg-white">
         <div className="flex items-center justify-between border-b border-[#E5E7EB] p-4">
           <h2 className="text-lg font-semibold text-[#111827]">Vendas no período</h2>
           {salesLoading && <Loading message="Carregando gráfico..." />}
@@ -227,7 +227,7 @@ export default function StoreDashboard() {
       </div>
 
       {/* Recent Orders */}
-      <div className="mt-6 rounded-lg border border-[#E5E7EB] bg-white">
+      <div data-testid="dashboard-recent-orders" className="mt-6 rounded-lg border border-[#E5E7EB] bg-white">
         <div className="flex items-center justify-between border-b border-[#E5E7EB] p-4">
           <h2 className="text-lg font-semibold text-[#111827]">Pedidos recentes</h2>
           {ordersLoading && <Loading message="Carregando pedidos..." />}
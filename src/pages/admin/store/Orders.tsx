@@ -3,10 +3,10 @@ import React, { useMemo, useState, useEffect } from "react";
 import { DashboardShell } from "../../../components/layout/DashboardShell";
 import { StoreSidebar } from "../../../components/layout/StoreSidebar";
 import { Button } from "../../../components/common/Button";
-import { X } from "lucide-react";
+import { ChevronLeft, ChevronRight, X } from "lucide-react";
 import { useAuth } from "../../../auth/AuthContext";
 import { formatCurrency } from "../../../utils/formatters";
-import { backendApi, pedidosApi } from "../../../services/backendApi";
+import { backendApi, pedidosApi, PedidosFiltros } from "../../../services/backendApi";
 
 type OrderItem = {
   productId: string;
@@ -25,6 +25,8 @@ type Order = {
   itens: OrderItem[];
 };
 
+const LIMITE = 20;
+
 const statusOptions: Order["status"][] = [
   "recebido",
   "aprovado",
@@ -64,6 +66,9 @@ export default function OrdersPage() {
   const { user } = useAuth();
   const [filterStatus, setFilterStatus] = useState<"" | Order["status"]>("");
   const [allOrders, setAllOrders] = useState<Order[]>([]);
+  // Cursor de cada página visitada (a primeira não tem); voltar é desempilhar
+  const [cursores, setCursores] = useState<(string | undefined)[]>([undefined]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [drawer, setDrawer] = useState<{ open: boolean; order?: Order }>({ open: false });
   const [loading, setLoading] = useState(false);
 
@@ -71,42 +76,59 @@ export default function OrdersPage() {
     const load = async () => {
       setLoading(true);
       try {
-        const params: any = {};
+        const params: PedidosFiltros = { limit: LIMITE, cursor: cursores[cursores.length - 1] };
         if (filterStatus) params.status = uiToBackendStatus(filterStatus);
         const res = await pedidosApi.listar(params);
-        const orders: Order[] = (res?.pedidos || []).map((p: any) => ({
+        // A listagem não traz os itens; são carregados ao abrir o pedido
+        const orders: Order[] = (res?.data || []).map((p) => ({
           id: p.id,
           cliente: p.cliente?.nome || "",
           total: Number(p.total ?? 0),
           pagamento: (p.formaPagamento || "").toLowerCase(),
           status: backendToUiStatus(p.status),
-          criadoEm: new Date(p.criadoEm).toLocaleString("pt-BR"),
-          itens: Array.isArray(p.itens)
-            ? p.itens.map((it: any) => ({
-                productId: it.produtoId,
-                nome: it.produto?.nome || "",
-                qtd: Number(it.quantidade ?? 0),
-                preco: Number(it.precoUnitario ?? 0),
-              }))
-            : [],
+          criadoEm: new Date(p.createdAt).toLocaleString("pt-BR"),
+          itens: [],
         }));
         setAllOrders(orders);
+        setNextCursor(res?.pagination?.nextCursor ?? null);
       } catch (err) {
         setAllOrders([]);
+        setNextCursor(null);
       } finally {
         setLoading(false);
       }
     };
 
     load();
-  }, [filterStatus]);
+  }, [filterStatus, cursores]);
+
+  const pagina = cursores.length;
+
+  const changeFilterStatus = (status: "" | Order["status"]) => {
+    setFilterStatus(status);
+    setCursores([undefined]);
+  };
 
   const filtered = useMemo(
     () => (filterStatus ? allOrders.filter((o) => o.status === filterStatus) : allOrders),
     [allOrders, filterStatus]
   );
 
-  const openDetails = (o: Order) => setDrawer({ open: true, order: o });
+  const openDetails = async (o: Order) => {
+    setDrawer({ open: true, order: o });
+    try {
+      const pedido: any = await pedidosApi.buscar(o.id);
+      const itens: OrderItem[] = (pedido?.itens || []).map((it: any) => ({
+        productId: it.produtoId,
+        nome: it.produto?.nome || "",
+        qtd: Number(it.quantidade ?? 0),
+        preco: Number(it.precoUnitario ?? 0),
+      }));
+      setDrawer((atual) => (atual.order?.id === o.id ? { open: atual.open, order: { ...o, itens } } : atual));
+    } catch (err) {
+      // mantém o drawer sem itens
+    }
+  };
   const closeDetails = () => setDrawer({ open: false });
 
   const advanceStatus = async (o: Order) => {
@@ -128,7 +150,7 @@ export default function OrdersPage() {
         <div className="flex gap-2">
           <select
             value={filterStatus}
-            onChange={(e) => setFilterStatus(e.target.value as any)}
+            onChange={(e) => changeFilterStatus(e.target.value as any)}
             className="h-10 rounded-md border border-[#E5E7EB] px-3 focus:border-[#D22630] focus:ring-2 focus:ring-[#D22630]/20 outline-none"
           >
             <option value="">Todos os status</option>
@@ -183,6 +205,30 @@ export default function OrdersPage() {
         </table>
       </div>
 
+      <div className="mt-3 flex items-center justify-between">
+        <span className="text-sm text-[#4B5563]">{loading ? "Carregando..." : `Página ${pagina}`}</span>
+        <div className="flex gap-2">
+          <Button
+            variant="outline"
+            size="sm"
+            className="gap-1"
+            onClick={() => setCursores((c) => c.slice(0, -1))}
+            disabled={loading || pagina === 1}
+          >
+            <ChevronLeft className="h-4 w-4" /> Anterior
+          </Button>
+          <Button
+            variant="outline"
+            size="sm"
+            className="gap-1"
+            onClick={() => nextCursor && setCursores((c) => [...c, nextCursor])}
+            disabled={loading || !nextCursor}
+          >
+            Próxima <ChevronRight className="h-4 w-4" />
+          </Button>
+        </div>
+      </div>
+
       {drawer.open && drawer.order && (
         <>
           <div className="fixed inset-0 z-40 bg-black/30" onClick={closeDetails} />
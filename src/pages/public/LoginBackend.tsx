@@ -101,6 +101,7 @@ export default function LoginBackend() {
               <label className="mb-1 block text-sm text-[#4B5563]">E-mail</label>
               <Input
                 type="email"
+                data-testid="login-email"
                 value={email}
                 onChange={(e) => setEmail(e.target.value)}
                 placeholder="seu@email.com.br"
@@ -111,13 +112,14 @@ export default function LoginBackend() {
               <label className="mb-1 block text-sm text-[#4B5563]">Senha</label>
               <Input
                 type="password"
+                data-testid="login-password"
                 value={password}
                 onChange={(e) => setPassword(e.target.value)}
                 placeholder="••••••••"
                 required
               />
             </div>
-            <Button type="submit" loading={loading} variant="primary" className="w-full">
+            <Button type="submit" data-testid="login-submit" loading={loading} variant="primary" className="w-full">
               Entrar
             </Button>
           </form>
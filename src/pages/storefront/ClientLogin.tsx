@@ -77,6 +77,7 @@ export default function ClientLogin() {
               <Input
                 id="email"
                 type="email"
+                data-testid="login-email"
                 placeholder="seu@email.com"
                 value={email}
                 onChange={(e) => setEmail(e.target.value)}
@@ -93,6 +94,7 @@ export default function ClientLogin() {
               <Input
                 id="password"
                 type="password"
+                data-testid="login-password"
                 placeholder="••••••••"
                 value={password}
                 onChange={(e) => setPassword(e.target.value)}
@@ -103,6 +105,7 @@ export default function ClientLogin() {
 
             <Button
               type="submit"
+              data-testid="login-submit"
               variant="primary"
               className="w-full"
               loading={loading}
@@ -139,7 +139,7 @@ export const adminFeatureRoutes: RouteObject[] = [
   {
     path: '/admin/webhooks',
     element: (
-      <RequireAuth role="empresa">
+      <RequireAuth role="superadmin">
         <Webhooks />
       </RequireAuth>
     ),
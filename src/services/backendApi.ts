@@ -196,10 +196,35 @@ export interface Pedido {
   atualizadoEm: string;
 }
 
+// Linha da listagem de pedidos: sem itens (vêm em pedidosApi.buscar), só a contagem
+export interface PedidoResumo {
+  id: string;
+  numero: string;
+  status: Pedido['status'];
+  subtotal: number;
+  desconto: number;
+  frete: number;
+  total: number;
+  formaPagamento: string | null;
+  empresaId: string;
+  createdAt: string;
+  updatedAt: string;
+  cliente: { id: string; nome: string; email: string };
+  _count: { itens: number };
+}
+
+export interface PedidosPage {
+  data: PedidoResumo[];
+  pagination: { itemsPerPage: number; hasNextPage: boolean; nextCursor: string | null };
+}
+
 export interface PedidosFiltros {
   status?: string;
+  dataInicio?: string;
+  dataFim?: string;
+  usuarioId?: string;
   limit?: number;
-  offset?: number;
+  cursor?: string;
   page?: number;
 }
 
@@ -342,13 +367,24 @@ export interface ConfigurarWhatsAppRequest {
 
 export interface WebhookLog {
   id: string;
-  empresaId: string;
   origem: 'STRIPE' | 'ASAAS';
   evento: string;
-  payload: any;
+  eventoId?: string | null;
   processado: boolean;
-  erro?: string;
-  criadoEm: string;
+  erro?: string | null;
+  tentativas: number;
+  processadoEm?: string | null;
+  createdAt: string;
+}
+
+// Detalhe do log: a listagem não traz o payload
+export interface WebhookLogDetalhe extends WebhookLog {
+  payload: any;
+}
+
+export interface WebhookLogsPage {
+  data: WebhookLog[];
+  pagination: { itemsPerPage: number; hasNextPage: boolean; nextCursor: string | null };
 }
 
 const authApi = {
@@ -384,6 +420,24 @@ const produtosApi = {
   },
 };
 
+const novaChaveIdempotencia = (): string =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+// Em rede instável a resposta pode se perder depois que o pedido/cobrança foi criado.
+// Reenviar com a mesma Idempotency-Key devolve o resultado original em vez de duplicar.
+const postIdempotente = async <T,>(url: string, data: unknown, chave: string, tentativas = 3) => {
+  for (let tentativa = 1; ; tentativa++) {
+    try {
+      return await apiClient.post<T>(url, data, { headers: { 'Idempotency-Key': chave } });
+    } catch (err: any) {
+      if (err?.response || tentativa >= tentativas) throw err;
+      await new Promise((resolve) => setTimeout(resolve, 500 * tentativa));
+    }
+  }
+};
+
 const carrinhoApi = {
   obter: async (): Promise<Carrinho> => {
     const res = await apiClient.get('/carrinho');
@@ -409,8 +463,8 @@ const carrinhoApi = {
     await apiClient.delete('/carrinho');
   },
   
-  checkout: async (data: CheckoutRequest): Promise<CheckoutResponse> => {
-    const res = await apiClient.post('/carrinho/checkout', data);
+  checkout: async (data: CheckoutRequest, idempotencyKey = novaChaveIdempotencia()): Promise<CheckoutResponse> => {
+    const res = await postIdempotente<CheckoutResponse>('/carrinho/checkout', data, idempotencyKey);
     return res.data;
   },
 };
@@ -438,7 +492,7 @@ const cuponsApi = {
 };
 
 const pedidosApi = {
-  listar: async (params?: { status?: string; page?: number; limit?: number }): Promise<{ pedidos: Pedido[]; total: number }> => {
+  listar: async (params?: PedidosFiltros): Promise<PedidosPage> => {
     const res = await apiClient.get('/pedidos', { params });
     return res.data;
   },
@@ -494,8 +548,8 @@ const assinaturasApi = {
 };
 
 const pagamentosApi = {
-  criar: async (data: CreatePagamentoRequest): Promise<Pagamento> => {
-    const res = await apiClient.post('/pagamentos', data);
+  criar: async (data: CreatePagamentoRequest, idempotencyKey = novaChaveIdempotencia()): Promise<Pagamento> => {
+    const res = await postIdempotente<Pagamento>('/pagamentos', data, idempotencyKey);
     return res.data;
   },
 
@@ -524,10 +578,15 @@ const whatsappApi = {
 };
 
 const webhooksApi = {
-  getLogs: async (params?: { origem?: string; processado?: boolean; limit?: number; offset?: number }): Promise<{ logs: WebhookLog[]; total: number }> => {
+  getLogs: async (params?: { origem?: string; processado?: boolean; limit?: number; cursor?: string }): Promise<WebhookLogsPage> => {
     const res = await apiClient.get('/webhooks/logs', { params });
     return res.data;
   },
+
+  getLog: async (id: string): Promise<WebhookLogDetalhe> => {
+    const res = await apiClient.get(`/webhooks/logs/${id}`);
+    return res.data;
+  },
 };
 
 const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
@@ -556,8 +615,14 @@ const storefrontApi = {
   getCategorias: storefrontSupabase.getCategorias,
 };
 
+export interface CategoriaAdmin {
+  nome: string;
+  produtosAtivos: number;
+  manual: boolean;
+}
+
 const categoriasApi = {
-  listar: async (): Promise<string[]> => {
+  listar: async (): Promise<CategoriaAdmin[]> => {
     const res = await apiClient.get('/v1/categorias');
     return res.data;
   },
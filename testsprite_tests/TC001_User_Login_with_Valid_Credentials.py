@@ -1,29 +1,14 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context (like an incognito window) from the shared browser pool
+        context = await browser_pool.get_pool().new_context()
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
@@ -49,27 +34,23 @@ async def run_test():
         # -> Click on the login button to navigate to the login page
         frame = context.pages[-1]
         # Click on the 'Entrar' button to go to the login page
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).open()
         
 
         # -> Input valid username/email and password for Pizza Express admin and submit the form
         frame = context.pages[-1]
         # Input valid email for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@pizza-express.com')
         
 
         frame = context.pages[-1]
         # Input valid password for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('pizza123')
         
 
         frame = context.pages[-1]
         # Click the Entrar button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # --> Assertions to verify final state
@@ -78,15 +59,10 @@ async def run_test():
             await expect(frame.locator('text=Login Successful - JWT and Tenant Context Received').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError('Test case failed: User login was not successful, JWT and tenant context were not received, or user was not redirected to the storefront as expected.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,29 +1,14 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context (like an incognito window) from the shared browser pool
+        context = await browser_pool.get_pool().new_context()
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -49,113 +34,93 @@ async def run_test():
         # -> Navigate to the login page by clicking the 'Entrar' button
         frame = context.pages[-1]
         # Click on the 'Entrar' button to navigate to the login page 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).open()
         # -> Input invalid username/email and password
         frame = context.pages[-1]
         # Input invalid email in the email field 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('invalid@example.com')
         frame = context.pages[-1]
         # Input invalid password in the password field 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('wrongpassword')
         frame = context.pages[-1]
         # Click the login button to attempt login with invalid credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         # -> Click on the login button to attempt login with invalid credentials and verify error message
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # -> Click on the login button to attempt login with invalid credentials and verify error message
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input invalid username/email and password again, then click login button to verify error message for invalid credentials
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('invalid@example.com')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('wrongpassword')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Click on the login button to attempt login with invalid credentials and verify error message
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input invalid username/email and password, then click login button to verify error message for invalid credentials
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('invalid@example.com')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('wrongpassword')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Click on the login button to attempt login with invalid credentials and verify error message
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input invalid username/email and password, then click login button to verify error message for invalid credentials
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('invalid@example.com')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('wrongpassword')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Click on the login button to attempt login with invalid credentials and verify error message
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input invalid username/email and password, then click login button to verify error message for invalid credentials
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('invalid@example.com')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('wrongpassword')
         
 
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # --> Assertions to verify final state
@@ -164,15 +129,10 @@ async def run_test():
             await expect(frame.locator('text=Login Successful! Welcome')).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test failed: Login should fail with invalid credentials, but a success message was detected. This indicates the test plan for verifying login failure did not pass.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
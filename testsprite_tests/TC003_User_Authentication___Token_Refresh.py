@@ -1,29 +1,14 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import api_client, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context (like an incognito window) from the shared browser pool
+        context = await browser_pool.get_pool().new_context()
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
@@ -50,148 +35,121 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Testar com Backend Real' button to login with real backend
         elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # -> Fill in login credentials for Pizza Express admin and click Entrar to authenticate.
         frame = context.pages[-1]
         # Input email for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@pizza-express.com')
         
 
         frame = context.pages[-1]
         # Input password for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('pizza123')
         
 
         frame = context.pages[-1]
         # Click Entrar button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Try to correct login credentials or use alternative credentials to login successfully.
         frame = context.pages[-1]
         # Input email for Burger King admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@burger-king.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@burger-king.com')
         
 
         # -> Click the 'Entrar' button to submit the login form and authenticate.
         frame = context.pages[-1]
         # Click Entrar button to login with Burger King admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input valid Burger King admin credentials and click Entrar to login.
         frame = context.pages[-1]
         # Input email for Burger King admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@burger-king.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@burger-king.com')
         
 
         frame = context.pages[-1]
         # Input password for Burger King admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('burger123')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('burger123')
         
 
         frame = context.pages[-1]
         # Click Entrar button to login with Burger King admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input Burger King admin email and password, then click Entrar to login.
         frame = context.pages[-1]
         # Input email for Burger King admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@burger-king.com')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@burger-king.com')
         
 
         frame = context.pages[-1]
         # Input password for Burger King admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('burger123')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('burger123')
         
 
         frame = context.pages[-1]
         # Click Entrar button to login with Burger King admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
         # -> Input Super Admin email and password, then click Entrar to login.
         frame = context.pages[-1]
         # Input email for Super Admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_email('admin@deliverei.com.br')
         
 
         frame = context.pages[-1]
         # Input password for Super Admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await readiness.settle(page); await pages.LoginForm(frame).fill_password('admin123')
         
 
         frame = context.pages[-1]
         # Click Entrar button to login with Super Admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.LoginForm(frame).submit()
         
 
-        # -> Call the token refresh API endpoint to obtain a new JWT token and verify session remains active.
-        await page.goto('http://localhost:4173/api/auth/refresh-token', timeout=10000)
-        await asyncio.sleep(3)
+        # -> Exchange the refresh token through POST /api/auth/refresh (harness/api_client.py) and verify the new JWT keeps the session active.
+        async with api_client.session("super_admin") as api:
+            await api.refresh()
+            assert api.access_token, "POST /auth/refresh returned no accessToken"
+            await api.webhook_logs()
         
 
         # -> Perform token refresh by calling the API endpoint via an authenticated request or through the UI if available, instead of direct URL navigation.
         frame = context.pages[-1]
         # Click 'Testar com Backend Real' button to login with real backend again to ensure session is active
         elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to refresh the JWT token by triggering an API call via JavaScript in the console or by simulating an authenticated API request if possible.
-        await page.goto('http://localhost:4173/api/auth/refresh-token', timeout=10000)
-        await asyncio.sleep(3)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # -> Click the 'Testar com Backend Real' button to navigate to the real backend login page and authenticate.
         frame = context.pages[-1]
         # Click 'Testar com Backend Real' button to navigate to real backend login
         elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Call the token refresh API endpoint via an authenticated API request or simulate the call to verify a new JWT token is returned and session remains active.
-        await page.goto('http://localhost:4173/api/auth/refresh-token', timeout=10000)
-        await asyncio.sleep(3)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # -> Click the 'Testar com Backend Real' button to navigate to the real backend login page.
         frame = context.pages[-1]
         # Click 'Testar com Backend Real' button to navigate to real backend login page
         elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Loja Exemplo').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Seu carrinho está vazio.').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,72 +31,18 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Login Mock' to simulate login as a client user to test access to admin routes.
-        frame = context.pages[-1]
-        # Click 'Login Mock' button to simulate login as a client user 
-        elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input client user credentials and submit login form to simulate client user login.
-        frame = context.pages[-1]
-        # Input client user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        frame = context.pages[-1]
-        # Input client user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Attempt to access the store admin protected route /admin/store/products as client user by navigating to that URL.
         await page.goto('http://localhost:4173/admin/store/products', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Input store admin user credentials (admin@pizza-express.com / pizza123) and submit login form to simulate store admin login.
-        frame = context.pages[-1]
-        # Input store admin user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Input store admin user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input correct store admin user credentials (admin@pizza-express.com / pizza123) and submit login form again to simulate store admin login.
-        frame = context.pages[-1]
-        # Input store admin user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Input store admin user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page)
+        # -> Sign in as the pizza-express store admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "store_admin")
         # -> Attempt to access the store admin protected route /admin/store/products as a client user and verify access is denied or redirected.
         await page.goto('http://localhost:4173/admin/store/products', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Login as store admin user with credentials admin@pizza-express.com / pizza123 to test access to super admin route.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
+        await readiness.settle(page)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the pizza-express store admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "store_admin")
         
 
         # --> Assertions to verify final state
@@ -120,15 +51,10 @@ async def run_test():
             await expect(frame.locator('text=Access Granted to Super Admin Route').first).to_be_visible(timeout=5000)
         except AssertionError:
             raise AssertionError('Test case failed: Users without the required roles were able to access protected admin routes, which violates the access control policy.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the pizza-express store admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("store_admin"))
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("store_admin"), wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,108 +31,32 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to start login as store admin.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate login as store admin
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input store admin email and password, then submit login form.
-        frame = context.pages[-1]
-        # Input store admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        # Input store admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        # Click submit button to login as store admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # -> Click on 'Produtos' link to navigate to product management page.
         frame = context.pages[-1]
         # Click on 'Produtos' link to go to product management page
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Produtos')
         
 
-        # -> Input store admin email and password for Pizza Express and submit login form.
-        frame = context.pages[-1]
-        # Input store admin email for Pizza Express
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        # Input store admin password for Pizza Express
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try logging in as Super Admin with provided credentials to access product creation page.
-        frame = context.pages[-1]
-        # Input Super Admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        # Input Super Admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to submit Super Admin login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' link to navigate to company management page.
         frame = context.pages[-1]
         # Click on 'Empresas' link to go to company management page
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for 'Pizza Express' to access company details and navigate to product creation page.
         frame = context.pages[-1]
         # Click 'Ver detalhes' button for 'Pizza Express' company
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[5]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Table(frame).click_row_button('Pizza Express', 'Ver detalhes')
         
 
-        # -> Input Pizza Express store admin credentials and submit login form.
-        frame = context.pages[-1]
-        # Input Pizza Express store admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        # Input Pizza Express store admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the pizza-express store admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "store_admin")
         
 
         # --> Assertions to verify final state
@@ -156,15 +65,10 @@ async def run_test():
             await expect(frame.locator('text=Product Creation Successful!').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Store admins could not create new products with valid data and did not receive confirmation as expected.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the super admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("super_admin"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("super_admin"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,38 +31,18 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to start login process as store admin.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate login as store admin 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input store admin email and password, then click submit to login.
-        frame = context.pages[-1]
-        # Input store admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input store admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Click on the 'Empresas' link in the sidebar to navigate to the product list.
         frame = context.pages[-1]
         # Click 'Empresas' link to navigate to product list 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         # -> Click the 'Ver detalhes' button for the company 'Sabor da Casa' to open the product details for editing.
         frame = context.pages[-1]
         # Click 'Ver detalhes' for 'Sabor da Casa' to edit product details 
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[4]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page); await pages.Table(frame).click_row_button('Sabor da Casa', 'Ver detalhes')
         # -> Modify product details of the selected product
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/header/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -86,15 +51,10 @@ async def run_test():
             await expect(frame.locator('text=Product update successful')).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError('Test case failed: Store admins could not update existing product details or changes were not saved correctly.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
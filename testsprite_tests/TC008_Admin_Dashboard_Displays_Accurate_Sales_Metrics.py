@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the pizza-express store admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("store_admin"))
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4179", wait_until="commit", timeout=10000)
+        # Navigate to the store dashboard and wait for its statistics request to come back
+        await pages.Dashboard(page).open(auth_state.landing_url("store_admin"))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,37 +31,12 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to start admin login process.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate admin login.
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Select 'Pizza Express' from the company dropdown, then input email and password, and click login.
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to login as admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # -> Verify product popularity and order statistics charts load correctly, then apply varying date filters to test data updates.
         frame = context.pages[-1]
         # Click on 'Produtos' to check product popularity data.
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Produtos')
         
 
         # -> Check for any visible date filter controls or reload the dashboard to attempt to trigger data loading.
@@ -89,15 +49,10 @@ async def run_test():
             await expect(frame.locator('text=Admin Dashboard Loaded Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The admin dashboard did not load correctly or display sales metrics, product popularity, and order statistics as expected according to the test plan.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,98 +31,50 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to login as client user.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as client user 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input client user email and password, then submit login form.
-        frame = context.pages[-1]
-        # Input client user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        frame = context.pages[-1]
-        # Input client user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Click 'Adicionar' button for the first product 'Marmita Fitness 1' to add it to the cart.
         frame = context.pages[-1]
         # Click 'Adicionar' button for 'Marmita Fitness 1' to add it to the cart 
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product('Marmita Fitness 1')
         # -> Increase the quantity of 'Marmita Fitness 1' in the cart by clicking the increase quantity button.
         frame = context.pages[-1]
         # Click the 'Aumentar quantidade de Marmita Fitness 1' button to increase quantity 
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         # -> Click 'Adicionar' button for 'Refrigerante Lata' to add it to the cart.
         frame = context.pages[-1]
         # Click 'Adicionar' button for 'Refrigerante Lata' in the cart suggestions 
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_suggestion('Refrigerante Lata')
         # -> Click the 'Ir para checkout' button to verify navigation to the checkout page.
         frame = context.pages[-1]
         # Click the 'Ir para checkout' button to proceed to checkout 
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).checkout()
         # -> Navigate back to the storefront homepage to verify if the user is still logged in or needs to re-login.
         await page.goto('http://localhost:4173', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Click the 'Entrar' button to login again as client user.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as client user 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input client user email and password, then submit login form to re-login.
-        frame = context.pages[-1]
-        # Input client user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        frame = context.pages[-1]
-        # Input client user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Click the 'Entrar' button to navigate to the login page and then input credentials correctly.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to navigate to login page 
-        elem = frame.locator('xpath=html/body/div/div/header/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page)
+        # -> Sign in as the customer from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "customer")
         # -> Add the first product 'Marmita Fitness 1' to the cart by clicking its 'Adicionar' button.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product('Marmita Fitness 1')
         
 
         # -> Add the second product 'Refrigerante Lata' to the cart by clicking its 'Adicionar' button in the cart sidebar suggestions.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_suggestion('Refrigerante Lata')
         
 
         # -> Increase the quantity of 'Marmita Fitness 1' in the cart by clicking the increase quantity button.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # -> Decrease the quantity of 'Marmita Fitness 1' by clicking the decrease quantity button to verify cart updates correctly.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).decrease('Marmita Fitness 1')
         
 
         # -> Click the 'Ir para checkout' button to verify navigation to the checkout page and cart details.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).checkout()
         
 
         # --> Assertions to verify final state
@@ -146,15 +83,10 @@ async def run_test():
             await expect(frame.locator('text=Product added to cart successfully!').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The product was not added to the shopping cart as expected. The cart details did not update accordingly after adding the product.")
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4178", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,44 +31,19 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar' button to go to the login page
-        frame = context.pages[-1]
-        # Click on the 'Entrar' button to navigate to login page
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Fill Empresa with 'Pizza Express', E-mail with 'cliente@exemplo.com', Senha with 'cliente123', then click Entrar button
-        frame = context.pages[-1]
-        # Input email cliente@exemplo.com
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        
-
-        frame = context.pages[-1]
-        # Input password cliente123
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # -> Trigger an API request to a protected endpoint to observe request headers and token behavior
         frame = context.pages[-1]
         # Click on 'Carrinho' button to trigger a protected API request for cart items
-        elem = frame.locator('xpath=html/body/div/div/header/div/div[3]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).open()
         
 
         # -> Try to add a product to the cart to trigger a POST request and verify if Authorization and X-Tenant-Slug headers are included
         frame = context.pages[-1]
         # Click on button to add a product to the cart (if available) to trigger POST /api/carrinho/itens request
         elem = frame.locator('xpath=html/body/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -92,15 +52,10 @@ async def run_test():
             await expect(frame.locator('text=Token Refresh Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Axios HTTP client did not include Authorization and X-Tenant-Slug headers correctly or failed to refresh token on 401 response as per the test plan.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,97 +31,63 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to start login as client user.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to start login as client user
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input client user email and password, then submit login form.
-        frame = context.pages[-1]
-        # Input client user email
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        
-
-        frame = context.pages[-1]
-        # Input client user password
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        
-
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
         # -> Click 'Adicionar' button for the first product 'Marmita Fitness 1' to add it to the cart.
         frame = context.pages[-1]
         # Click 'Adicionar' button for 'Marmita Fitness 1' to add it to the cart
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product('Marmita Fitness 1')
         
 
         # -> Click the 'Aumentar quantidade de Marmita Fitness 1' button to increase the quantity from 1 to 2.
         frame = context.pages[-1]
         # Click the 'Aumentar quantidade de Marmita Fitness 1' button to increase quantity
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # -> Click the 'Diminuir quantidade de Marmita Fitness 1' button to decrease the quantity back to 1 and verify the cart updates accordingly.
         frame = context.pages[-1]
         # Click the 'Diminuir quantidade de Marmita Fitness 1' button to decrease quantity
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).decrease('Marmita Fitness 1')
         
 
         # -> Test updating the quantity to a higher number (e.g., 3) and verify the cart updates accordingly.
         frame = context.pages[-1]
         # Click the 'Aumentar quantidade de Marmita Fitness 1' button to increase quantity to 2
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         frame = context.pages[-1]
         # Click the 'Aumentar quantidade de Marmita Fitness 1' button to increase quantity to 3
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # -> Click the 'Diminuir quantidade de Marmita Fitness 1' button three times to reduce quantity to 0 or remove the item, verifying cart updates accordingly.
         frame = context.pages[-1]
         # Click the 'Diminuir quantidade de Marmita Fitness 1' button to decrease quantity from 3 to 2
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).decrease('Marmita Fitness 1')
         
 
         frame = context.pages[-1]
         # Click the 'Diminuir quantidade de Marmita Fitness 1' button to decrease quantity from 2 to 1
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).decrease('Marmita Fitness 1')
         
 
         frame = context.pages[-1]
         # Click the 'Diminuir quantidade de Marmita Fitness 1' button to decrease quantity from 1 to 0 or remove item
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).decrease('Marmita Fitness 1')
         
 
         # -> Add a different product to the cart to verify cart updates with a new item.
         frame = context.pages[-1]
         # Click 'Adicionar' button for 'Marmita Tradicional 2' to add it to the cart
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[11]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product('Marmita Tradicional 2')
         
 
         # -> Click the 'Aumentar quantidade de Marmita Light 11' button to increase quantity to 2 and verify cart updates.
         frame = context.pages[-1]
         # Click the 'Aumentar quantidade de Marmita Light 11' button to increase quantity to 2
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Light 11')
         
 
         # --> Assertions to verify final state
@@ -146,15 +97,10 @@ async def run_test():
         await expect(frame.locator('text=2').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Subtotal').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=R$ 47,80').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
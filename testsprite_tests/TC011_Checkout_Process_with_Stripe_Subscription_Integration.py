@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,29 +31,10 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to login as client user.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as client user 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input client user email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input client user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        frame = context.pages[-1]
-        # Input client user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        frame = context.pages[-1]
-        # Click the login button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Add an item to the cart by clicking the 'Adicionar' button for the first product.
         frame = context.pages[-1]
         # Click 'Adicionar' button for the first product Marmita Fitness 1 to add it to cart 
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product('Marmita Fitness 1')
         # -> Scroll down if needed and locate the coupon code input field to apply a valid coupon code.
         await page.mouse.wheel(0, 300)
         # -> Scroll further down or explore the cart sidebar and checkout page for coupon code input and apply button.
@@ -76,23 +42,21 @@ async def run_test():
         # -> Click the 'Ir para checkout' button to proceed to the checkout page where coupon code application and payment selection might be available.
         frame = context.pages[-1]
         # Click 'Ir para checkout' button to proceed to checkout 
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page); await pages.Cart(frame).checkout()
         # -> Retry navigation to checkout or reload page to access coupon code input and payment options
         await page.goto('http://localhost:4173/storefront/cart', timeout=10000)
-        await asyncio.sleep(3)
+        await readiness.settle(page)
         
 
         # -> Click on cart or checkout related button or link to reach the cart or checkout page
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # -> Add an item to the cart by clicking the 'Adicionar' button for the first product
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product()
         
 
         # -> Apply a valid coupon code in the cart sidebar
@@ -105,8 +69,7 @@ async def run_test():
 
         # -> Click the 'Ir para checkout' button to proceed to the checkout page
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).checkout()
         
 
         # --> Assertions to verify final state
@@ -115,15 +78,10 @@ async def run_test():
             await expect(frame.locator('text=Subscription Payment Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: Checkout was not successful, subscription was not created, or user was not notified as expected.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
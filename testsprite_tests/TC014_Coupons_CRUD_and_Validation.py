@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the pizza-express store admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("store_admin"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("store_admin"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,157 +31,47 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to login as store admin.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as store admin 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input store admin email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input store admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Input store admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click the login button to submit store admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Try to navigate back to the homepage or another admin section to find coupon management or reload the page to attempt to fix the empty page issue.
         await page.goto('http://localhost:4173', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Click the 'Entrar' button to attempt login as store admin again.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as store admin 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input store admin email and password, then click the login button to attempt login again.
-        frame = context.pages[-1]
-        # Input store admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Input store admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click the login button to submit store admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Verify credentials and try to login again or try alternative login method or user.
-        frame = context.pages[-1]
-        # Re-input store admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Re-input store admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click the login button to submit store admin credentials again 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input Super Admin credentials and click the login button to login as Super Admin.
-        frame = context.pages[-1]
-        # Input Super Admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input Super Admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click the login button to submit Super Admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         # -> Check if there is a coupon management section or navigate to 'Empresas' or 'Configurações' to find coupon management options.
         frame = context.pages[-1]
         # Click 'Assinaturas' (Subscriptions) to check for coupon management options 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Assinaturas')
         # -> Click 'Ver detalhes' for the 'Pizza Express' company to check for coupon management options.
         frame = context.pages[-1]
         # Click 'Ver detalhes' for 'Pizza Express' company 
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[5]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
-        # -> Navigate to coupon management section or find coupons list
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input store admin email and password, then click the login button to login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try login as Super Admin or another admin user to access coupon management.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Table(frame).click_row_button('Pizza Express', 'Ver detalhes')
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' tab to view list of companies.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for 'Pizza Express' company to access company details and coupon management.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[5]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Login again as Super Admin to restore session and continue testing.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' tab to view list of companies.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for 'Pizza Express' company to access its details and coupon management.
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[5]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -205,15 +80,10 @@ async def run_test():
             await expect(frame.locator('text=Coupon Successfully Created').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan execution failed to verify coupon creation, update, deletion, and validation during checkout as expected.")
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
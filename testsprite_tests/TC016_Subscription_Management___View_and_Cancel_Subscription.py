@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the customer
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("customer"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("customer"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,39 +31,11 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to login as client user.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login as client user 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input client user email and password, then click login button.
-        frame = context.pages[-1]
-        # Input client user email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente@exemplo.com')
-        frame = context.pages[-1]
-        # Input client user password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('cliente123')
-        frame = context.pages[-1]
-        # Click login button to submit client user credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Refresh the page to attempt loading the subscription management UI or find alternative navigation options.
         await page.goto('http://localhost:4173/storefront', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Click the 'Entrar' button at index 1 to check if it opens account or subscription management options.
-        frame = context.pages[-1]
-        # Click 'Entrar' button to check for account or subscription management options 
-        elem = frame.locator('xpath=html/body/div/div/header/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page)
         # -> Try to find alternative navigation to subscription management, such as searching for account or profile links, or report issue if none found.
         await page.mouse.wheel(0, 300) 
-        # -> Click the 'Entrar' button to initiate client login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -86,15 +43,10 @@ async def run_test():
             await expect(frame.locator('text=Subscription Activated Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: The subscription management test did not complete successfully as the expected subscription activation confirmation message was not found.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the super admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("super_admin"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("super_admin"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,199 +31,91 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to login as store admin or appropriate role.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to login 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input email and password for store admin and submit login form.
-        frame = context.pages[-1]
-        # Input email for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input password for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Try to refresh the page to reload the admin dashboard and payment management UI.
         await page.goto('http://localhost:4173/admin/super', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Input email and password for store admin and submit login form again to retry access.
-        frame = context.pages[-1]
-        # Input email for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input password for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         # -> Navigate to the 'Empresas' section to find an existing order for payment creation.
         frame = context.pages[-1]
         # Click on 'Empresas' to access companies and orders 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         # -> Click 'Ver detalhes' for the first company 'Marmita Boa' to access its details and orders.
         frame = context.pages[-1]
         # Click 'Ver detalhes' for 'Marmita Boa' company 
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input email and password for store admin and submit login form to regain access.
-        frame = context.pages[-1]
-        # Input email for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input password for store admin login 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to submit login form 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Table(frame).click_row_button('Marmita Boa', 'Ver detalhes')
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         # -> Navigate to the 'Empresas' section to find an existing order for payment creation.
         frame = context.pages[-1]
         # Click on 'Empresas' to access companies and orders 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         # -> Click 'Ver detalhes' for the first company 'Marmita Boa' to access its details and orders.
         frame = context.pages[-1]
         # Click 'Ver detalhes' for 'Marmita Boa' company 
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
-        # -> Input email for store admin login
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Table(frame).click_row_button('Marmita Boa', 'Ver detalhes')
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' menu item to access companies list
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for the first company 'Marmita Boa' to access its details and orders
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email for store admin login
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' menu item to access companies list
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for the first company 'Marmita Boa' to access its details and orders
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
-        # -> Input email for store admin login
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' menu item to access companies list
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for the first company 'Marmita Boa' to access its details and orders
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
-        # -> Input email for store admin login
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Empresas' menu item to access companies list
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Empresas')
         
 
         # -> Click 'Ver detalhes' button for 'Sabor da Casa' company (index 13) to access its details and orders
         frame = context.pages[-1]
         elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[3]/table/tbody/tr[4]/td[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email for store admin login
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await readiness.settle(page); await elem.click(timeout=5000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # --> Assertions to verify final state
@@ -247,15 +124,10 @@ async def run_test():
             await expect(frame.locator('text=Payment Creation Successful').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test case failed: The payments API did not successfully create or cancel payments as expected. Payment creation or cancellation verification failed based on the test plan.")
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
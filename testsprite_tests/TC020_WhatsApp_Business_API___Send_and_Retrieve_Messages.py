@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the pizza-express store admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("store_admin"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("store_admin"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,52 +31,20 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click on the 'Entrar' button to proceed to login as store admin.
-        frame = context.pages[-1]
-        # Click on the 'Entrar' button to login as store admin 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input store admin email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input store admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        frame = context.pages[-1]
-        # Input store admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        frame = context.pages[-1]
-        # Click the login button to submit credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Navigate to 'Pedidos' (Orders) section to find an order to send a WhatsApp message.
         frame = context.pages[-1]
         # Click on 'Pedidos' (Orders) in the navigation menu 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Pedidos')
         # -> Click the 'Ver' button for order 1001 to open order details and access WhatsApp messaging interface.
         frame = context.pages[-1]
         # Click 'Ver' button for order 1001 to open order details 
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div/div[2]/table/tbody/tr/td[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000) 
+        await readiness.settle(page); await pages.Table(frame).click_row_button('1001', 'Ver')
         # -> Locate and interact with the WhatsApp messaging interface to send a message to the customer.
         await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
         
 
-        # -> Login again as store admin using valid credentials.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the pizza-express store admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "store_admin")
         
 
         # --> Assertions to verify final state
@@ -100,15 +53,10 @@ async def run_test():
             await expect(frame.locator('text=Message sent successfully via WhatsApp API').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: The message was not accepted and sent successfully through the WhatsApp API integration as expected.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
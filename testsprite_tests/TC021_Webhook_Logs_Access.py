@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import api_client, auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
 
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the super admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("super_admin"))
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("super_admin"), wait_until="commit", timeout=10000)
 
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,203 +31,63 @@ async def run_test():
                 pass
 
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Entrar' button to start login as super admin.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate login. 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input super admin email and password, then click login button.
-        frame = context.pages[-1]
-        # Input super admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input super admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click login button to submit super admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         # -> Navigate to the 'Configurações' (Settings) section to find webhook logs.
         frame = context.pages[-1]
         # Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings. 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Attempt to call the webhook logs endpoint directly to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Login as super admin again and try to find the webhook logs endpoint or UI element to retrieve logs properly.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate login as super admin again. 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input super admin email and password, then click login button to login again.
-        frame = context.pages[-1]
-        # Input super admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input super admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click login button to submit super admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Configurações')
+        # -> Call the webhook logs endpoint directly to verify logs retrieval (harness/api_client.py).
+        async with api_client.session("super_admin") as api:
+            logs = await api.webhook_logs(limit=5)
+            assert isinstance(logs.get("data"), list) and "pagination" in logs, f"/webhooks/logs returned {logs!r}"
+            if logs["data"]:
+                log = await api.webhook_log(logs["data"][0]["id"])
+                assert log["id"] == logs["data"][0]["id"], f"/webhooks/logs/:id returned {log!r}"
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         # -> Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings.
         frame = context.pages[-1]
         # Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings. 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Configurações')
         # -> Check the sidebar menu for other sections that might contain webhook logs, such as 'Dashboard' or 'Tickets'.
         frame = context.pages[-1]
         # Click on 'Tickets' in the sidebar to check if webhook logs are accessible there. 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Tickets')
         # -> Check the 'Dashboard' section in the sidebar for any webhook logs or monitoring information.
         frame = context.pages[-1]
         # Click on 'Dashboard' in the sidebar to check for webhook logs or monitoring information. 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Try to call the webhook logs API endpoint programmatically with authentication to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3)
-        # -> Click the 'Entrar' button to login as super admin again.
-        frame = context.pages[-1]
-        # Click the 'Entrar' button to initiate login as super admin. 
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Input super admin email and password, then click login button to login again.
-        frame = context.pages[-1]
-        # Input super admin email 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        frame = context.pages[-1]
-        # Input super admin password 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        frame = context.pages[-1]
-        # Click login button to submit super admin credentials 
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Dashboard')
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         # -> Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings.
         frame = context.pages[-1]
         # Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings. 
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        # -> Since no UI element for webhook logs is visible, attempt to call the webhook logs API endpoint programmatically with authentication to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3) 
-        # -> Click the 'Entrar' button to start login as super admin.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input super admin email and password, then click login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Configurações')
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Configurações' (Settings) in the sidebar to access webhook logs or related settings.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Configurações')
         
 
         # -> Click on 'Dashboard' in the sidebar to check for webhook logs or monitoring information.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Dashboard')
         
 
         # -> Click on 'Tickets' in the sidebar to check for webhook logs or related monitoring information.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to call the webhook logs API endpoint programmatically with super admin authentication to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Click the 'Entrar' button to login as super admin again to ensure authentication before calling the webhook logs API endpoint.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input super admin email and password, then click login button to authenticate.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to call the webhook logs API endpoint programmatically with super admin authentication to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Click the 'Entrar' button to login as super admin again and try to find a UI or method to retrieve webhook logs properly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input super admin email and password, then click login button to authenticate.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@deliverei.com.br')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Tickets')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Sign in as the super admin from the cached storage state (harness/auth_state.py).
+        await auth_state.sign_in(page, "super_admin")
         
 
         # -> Click on 'Configurações' (Settings) in the sidebar to re-check for any webhook logs or related settings.
         frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Attempt to call the webhook logs API endpoint programmatically with super admin authentication to verify logs retrieval.
-        await page.goto('http://localhost:4173/api/webhook/logs', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Click the 'Entrar' button to login as super admin again to ensure proper authentication before calling the webhook logs API endpoint.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/header/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.AdminSidebar(frame).open('Configurações')
         
 
         # --> Assertions to verify final state
@@ -251,15 +96,10 @@ async def run_test():
             await expect(frame.locator('text=Webhook logs retrieved successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Unable to retrieve webhook logs as super admin or authorized user. The webhook logs data was not found or contained errors, failing the monitoring verification step.")
-        await asyncio.sleep(5)
 
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
+            await browser_pool.get_pool().release(context)
 
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    browser_pool.main(run_test)
@@ -1,36 +1,21 @@
-import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import api_client, auth_state, browser_pool, pages, readiness
+
 async def run_test():
-    pw = None
-    browser = None
     context = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Lease a fresh, isolated context from the shared browser pool, already signed in as the pizza-express store admin
+        context = await browser_pool.get_pool().new_context(storage_state=await auth_state.storage_state("store_admin"))
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:4173", wait_until="commit", timeout=10000)
+        await page.goto(auth_state.landing_url("store_admin"), wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,65 +31,39 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click the 'Testar com Backend Real' button to start testing with real backend for token expiration simulation.
-        frame = context.pages[-1]
-        # Click 'Testar com Backend Real' button to start backend API testing for token expiration scenario
-        elem = frame.locator('xpath=html/body/div/div/section/div/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Fill login form with valid credentials for Pizza Express admin and submit to simulate expired token scenario later.
-        frame = context.pages[-1]
-        # Input email for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizza-express.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for Pizza Express admin
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('pizza123')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Retry login by clicking 'Entrar' button again or check for error messages on the login form.
-        frame = context.pages[-1]
-        # Click 'Entrar' button again to retry login
-        elem = frame.locator('xpath=html/body/div/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Check the API's failure responses directly (harness/api_client.py): missing token, bad refresh token, unknown product.
+        async with api_client.session(tenant_slug="pizza-express") as anonymous:
+            response = await anonymous.request("GET", "/carrinho", expected=None)
+            assert response.status_code == 401, f"GET /carrinho without a token returned HTTP {response.status_code}"
+            response = await anonymous.request("POST", "/auth/refresh", json={"refreshToken": "invalid"}, expected=None)
+            assert response.status_code == 401, f"POST /auth/refresh with a bad token returned HTTP {response.status_code}"
+        async with api_client.session("store_admin") as api:
+            response = await api.request("GET", "/produtos/00000000-0000-0000-0000-000000000000", expected=None)
+            assert response.status_code == 404, f"GET of an unknown product returned HTTP {response.status_code}"
         
 
         # -> Simulate API network failure by attempting to add a product to the cart and intercepting the network request to fail.
         frame = context.pages[-1]
         # Click 'Adicionar' button on first product to trigger a CRUD operation and simulate network failure
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).add_product()
         
 
         # -> Simulate API network failure during a CRUD operation by attempting to increase product quantity and observe error handling.
         frame = context.pages[-1]
         # Click 'Aumentar quantidade de Marmita Fitness 1' button to simulate update operation and trigger potential network failure
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # -> Simulate API network failure during quantity update and verify user-friendly error message is shown without crashing the app.
         frame = context.pages[-1]
         # Click 'Aumentar quantidade de Marmita Fitness 1' button again to simulate network failure during update operation
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # -> Simulate API network failure during quantity update by clicking 'Aumentar quantidade de Marmita Fitness 1' button and observe error handling.
         frame = context.pages[-1]
         # Click 'Aumentar quantidade de Marmita Fitness 1' button to simulate network failure during update operation
-        elem = frame.locator('xpath=html/body/div/div/div[3]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await readiness.settle(page); await pages.Cart(frame).increase('Marmita Fitness 1')
         
 
         # --> Assertions to verify final state
@@ -113,15 +72,10 @@ async def run_test():
             await expect(frame.locator('text=Token refresh successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The frontend did not handle API failure scenarios gracefully. Expected a prompt for user login due to expired token and graceful token refresh failure, but 'Token refresh successful' message was not found, indicating the test plan requirements were not met.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+            await browser_pool.get_pool().release(context)
+
+if __name__ == "__main__":
+    browser_pool.main(run_test)
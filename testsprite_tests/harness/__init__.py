@@ -0,0 +1,15 @@
+"""Local execution harness for the generated TestSprite Playwright scripts."""
+
+from .discovery import TestCase, discover, load_run_test
+from .runner import merge_results, parse_shard, run_cases, select_shard, write_results
+
+__all__ = [
+    "TestCase",
+    "discover",
+    "load_run_test",
+    "merge_results",
+    "parse_shard",
+    "run_cases",
+    "select_shard",
+    "write_results",
+]
@@ -0,0 +1,90 @@
+"""Command line entry point: ``python -m harness`` from ``testsprite_tests/``.
+
+Examples::
+
+    python -m harness                      # every TC script, one worker per core
+    python -m harness --workers 8 -k TC005 -k TC013
+    python -m harness --shard 2/4          # CI machine 2 of 4
+    python -m harness --merge tmp/test_results.shard-*.json
+    python -m harness --trace -k TC013     # Chromium trace + Web Vitals per test
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from . import config
+from .discovery import discover
+from .runner import FAILED, merge_results, parse_shard, run_cases, select_shard, write_results
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--shard", metavar="K/N", help="run only shard K of N")
+    parser.add_argument("-k", "--select", action="append", metavar="TEXT",
+                        help="only run cases whose file name contains TEXT (repeatable)")
+    parser.add_argument("--timeout", type=float, default=config.TEST_TIMEOUT_S,
+                        help="per-test timeout in seconds")
+    parser.add_argument("--output", "-o", type=Path, help="results file (default: tmp/test_results.json)")
+    parser.add_argument("--trace", action="store_true",
+                        help="record a Chromium trace, network waterfall and Web Vitals per test (tmp/traces/)")
+    parser.add_argument("--list", action="store_true", help="list the selected cases and exit")
+    parser.add_argument("--merge", nargs="+", type=Path, metavar="FILE",
+                        help="merge shard result files into --output and exit")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = _parser().parse_args(argv)
+
+    if args.merge:
+        output = args.output or config.RESULTS_PATH
+        records = merge_results(args.merge)
+        write_results(records, output)
+        print(f"merged {len(records)} results into {output}")
+        return 0
+
+    cases = discover(select=args.select)
+    output = args.output or config.RESULTS_PATH
+    if args.shard:
+        k, n = parse_shard(args.shard)
+        cases = select_shard(cases, k, n)
+        if args.output is None:
+            output = config.TMP_DIR / f"test_results.shard-{k}-of-{n}.json"
+
+    if args.list:
+        for case in cases:
+            print(case.path.name)
+        return 0
+
+    if args.trace:
+        # Read by config in the spawned workers.
+        os.environ["DELIVEREI_TRACE"] = "1"
+        config.TRACE_ENABLED = True
+
+    print(f"running {len(cases)} cases on {min(args.workers, len(cases)) or 0} workers")
+    started = time.monotonic()
+
+    def report(record: dict) -> None:
+        mark = "FAIL" if record["testStatus"] == FAILED else "ok  "
+        print(f"  {mark} {record['title']}", flush=True)
+
+    records = run_cases(cases, args.workers, args.timeout, on_result=report)
+    write_results(records, output)
+    if config.TRACE_ENABLED:
+        from . import tracing
+
+        if tracing.update_report(records):
+            print(f"performance summary written to {config.REPORT_PATH.name}, traces in {config.TRACE_DIR}")
+
+    failed = sum(1 for r in records if r["testStatus"] == FAILED)
+    print(f"{len(records) - failed} passed, {failed} failed in {time.monotonic() - started:.1f}s -> {output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
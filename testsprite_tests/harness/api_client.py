@@ -0,0 +1,354 @@
+"""Async client for the NestJS API, for cases that only need to check JSON.
+
+TC003, TC019, TC021 and TC023 used to check endpoints by pointing Chromium at
+the URL (``page.goto(".../api/webhook/logs")``), paying for a page render to
+read one response -- and getting the SPA's HTML back, since the preview
+server does not proxy ``/api``. This client talks to ``DELIVEREI_API_URL``
+directly over a pooled HTTP/1.1 keep-alive connection set shared by every
+client in the worker, so an API-level step costs one round trip::
+
+    async with api_client.session("store_admin") as api:
+        stats = await api.dashboard_estatisticas()
+        await api.add_cart_item(produto_id, quantidade=2)
+
+A session for a seeded role reuses the tokens cached by ``auth_state`` (no
+extra login), sends ``X-Tenant-Slug`` for the role's store and, when a
+request comes back 401, exchanges the refresh token once through
+``POST /auth/refresh`` and retries. Unexpected statuses raise
+:class:`ApiError`; :meth:`ApiClient.request` with ``expected=None`` returns
+the raw response for the error-handling checks.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Collection, Dict, List, Optional, TypedDict
+
+import httpx
+
+from . import auth_state, config
+
+TIMEOUT_S = 15.0
+# Every client in a worker shares these connections; a test rarely has more
+# than a handful of requests in flight at once.
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE = 16
+KEEPALIVE_EXPIRY_S = 30.0
+
+
+class ApiError(AssertionError):
+    """The API answered with a status the step did not expect."""
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self.status = response.status_code
+        self.body = _decode(response)
+        request = response.request
+        message = self.body.get("message") if isinstance(self.body, dict) else self.body
+        super().__init__(f"{request.method} {request.url.path} -> HTTP {self.status}: {message}")
+
+
+class EnderecoEntrega(TypedDict, total=False):
+    rua: str
+    numero: str
+    complemento: str
+    bairro: str
+    cidade: str
+    estado: str
+    cep: str
+
+
+class Cupom(TypedDict, total=False):
+    codigo: str
+    descricao: str
+    tipo: str  # "PERCENTUAL" or "VALOR_FIXO"
+    valor: float
+    valorMinimo: float
+    dataInicio: str
+    dataFim: str
+    ativo: bool
+    usoMaximo: int
+
+
+def _decode(response: httpx.Response) -> Any:
+    if not response.content:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def _params(**values) -> Dict[str, Any]:
+    params = {}
+    for name, value in values.items():
+        if value is None:
+            continue
+        params[name] = str(value).lower() if isinstance(value, bool) else value
+    return params
+
+
+_http: Optional[httpx.AsyncClient] = None
+_http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http() -> httpx.AsyncClient:
+    """Return the connection pool bound to the running event loop, creating it on first use."""
+    global _http, _http_loop
+    loop = asyncio.get_running_loop()
+    if _http is None or _http_loop is not loop:
+        _http = httpx.AsyncClient(
+            base_url=config.API_URL,
+            http1=True,
+            http2=False,
+            timeout=TIMEOUT_S,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+            headers={"Accept": "application/json"},
+        )
+        _http_loop = loop
+    return _http
+
+
+async def close_http() -> None:
+    global _http, _http_loop
+    if _http is not None:
+        await _http.aclose()
+    _http, _http_loop = None, None
+
+
+class ApiClient:
+    """One user's view of the API: tenant, tokens and the typed helpers."""
+
+    def __init__(self, tenant_slug: Optional[str] = None, access_token: Optional[str] = None,
+                 refresh_token: Optional[str] = None, http: Optional[httpx.AsyncClient] = None):
+        self.tenant_slug = tenant_slug
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        # A dedicated pool (e.g. the load generator's); the worker's shared one otherwise.
+        self._http = http
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        return self._http or get_http()
+
+    @classmethod
+    async def for_role(cls, role: str) -> "ApiClient":
+        """Client signed in as a seeded role, from the ``auth_state`` cache."""
+        storage = await asyncio.to_thread(auth_state.local_storage, role)
+        return cls(
+            tenant_slug=storage.get("deliverei_tenant_slug") or auth_state.ACCOUNTS[role].tenant_slug,
+            access_token=storage.get("deliverei_token"),
+            refresh_token=storage.get("deliverei_refresh_token"),
+        )
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.tenant_slug:
+            headers["X-Tenant-Slug"] = self.tenant_slug
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        return headers
+
+    async def request(self, method: str, path: str, *, json: Any = None, params: Optional[Dict[str, Any]] = None,
+                      expected: Optional[Collection[int]] = (200, 201), refresh: bool = True):
+        """Send a request; returns the decoded body, or the response when ``expected`` is None.
+
+        A 401 is retried once after a token refresh when a refresh token is held.
+        """
+        http = self.http
+        response = await http.request(method, path, json=json, params=params, headers=self.headers())
+        if response.status_code == 401 and refresh and self.refresh_token:
+            await self.refresh()
+            response = await http.request(method, path, json=json, params=params, headers=self.headers())
+        if expected is None:
+            return response
+        if response.status_code not in expected:
+            raise ApiError(response)
+        return _decode(response)
+
+    # -- auth -------------------------------------------------------------
+
+    async def login(self, email: str, senha: str) -> dict:
+        body = await self.request("POST", "/auth/login", json={"email": email, "senha": senha}, refresh=False)
+        self.access_token = body["accessToken"]
+        self.refresh_token = body.get("refreshToken")
+        empresa = body.get("empresa") or {}
+        self.tenant_slug = empresa.get("slug") or self.tenant_slug
+        return body
+
+    async def signup(self, nome: str, email: str, senha: str, empresa_id: str) -> dict:
+        """Create a customer (``CLIENTE``) of ``empresa_id``."""
+        body = {"nome": nome, "email": email, "senha": senha, "empresaId": empresa_id}
+        return await self.request("POST", "/auth/signup", json=body, refresh=False)
+
+    async def refresh(self) -> dict:
+        """Exchange the refresh token for a new access token."""
+        body = await self.request("POST", "/auth/refresh", json={"refreshToken": self.refresh_token}, refresh=False)
+        self.access_token = body["accessToken"]
+        # Both backends rotate it: the old token stops working once exchanged.
+        self.refresh_token = body.get("refreshToken") or self.refresh_token
+        return body
+
+    async def logout(self) -> None:
+        await self.request("POST", "/auth/logout", json={"refreshToken": self.refresh_token}, refresh=False)
+        self.access_token = self.refresh_token = None
+
+    # -- public (storefront, no auth) -------------------------------------
+
+    async def loja_info(self, slug: str) -> dict:
+        return await self.request("GET", f"/public/{slug}/info")
+
+    async def public_produtos(self, slug: str, page: int = 1, limit: int = 20, categoria: Optional[str] = None,
+                              search: Optional[str] = None) -> dict:
+        params = _params(page=page, limit=limit, categoria=categoria, search=search)
+        return await self.request("GET", f"/public/{slug}/produtos", params=params)
+
+    async def public_categorias(self, slug: str) -> List[Any]:
+        return await self.request("GET", f"/public/{slug}/categorias")
+
+    # -- produtos ---------------------------------------------------------
+
+    async def list_produtos(self, page: int = 1, limit: int = 20, categoria: Optional[str] = None,
+                            search: Optional[str] = None, ativo: Optional[bool] = None) -> dict:
+        params = _params(page=page, limit=limit, categoria=categoria, search=search, ativo=ativo)
+        return await self.request("GET", "/produtos", params=params)
+
+    async def get_produto(self, produto_id: str) -> dict:
+        return await self.request("GET", f"/produtos/{produto_id}")
+
+    async def create_produto(self, produto: Dict[str, Any]) -> dict:
+        return await self.request("POST", "/produtos", json=produto)
+
+    async def update_produto(self, produto_id: str, changes: Dict[str, Any]) -> dict:
+        return await self.request("PATCH", f"/produtos/{produto_id}", json=changes)
+
+    async def delete_produto(self, produto_id: str, hard: bool = False) -> Any:
+        return await self.request("DELETE", f"/produtos/{produto_id}/hard" if hard else f"/produtos/{produto_id}")
+
+    # -- carrinho ---------------------------------------------------------
+
+    async def get_carrinho(self) -> dict:
+        return await self.request("GET", "/carrinho")
+
+    async def add_cart_item(self, produto_id: str, quantidade: int = 1, observacoes: Optional[str] = None) -> dict:
+        item = {"produtoId": produto_id, "quantidade": quantidade}
+        if observacoes is not None:
+            item["observacoes"] = observacoes
+        return await self.request("POST", "/carrinho/itens", json=item)
+
+    async def update_cart_item(self, item_id: str, quantidade: Optional[int] = None,
+                               observacoes: Optional[str] = None) -> dict:
+        changes = _params(quantidade=quantidade, observacoes=observacoes)
+        return await self.request("PATCH", f"/carrinho/itens/{item_id}", json=changes)
+
+    async def remove_cart_item(self, item_id: str) -> Any:
+        return await self.request("DELETE", f"/carrinho/itens/{item_id}")
+
+    async def clear_carrinho(self) -> Any:
+        return await self.request("DELETE", "/carrinho")
+
+    async def checkout(self, endereco: EnderecoEntrega, forma_pagamento: str, cupom: Optional[str] = None,
+                       observacoes: Optional[str] = None) -> dict:
+        body: Dict[str, Any] = {"enderecoEntrega": endereco, "formaPagamento": forma_pagamento}
+        body.update(_params(cupomDesconto=cupom, observacoes=observacoes))
+        return await self.request("POST", "/carrinho/checkout", json=body)
+
+    async def recomendacoes(self) -> List[dict]:
+        return await self.request("GET", "/carrinho/recomendacoes")
+
+    # -- pedidos ----------------------------------------------------------
+
+    async def list_pedidos(self, status: Optional[str] = None, data_inicio: Optional[str] = None,
+                           data_fim: Optional[str] = None, usuario_id: Optional[str] = None,
+                           cursor: Optional[str] = None, page: Optional[int] = None,
+                           limit: Optional[int] = None) -> dict:
+        """One page; pass ``pagination.nextCursor`` back as ``cursor`` for the next."""
+        params = _params(status=status, dataInicio=data_inicio, dataFim=data_fim, usuarioId=usuario_id,
+                         cursor=cursor, page=page, limit=limit)
+        return await self.request("GET", "/pedidos", params=params)
+
+    async def meus_pedidos(self, page: int = 1, limit: int = 10) -> dict:
+        return await self.request("GET", "/pedidos/meus", params=_params(page=page, limit=limit))
+
+    async def get_pedido(self, pedido_id: str) -> dict:
+        return await self.request("GET", f"/pedidos/{pedido_id}")
+
+    async def update_pedido_status(self, pedido_id: str, status: str) -> dict:
+        return await self.request("PATCH", f"/pedidos/{pedido_id}/status", json={"status": status})
+
+    async def cancel_pedido(self, pedido_id: str) -> dict:
+        return await self.request("DELETE", f"/pedidos/{pedido_id}")
+
+    # -- cupons -----------------------------------------------------------
+
+    async def list_cupons(self) -> List[dict]:
+        return await self.request("GET", "/cupons")
+
+    async def get_cupom(self, cupom_id: str) -> dict:
+        return await self.request("GET", f"/cupons/{cupom_id}")
+
+    async def create_cupom(self, cupom: Cupom) -> dict:
+        return await self.request("POST", "/cupons", json=cupom)
+
+    async def update_cupom(self, cupom_id: str, changes: Cupom) -> dict:
+        return await self.request("PATCH", f"/cupons/{cupom_id}", json=changes)
+
+    async def delete_cupom(self, cupom_id: str) -> Any:
+        return await self.request("DELETE", f"/cupons/{cupom_id}")
+
+    async def validar_cupom(self, codigo: str, valor_compra: float) -> dict:
+        return await self.request("POST", "/cupons/validar", json={"codigo": codigo, "valorCompra": valor_compra})
+
+    # -- pagamentos -------------------------------------------------------
+
+    async def criar_pagamento(self, pagamento: Dict[str, Any]) -> dict:
+        return await self.request("POST", "/pagamentos/criar", json=pagamento)
+
+    async def get_pagamento(self, pagamento_id: str) -> dict:
+        return await self.request("GET", f"/pagamentos/{pagamento_id}")
+
+    async def pagamentos_do_pedido(self, pedido_id: str) -> List[dict]:
+        return await self.request("GET", f"/pagamentos/pedido/{pedido_id}")
+
+    async def list_pagamentos(self) -> List[dict]:
+        return await self.request("GET", "/pagamentos")
+
+    async def cancelar_pagamento(self, pagamento_id: str) -> dict:
+        return await self.request("POST", f"/pagamentos/{pagamento_id}/cancelar")
+
+    # -- webhooks ---------------------------------------------------------
+
+    async def webhook_logs(self, origem: Optional[str] = None, processado: Optional[bool] = None,
+                           cursor: Optional[str] = None, limit: Optional[int] = None) -> dict:
+        """One page, without payloads; pass ``pagination.nextCursor`` back as ``cursor`` for the next."""
+        params = _params(origem=origem, processado=processado, cursor=cursor, limit=limit)
+        return await self.request("GET", "/webhooks/logs", params=params)
+
+    async def webhook_log(self, log_id: str) -> dict:
+        """One log with its payload (``GET /webhooks/logs/:id``)."""
+        return await self.request("GET", f"/webhooks/logs/{log_id}")
+
+    # -- dashboard --------------------------------------------------------
+
+    async def dashboard_estatisticas(self) -> dict:
+        return await self.request("GET", "/dashboard/estatisticas")
+
+    async def dashboard_vendas(self, periodo: str = "dia", start_date: Optional[str] = None,
+                               end_date: Optional[str] = None) -> List[dict]:
+        params = _params(periodo=periodo, startDate=start_date, endDate=end_date)
+        return await self.request("GET", "/dashboard/vendas", params=params)
+
+    async def dashboard_produtos_populares(self, limit: int = 10) -> List[dict]:
+        return await self.request("GET", "/dashboard/produtos-populares", params=_params(limit=limit))
+
+
+@asynccontextmanager
+async def session(role: Optional[str] = None, tenant_slug: Optional[str] = None):
+    """``ApiClient`` signed in as ``role`` (anonymous when None) for the duration of a block."""
+    client = await ApiClient.for_role(role) if role else ApiClient(tenant_slug=tenant_slug)
+    if tenant_slug:
+        client.tenant_slug = tenant_slug
+    yield client
@@ -0,0 +1,236 @@
+"""Pre-authenticated Playwright storage state, one file per seeded role.
+
+Driving the login form costs every test several seconds and a handful of
+flaky XPath steps. Instead each role logs in once through
+``POST /api/auth/login`` and the resulting ``deliverei_*`` localStorage
+entries -- the same keys ``src/auth/AuthContext.tsx`` writes after a real
+login -- are saved as a Playwright ``storage_state`` file under
+``tmp/auth/``. New contexts are created from that file and open the app
+already signed in::
+
+    context = await browser_pool.get_pool().new_context(
+        storage_state=await auth_state.storage_state("store_admin"))
+    page = await context.new_page()
+    await page.goto(auth_state.landing_url("store_admin"))
+
+Switching roles mid-test goes through :func:`sign_in` instead of the form.
+
+Files are reused across worker processes and runs until they are older than
+``DELIVEREI_AUTH_TTL`` seconds. Only the dedicated auth tests (TC001-TC003,
+TC022) still go through the real form.
+"""
+
+import asyncio
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from . import config
+
+
+@dataclass(frozen=True)
+class Account:
+    role: str
+    email: str
+    password: str
+    # Landing route the login page redirects this role to.
+    landing_path: str
+    tenant_slug: Optional[str] = None
+
+
+# Seeded by backend/prisma/seed.ts (and mirrored by mock-backend/server.js).
+ACCOUNTS: Dict[str, Account] = {
+    "super_admin": Account("super_admin", "admin@deliverei.com.br", "admin123", "/admin/super"),
+    "store_admin": Account("store_admin", "admin@pizza-express.com", "pizza123", "/admin/store", "pizza-express"),
+    "customer": Account("customer", "cliente@exemplo.com", "cliente123", "/storefront", "pizza-express"),
+    # Second tenant, for the data-isolation checks.
+    "burger_admin": Account("burger_admin", "admin@burger-king.com", "burger123", "/admin/store", "burger-king"),
+}
+
+# Keys cleared by logout() in src/auth/AuthContext.tsx before another role is applied.
+SESSION_KEYS = (
+    "deliverei_token",
+    "deliverei_refresh_token",
+    "deliverei_auth",
+    "deliverei_client_auth",
+    "deliverei_tenant_slug",
+    "deliverei_store_slug",
+    "deliverei_company_name",
+)
+
+
+class AuthStateError(RuntimeError):
+    """The backend refused or could not serve an out-of-band login."""
+
+
+def _account(role: str) -> Account:
+    try:
+        return ACCOUNTS[role]
+    except KeyError:
+        raise ValueError(f"unknown role {role!r}, expected one of {', '.join(ACCOUNTS)}") from None
+
+
+def state_path(role: str) -> Path:
+    return config.AUTH_STATE_DIR / f"{_account(role).role}.json"
+
+
+def landing_url(role: str) -> str:
+    return config.BASE_URL + _account(role).landing_path
+
+
+def _login(account: Account) -> dict:
+    body = json.dumps({"email": account.email, "senha": account.password}).encode("utf-8")
+    request = urllib.request.Request(
+        f"{config.API_URL}/auth/login",
+        data=body,
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+        method="POST",
+    )
+    if account.tenant_slug:
+        request.add_header("X-Tenant-Slug", account.tenant_slug)
+    try:
+        with urllib.request.urlopen(request, timeout=15) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as exc:
+        raise AuthStateError(f"login as {account.role} failed: HTTP {exc.code} {exc.reason}") from None
+    except (urllib.error.URLError, OSError) as exc:
+        raise AuthStateError(f"login as {account.role} failed: {config.API_URL} unreachable ({exc})") from None
+
+
+def _app_role(backend_role: Optional[str], has_empresa: bool) -> str:
+    # Same mapping as roleMap() in src/auth/AuthContext.tsx.
+    value = (backend_role or "").upper()
+    if "SUPER" in value:
+        return "superadmin"
+    if "ADMIN" in value:
+        return "empresa"
+    if "SUPORTE" in value:
+        return "suporte"
+    if "CLIENTE" in value:
+        return "cliente"
+    return "empresa" if has_empresa else "cliente"
+
+
+def build_local_storage(account: Account, login: dict) -> Dict[str, str]:
+    """localStorage entries the app would hold right after ``login``."""
+    # The real backend answers with ``user``; mock-backend with ``usuario``/``empresa``.
+    user = login.get("user") or login.get("usuario")
+    token = login.get("accessToken")
+    if not user or not token:
+        raise AuthStateError(f"login as {account.role} returned no user/accessToken")
+    empresa = login.get("empresa") or user.get("empresa") or {}
+    slug = empresa.get("slug") or account.tenant_slug
+    role = _app_role(user.get("role") or user.get("tipo"), bool(empresa))
+    now = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+    storage = {"deliverei_token": token}
+    if login.get("refreshToken"):
+        storage["deliverei_refresh_token"] = login["refreshToken"]
+    if slug:
+        storage["deliverei_tenant_slug"] = slug
+        storage["deliverei_store_slug"] = slug
+    if empresa.get("nome"):
+        storage["deliverei_company_name"] = empresa["nome"]
+    storage["deliverei_auth"] = json.dumps({
+        "isAuth": True,
+        "user": {
+            "id": user.get("id"),
+            "name": user.get("nome") or account.email.split("@")[0],
+            "email": account.email,
+            "role": role,
+            "empresaId": slug,
+            "lastLogin": now,
+        },
+        "token": token,
+    })
+    if role == "cliente":
+        # Storefront session (src/contexts/ClientAuthContext.tsx).
+        storage["deliverei_client_auth"] = json.dumps({
+            "isAuthenticated": True,
+            "cliente": {
+                "id": user.get("id"),
+                "nome": user.get("nome"),
+                "email": account.email,
+                "empresaId": user.get("empresaId"),
+            },
+            "token": token,
+        })
+    return storage
+
+
+def _is_fresh(path: Path, ttl: float) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime < ttl
+    except FileNotFoundError:
+        return False
+
+
+def ensure(role: str, ttl: float = config.AUTH_STATE_TTL_S, force: bool = False) -> Path:
+    """Return the storage-state file for ``role``, logging in if it is missing or stale."""
+    account = _account(role)
+    path = state_path(role)
+    if not force and _is_fresh(path, ttl):
+        return path
+
+    storage = build_local_storage(account, _login(account))
+    state = {
+        "cookies": [],
+        "origins": [{
+            "origin": config.BASE_URL,
+            "localStorage": [{"name": name, "value": value} for name, value in storage.items()],
+        }],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Several workers may refresh the same role at once; the last rename wins.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+async def storage_state(role: str) -> str:
+    """Async wrapper around :func:`ensure` for use inside ``run_test``."""
+    return str(await asyncio.to_thread(ensure, role))
+
+
+def local_storage(role: str) -> Dict[str, str]:
+    """The cached ``deliverei_*`` entries for ``role`` (tokens included)."""
+    state = json.loads(ensure(role).read_text(encoding="utf-8"))
+    return {item["name"]: item["value"] for origin in state["origins"] for item in origin["localStorage"]}
+
+
+async def sign_in(page, role: str, url: Optional[str] = None) -> None:
+    """Switch an open page to ``role`` mid-test, as logging out and back in would.
+
+    The page ends up on ``url`` or on the role's landing route.
+    """
+    entries = await asyncio.to_thread(local_storage, role)
+    if not page.url.startswith(config.BASE_URL):
+        # localStorage is per origin; get onto the app before touching it.
+        await page.goto(config.BASE_URL, wait_until="commit")
+    await page.evaluate(
+        """([stale, entries]) => {
+            for (const key of stale) localStorage.removeItem(key);
+            for (const [key, value] of Object.entries(entries)) localStorage.setItem(key, value);
+        }""",
+        [list(SESSION_KEYS), entries],
+    )
+    await page.goto(url or landing_url(role))
+
+
+def prepare(roles: Iterable[str] = ACCOUNTS) -> Dict[str, Optional[str]]:
+    """Log every role in up front; maps role -> error message (None when ready)."""
+    errors: Dict[str, Optional[str]] = {}
+    for role in roles:
+        try:
+            ensure(role)
+            errors[role] = None
+        except AuthStateError as exc:
+            errors[role] = str(exc)
+    return errors
@@ -0,0 +1,365 @@
+"""Per-endpoint micro-benchmarks with a regression gate.
+
+Times each backend endpoint on its own, one request at a time over a warm
+keep-alive connection, against a seeded dataset (``harness.seed_data``)::
+
+    python -m harness.bench                         # run, compare with the baseline, append to history
+    python -m harness.bench --save-baseline         # ... and make this run the new baseline
+    python -m harness.bench -k dashboard -n 200     # only the dashboard endpoints, 200 samples each
+
+Every run is appended to ``tmp/bench_history.json`` with its raw samples. A
+run is compared with the baseline endpoint by endpoint: it fails (exit code
+1) when an endpoint's p95 is more than ``--threshold`` slower *and* a
+one-sided Mann-Whitney U test says the slowdown is significant at
+``--alpha``, so noise on a quiet endpoint does not fail the build and a real
+regression cannot hide behind one lucky sample.
+
+Benchmarks log in as the store admin and a customer of ``--tenant``
+(``seed-00001`` accounts from ``seed_data``, or the ``auth_state`` accounts
+for the ``seed.ts`` stores).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from . import auth_state, config, seed_data
+from .api_client import ApiClient, ApiError
+from .loadgen import ENDERECO, percentile
+
+HISTORY_PATH = config.TMP_DIR / "bench_history.json"
+DEFAULT_TENANT = f"{seed_data.SLUG_PREFIX}00001"
+
+
+@dataclass
+class Context:
+    tenant: str
+    admin: ApiClient
+    customer: ApiClient
+    anonymous: ApiClient
+    admin_login: Tuple[str, str]
+    produto_id: Optional[str] = None
+
+
+class SampleFailed(Exception):
+    """The request succeeded but its answer cannot be used; the sample counts as an error."""
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    call: Callable[[Context], Awaitable[httpx.Response]]
+    # Untimed preparation before every sample (e.g. filling the cart for checkout).
+    setup: Optional[Callable[[Context], Awaitable[None]]] = None
+
+
+async def _get(client: ApiClient, path: str, **params) -> httpx.Response:
+    return await client.request("GET", path, params=params or None, expected=None)
+
+
+async def _login(ctx: Context) -> httpx.Response:
+    email, senha = ctx.admin_login
+    return await ctx.anonymous.request("POST", "/auth/login", json={"email": email, "senha": senha}, expected=None)
+
+
+async def _refresh(ctx: Context) -> httpx.Response:
+    response = await ctx.admin.request("POST", "/auth/refresh", json={"refreshToken": ctx.admin.refresh_token},
+                                       expected=None, refresh=False)
+    if response.is_success:
+        # Both backends rotate refresh tokens, and sending the old one again counts as reuse
+        # (the backend revokes the whole family), so every sample must store the new one.
+        refresh_token = response.json().get("refreshToken")
+        if not refresh_token:
+            raise SampleFailed("POST /auth/refresh answered without a refreshToken")
+        ctx.admin.refresh_token = refresh_token
+    return response
+
+
+async def _fill_cart(ctx: Context) -> None:
+    await ctx.customer.add_cart_item(ctx.produto_id, quantidade=1)
+
+
+async def _checkout(ctx: Context) -> httpx.Response:
+    body = {"enderecoEntrega": ENDERECO, "formaPagamento": "PIX"}
+    return await ctx.customer.request("POST", "/carrinho/checkout", json=body, expected=None)
+
+
+BENCHMARKS: Tuple[Benchmark, ...] = (
+    Benchmark("dashboard.estatisticas", lambda ctx: _get(ctx.admin, "/dashboard/estatisticas")),
+    Benchmark("dashboard.vendas", lambda ctx: _get(ctx.admin, "/dashboard/vendas", periodo="dia")),
+    Benchmark("dashboard.produtos-populares", lambda ctx: _get(ctx.admin, "/dashboard/produtos-populares", limit=10)),
+    Benchmark("pedidos.list", lambda ctx: _get(ctx.admin, "/pedidos", page=1, limit=20)),
+    Benchmark("produtos.search", lambda ctx: _get(ctx.admin, "/produtos", page=1, limit=20, search="Especial")),
+    Benchmark("public.produtos", lambda ctx: _get(ctx.anonymous, f"/public/{ctx.tenant}/produtos", page=1, limit=20)),
+    Benchmark("public.categorias", lambda ctx: _get(ctx.anonymous, f"/public/{ctx.tenant}/categorias")),
+    Benchmark("auth.login", _login),
+    Benchmark("auth.refresh", _refresh),
+    Benchmark("carrinho.checkout", _checkout, setup=_fill_cart),
+)
+
+
+# -- statistics ---------------------------------------------------------------
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """One-sided p-value that ``current`` tends to be larger than ``baseline``.
+
+    Normal approximation with tie correction; fine for the 20+ samples per
+    side the suite collects.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    ranked = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(ranked)
+    ties = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    r1 = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u1 - n1 * n2 / 2 - 0.5) / math.sqrt(variance)  # continuity correction
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def summarize(samples_ms: List[float], errors: int) -> dict:
+    return {
+        "samples_ms": [round(s, 3) for s in samples_ms],
+        "errors": errors,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, alpha: float) -> List[dict]:
+    """One row per endpoint present in both runs; ``regressed`` marks gate failures."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base["samples_ms"] or not result["samples_ms"]:
+            continue
+        change = (result["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        p_value = mann_whitney_greater(result["samples_ms"], base["samples_ms"])
+        rows.append({
+            "name": name,
+            "baseline_p95_ms": base["p95_ms"],
+            "p95_ms": result["p95_ms"],
+            "change": change,
+            "p_value": p_value,
+            "regressed": change > threshold and p_value < alpha,
+        })
+    return rows
+
+
+# -- history ------------------------------------------------------------------
+
+def load_history(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"baseline": None, "runs": []}
+
+
+def save_history(history: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(history, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def find_baseline(history: dict, ref: Optional[str]) -> Optional[dict]:
+    """The run named by ``ref`` (id or label), else the saved baseline, else the latest run."""
+    runs = history["runs"]
+    ref = ref or history.get("baseline")
+    if ref:
+        matches = [run for run in runs if ref in (run["id"], run.get("label"))]
+        return matches[-1] if matches else None
+    return runs[-1] if runs else None
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=config.SUITE_DIR, capture_output=True,
+                             text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# -- running ------------------------------------------------------------------
+
+def _accounts(tenant: str) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """(admin, customer) logins for ``tenant``."""
+    if tenant.startswith(seed_data.SLUG_PREFIX):
+        return ((f"admin@{tenant}.seed.test", seed_data.PASSWORD),
+                (f"cliente-1@{tenant}.seed.test", seed_data.PASSWORD))
+    accounts = [a for a in auth_state.ACCOUNTS.values() if a.tenant_slug == tenant]
+    admin = next((a for a in accounts if a.landing_path == "/admin/store"), None)
+    customer = next((a for a in accounts if a.landing_path == "/storefront"), admin)
+    if admin is None:
+        raise SystemExit(f"bench: no known admin account for {tenant}; seed one with harness.seed_data")
+    return (admin.email, admin.password), (customer.email, customer.password)
+
+
+async def _context(http: httpx.AsyncClient, tenant: str) -> Context:
+    admin_login, customer_login = _accounts(tenant)
+    admin = ApiClient(tenant_slug=tenant, http=http)
+    customer = ApiClient(tenant_slug=tenant, http=http)
+    await admin.login(*admin_login)
+    await customer.login(*customer_login)
+    admin.tenant_slug = customer.tenant_slug = tenant
+    ctx = Context(tenant, admin, customer, ApiClient(tenant_slug=tenant, http=http), admin_login)
+    catalog = await ctx.anonymous.public_produtos(tenant, limit=50)
+    # The most stocked product, so repeated checkouts do not run it out.
+    produtos = sorted(catalog.get("data") or [], key=lambda p: p.get("estoque") or 0, reverse=True)
+    ctx.produto_id = produtos[0]["id"] if produtos else None
+    await customer.clear_carrinho()
+    return ctx
+
+
+async def run_benchmark(ctx: Context, bench: Benchmark, iterations: int, warmup: int) -> dict:
+    samples: List[float] = []
+    errors = 0
+    for i in range(warmup + iterations):
+        if bench.setup:
+            await bench.setup(ctx)
+        started = time.perf_counter()
+        try:
+            ok = (await bench.call(ctx)).is_success
+        except SampleFailed as exc:
+            print(f"{bench.name}: {exc}", file=sys.stderr)
+            ok = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        if ok:
+            samples.append(elapsed_ms)
+        else:
+            errors += 1
+    return summarize(samples, errors)
+
+
+async def run_suite(benchmarks: Sequence[Benchmark], tenant: str, api_url: str, iterations: int,
+                    warmup: int) -> Dict[str, dict]:
+    # A single connection: the suite measures service time, not connection setup.
+    limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    async with httpx.AsyncClient(base_url=api_url.rstrip("/"), http1=True, http2=False, limits=limits, timeout=60,
+                                 headers={"Accept": "application/json"}) as http:
+        ctx = await _context(http, tenant)
+        results = {}
+        for bench in benchmarks:
+            if bench.setup is _fill_cart and ctx.produto_id is None:
+                print(f"{bench.name}: skipped, {tenant} has no products", file=sys.stderr)
+                continue
+            results[bench.name] = await run_benchmark(ctx, bench, iterations, warmup)
+            r = results[bench.name]
+            print(f"{bench.name:<30} p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f} ms"
+                  + (f"  {r['errors']} errors" if r["errors"] else ""), file=sys.stderr)
+        return results
+
+
+def format_comparison(rows: List[dict], baseline: dict) -> str:
+    lines = [f"compared with {baseline['id']} ({baseline.get('label') or baseline['timestamp']}):",
+             f"{'endpoint':<30} {'base p95':>9} {'p95':>9} {'change':>8} {'p':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        lines.append(f"{row['name']:<30} {row['baseline_p95_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                     f"{row['change'] * 100:>+7.1f}% {row['p_value']:>8.4f}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="only benchmarks whose name contains this (repeatable)")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="timed samples per endpoint (default: 50)")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests first (default: 5)")
+    parser.add_argument("--tenant", default=DEFAULT_TENANT, help=f"store to benchmark (default: {DEFAULT_TENANT})")
+    parser.add_argument("--api-url", default=config.API_URL, help=f"API base URL (default: {config.API_URL})")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH,
+                        help="history file (default: tmp/bench_history.json)")
+    parser.add_argument("--baseline", help="run id or label to compare with (default: saved baseline or last run)")
+    parser.add_argument("--label", help="name this run, e.g. a branch or change description")
+    parser.add_argument("--save-baseline", action="store_true", help="make this run the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p95 slowdown (default: 0.10 = 10%%)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level (default: 0.01)")
+    parser.add_argument("--no-save", action="store_true", help="do not append this run to the history")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in BENCHMARKS if not args.patterns or any(p in b.name for p in args.patterns)]
+    if args.list:
+        print("\n".join(b.name for b in benchmarks))
+        return 0
+    if not benchmarks:
+        parser.error("no benchmark matches the -k filters")
+    if args.iterations < 2:
+        parser.error("--iterations must be at least 2")
+
+    try:
+        results = asyncio.run(run_suite(benchmarks, args.tenant, args.api_url, args.iterations, args.warmup))
+    except (ApiError, httpx.HTTPError) as exc:
+        print(f"bench: setup failed: {exc}", file=sys.stderr)
+        return 2
+
+    run = {
+        "id": uuid.uuid4().hex[:12],
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": args.label,
+        "git": _git_revision(),
+        "api_url": args.api_url,
+        "tenant": args.tenant,
+        "iterations": args.iterations,
+        "results": results,
+    }
+    history = load_history(args.history)
+    baseline = find_baseline(history, args.baseline)
+    status = 0
+    if baseline is None:
+        print("no baseline yet; this run will serve as one")
+    else:
+        rows = compare(run, baseline, args.threshold, args.alpha)
+        print(format_comparison(rows, baseline))
+        regressed = [row["name"] for row in rows if row["regressed"]]
+        if regressed:
+            print(f"p95 regressed beyond {args.threshold:.0%} (p < {args.alpha}): {', '.join(regressed)}")
+            status = 1
+    if any(r["errors"] for r in results.values()):
+        print("some requests failed; see the errors above")
+        status = status or 1
+
+    if not args.no_save:
+        history["runs"].append(run)
+        if args.save_baseline or history.get("baseline") is None:
+            history["baseline"] = run["id"]
+        save_history(history, args.history)
+        print(f"run {run['id']} saved to {args.history}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
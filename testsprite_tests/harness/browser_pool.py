@@ -0,0 +1,184 @@
+"""Shared Chromium pool handing out one isolated ``BrowserContext`` per test.
+
+Launching Chromium costs seconds; creating a context on a running browser
+costs milliseconds while still giving each test its own cookies, storage and
+cache. The pool keeps ``size`` browsers per process, warms them up once and
+relaunches a browser after it has served ``recycle_after`` contexts so
+renderer memory cannot grow without bound over a long run.
+
+Usage inside a test::
+
+    context = await browser_pool.get_pool().new_context()
+    try:
+        page = await context.new_page()
+        ...
+    finally:
+        await browser_pool.get_pool().release(context)
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from . import readiness, tracing
+
+# No --single-process: many contexts share one browser, and a crashing
+# renderer must not take the whole pool down with it.
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+POOL_BROWSERS = int(os.environ.get("DELIVEREI_POOL_BROWSERS", "1"))
+POOL_RECYCLE_AFTER = int(os.environ.get("DELIVEREI_POOL_RECYCLE", "25"))
+HEADLESS = os.environ.get("DELIVEREI_HEADLESS", "1") != "0"
+
+
+class _Slot:
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.active = 0
+        self.served = 0
+
+
+class BrowserPool:
+    def __init__(self, size: int = POOL_BROWSERS, recycle_after: int = POOL_RECYCLE_AFTER,
+                 headless: bool = HEADLESS, launch_args: Optional[List[str]] = None):
+        self.size = max(1, size)
+        self.recycle_after = max(1, recycle_after)
+        self.headless = headless
+        self.launch_args = list(launch_args or LAUNCH_ARGS)
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[_Slot] = []
+        self._owners: Dict[BrowserContext, _Slot] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def playwright(self) -> Playwright:
+        if self._playwright is None:
+            raise RuntimeError("browser pool is not started")
+        return self._playwright
+
+    async def _launch(self) -> Browser:
+        return await self.playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            while len(self._slots) < self.size:
+                self._slots.append(_Slot(await self._launch()))
+
+    async def warm_up(self) -> None:
+        """Launch every browser and render one blank page in each."""
+        await self.start()
+        for slot in list(self._slots):
+            context = await slot.browser.new_context()
+            page = await context.new_page()
+            await page.goto("about:blank")
+            await context.close()
+
+    async def new_context(self, **options) -> BrowserContext:
+        """Create a fresh context on the least busy browser."""
+        await self.start()
+        async with self._lock:
+            healthy = [s for s in self._slots if s.served < self.recycle_after and s.browser.is_connected()]
+            slot = min(healthy or self._slots, key=lambda s: s.active)
+            if not slot.browser.is_connected():
+                slot.browser = await self._launch()
+            slot.active += 1
+        try:
+            context = await slot.browser.new_context(**options)
+        except Exception:
+            slot.active -= 1
+            raise
+        self._owners[context] = slot
+        readiness.track(context)
+        if tracing.enabled():
+            await tracing.attach(context, slot.browser)
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Close ``context`` and recycle its browser if it has served enough tests."""
+        slot = self._owners.pop(context, None)
+        if tracing.enabled():
+            try:
+                await tracing.detach(context)
+            except Exception as exc:  # noqa: BLE001 - a broken trace must not fail the test
+                print(f"trace capture failed: {exc}", file=sys.stderr)
+        try:
+            await context.close()
+        except Exception:  # noqa: BLE001 - the browser may already be gone
+            pass
+        if slot is None:
+            return
+        async with self._lock:
+            slot.active -= 1
+            slot.served += 1
+            if slot.served >= self.recycle_after and slot.active == 0:
+                old = slot.browser
+                slot.browser = await self._launch()
+                slot.served = 0
+                await old.close()
+
+    @asynccontextmanager
+    async def context(self, **options):
+        context = await self.new_context(**options)
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    async def close(self) -> None:
+        async with self._lock:
+            for context in list(self._owners):
+                try:
+                    await context.close()
+                except Exception:  # noqa: BLE001
+                    pass
+            self._owners.clear()
+            for slot in self._slots:
+                await slot.browser.close()
+            self._slots.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+_pool: Optional[BrowserPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_pool() -> BrowserPool:
+    """Return the pool bound to the running event loop, creating it on first use."""
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        _pool, _pool_loop = BrowserPool(), loop
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool, _pool_loop
+    if _pool is not None:
+        await _pool.close()
+    _pool, _pool_loop = None, None
+
+
+async def _standalone(run_test) -> None:
+    try:
+        await run_test()
+    finally:
+        await close_pool()
+        api_client = sys.modules.get(f"{__package__}.api_client")
+        if api_client is not None:
+            await api_client.close_http()
+
+
+def main(run_test) -> None:
+    """Entry point for running a single TC script directly with ``python``."""
+    asyncio.run(_standalone(run_test))
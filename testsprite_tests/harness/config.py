@@ -0,0 +1,36 @@
+"""Shared settings for the local TestSprite harness.
+
+Every value can be overridden through environment variables so the same
+suite runs against a dev preview, a CI preview or a remote environment.
+"""
+
+import os
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+TMP_DIR = SUITE_DIR / "tmp"
+RESULTS_PATH = TMP_DIR / "test_results.json"
+TEST_PLAN_PATH = SUITE_DIR / "testsprite_frontend_test_plan.json"
+
+# Frontend preview served by `vite preview` (the generated scripts use 4173).
+BASE_URL = os.environ.get("DELIVEREI_BASE_URL", "http://localhost:4173").rstrip("/")
+
+# Default per-test budget; generated scripts regularly take ~1-2 minutes.
+TEST_TIMEOUT_S = float(os.environ.get("DELIVEREI_TEST_TIMEOUT", "300"))
+
+# Backend API used for out-of-band logins (the app's own default, see src/services/apiClient.ts).
+API_URL = os.environ.get("DELIVEREI_API_URL", "http://localhost:3002/api").rstrip("/")
+
+# Cached login sessions live here; they must expire before the 15m access token does.
+AUTH_STATE_DIR = TMP_DIR / "auth"
+AUTH_STATE_TTL_S = float(os.environ.get("DELIVEREI_AUTH_TTL", "600"))
+
+# How long a page object waits for an element before failing the step; kept
+# well below the action timeouts so a broken locator is reported quickly.
+FIND_TIMEOUT_MS = float(os.environ.get("DELIVEREI_FIND_TIMEOUT_MS", "2000"))
+
+# Optional per-test performance capture (Chromium trace, network waterfall,
+# Web Vitals, JS heap); `python -m harness --trace` turns it on for the workers.
+TRACE_ENABLED = os.environ.get("DELIVEREI_TRACE", "0") == "1"
+TRACE_DIR = TMP_DIR / "traces"
+REPORT_PATH = SUITE_DIR / "testsprite-mcp-test-report.md"
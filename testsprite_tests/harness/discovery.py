@@ -0,0 +1,95 @@
+"""Discovery of the generated ``TC0xx_*.py`` scripts.
+
+Each script defines an ``async def run_test()`` and ends with a bare
+``asyncio.run(run_test())``. Importing a script would therefore execute it,
+so the loader parses the source, drops module-level ``asyncio.run(...)``
+statements and executes the remainder in a fresh module namespace.
+"""
+
+import ast
+import asyncio
+import json
+import re
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from . import config
+
+TEST_FILE_PATTERN = re.compile(r"^(TC\d{3})_(.+)\.py$")
+
+
+@dataclass(frozen=True)
+class TestCase:
+    test_id: str
+    path: Path
+    title: str
+    description: str = ""
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+
+def _title_from_stem(test_id: str, rest: str) -> str:
+    # "Products_CRUD___Create_Product" -> "Products CRUD - Create Product"
+    return f"{test_id}-" + rest.replace("___", " - ").replace("_", " ")
+
+
+def _load_descriptions() -> Dict[str, str]:
+    """Map ``"TC001-Title"`` to the description from the TestSprite test plan."""
+    try:
+        plan = json.loads(config.TEST_PLAN_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {f"{item['id']}-{item['title']}": item.get("description", "") for item in plan}
+
+
+def discover(suite_dir: Optional[Path] = None, select: Optional[List[str]] = None) -> List[TestCase]:
+    """Return every test case in ``suite_dir`` sorted by file name.
+
+    ``select`` keeps only cases whose id or file name contains one of the
+    given substrings (case-insensitive), e.g. ``["TC005", "dashboard"]``.
+    """
+    suite_dir = suite_dir or config.SUITE_DIR
+    descriptions = _load_descriptions()
+    needles = [s.lower() for s in select or []]
+
+    cases = []
+    for path in sorted(suite_dir.glob("TC*.py")):
+        match = TEST_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        if needles and not any(n in path.stem.lower() for n in needles):
+            continue
+        test_id, rest = match.groups()
+        title = _title_from_stem(test_id, rest)
+        cases.append(TestCase(test_id, path, title, descriptions.get(title, "")))
+    return cases
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    """True for a top-level ``asyncio.run(...)`` / ``run(...)`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    if isinstance(func, ast.Attribute):
+        return func.attr == "run" and isinstance(func.value, ast.Name) and func.value.id == "asyncio"
+    return isinstance(func, ast.Name) and func.id == "run"
+
+
+def load_run_test(path: Path) -> Callable[[], Awaitable[None]]:
+    """Load ``run_test`` from a generated script without running the script."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+
+    module = types.ModuleType(f"testsprite_case_{path.stem}")
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+
+    run_test = module.__dict__.get("run_test")
+    if run_test is None or not asyncio.iscoroutinefunction(run_test):
+        raise ValueError(f"{path.name} does not define an async run_test()")
+    return run_test
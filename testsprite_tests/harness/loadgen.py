@@ -0,0 +1,344 @@
+"""Open-model load generator for the storefront and checkout hot path.
+
+Replays customer journeys against the API at a target request rate::
+
+    python -m harness.loadgen --rps 40 --duration 60
+    python -m harness.loadgen --rps 200 --duration 300 --tenants @tmp/tenants.txt --customers 50
+    python -m harness.loadgen --api-url http://localhost:3003/api   # mock-backend
+
+A journey browses the catalog of one store and, with probability
+``--checkout-ratio``, buys from it::
+
+    GET  /public/:slug/produtos
+    GET  /public/:slug/categorias
+    POST /carrinho/itens          (1-3 times)
+    POST /carrinho/checkout
+
+Journeys arrive as a Poisson process (exponential gaps from a seeded RNG),
+independent of how fast earlier ones complete, so a slow backend accumulates
+work the way a lunch rush does instead of being politely waited on. Arrivals
+past ``--max-inflight`` concurrent journeys are counted as dropped rather
+than delayed.
+
+Each store gets ``--customers`` virtual customers
+(``loadgen-<n>@<slug>.loadgen.test``), created through ``/auth/signup`` on
+first use (a 409 means an earlier run created it). Setup never logs in with
+a password that may be wrong: failed logins count against the backend's
+per-IP login limit. A 429 from the login limit or the password hashing
+pool is waited out (``retryAfter``) and retried, and at most
+``PROVISION_CONCURRENCY`` stores are set up at once. A customer runs one
+journey at a time, since journeys of the same user would share one cart.
+Against mock-backend, which has no signup, the seeded ``auth_state``
+accounts of the store are used instead.
+
+The report gives count, error rate, p50/p95/p99 latency and throughput per
+endpoint; ``-o`` also writes it as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from . import auth_state, config
+from .api_client import ApiClient, ApiError
+
+CUSTOMER_PASSWORD = "loadgen123"
+PROVISION_CONCURRENCY = 4
+BUSY_RETRIES = 5
+ENDERECO = {"rua": "Rua da Carga", "numero": "100", "bairro": "Centro", "cidade": "São Paulo", "estado": "SP",
+            "cep": "01000-000"}
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def summary(self, elapsed_s: float) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.error_count,
+            "error_rate": self.error_count / self.count if self.count else 0.0,
+            "error_kinds": dict(self.errors),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 2),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 2),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 2),
+            "throughput_rps": round(self.count / elapsed_s, 2) if elapsed_s else 0.0,
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def record(self, endpoint: str, latency_ms: float, error: Optional[str]) -> None:
+        stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        stats.latencies_ms.append(latency_ms)
+        if error:
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+
+
+class LoadgenError(RuntimeError):
+    """The run could not be set up (unknown store, no usable customer)."""
+
+
+class Customer:
+    def __init__(self, client: ApiClient, label: str):
+        self.client = client
+        self.label = label
+
+
+@dataclass
+class Store:
+    slug: str
+    empresa_id: Optional[str] = None
+    customers: "asyncio.Queue[Customer]" = field(default_factory=asyncio.Queue)
+
+
+class LoadGenerator:
+    def __init__(self, http: httpx.AsyncClient, stores: List[Store], rps: float, duration_s: float,
+                 checkout_ratio: float = 0.3, max_inflight: int = 1000, seed: int = 1):
+        self.http = http
+        self.stores = stores
+        self.checkout_ratio = checkout_ratio
+        self.duration_s = duration_s
+        self.max_inflight = max_inflight
+        self.rng = random.Random(seed)
+        self.recorder = Recorder()
+        # Requests per journey on average: two catalog calls, plus 1-3 items and a checkout when buying.
+        self.journey_rate = rps / (2 + checkout_ratio * (2 + 1))
+        self.journeys = 0
+        self.dropped = 0
+        self.customer_waits = 0
+        self._inflight: set = set()
+
+    async def call(self, client: ApiClient, endpoint: str, method: str, path: str,
+                   **kwargs) -> Optional[httpx.Response]:
+        """One timed request; ``endpoint`` is the route template used for grouping."""
+        started = time.perf_counter()
+        response, error = None, None
+        try:
+            response = await client.request(method, path, expected=None, **kwargs)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except ApiError as exc:  # a failed token refresh
+            error = f"HTTP {exc.status}"
+        except httpx.HTTPError as exc:
+            error = type(exc).__name__
+        self.recorder.record(endpoint, (time.perf_counter() - started) * 1000, error)
+        return None if error else response
+
+    async def journey(self, store: Store, buys: bool, rng: random.Random) -> None:
+        anonymous = ApiClient(tenant_slug=store.slug, http=self.http)
+        produtos = await self.call(anonymous, "GET /public/:slug/produtos", "GET", f"/public/{store.slug}/produtos",
+                                   params={"page": 1, "limit": 20})
+        await self.call(anonymous, "GET /public/:slug/categorias", "GET", f"/public/{store.slug}/categorias")
+        if not buys or produtos is None:
+            return
+        try:
+            catalog = [p for p in produtos.json().get("data") or [] if p.get("id")]
+        except (ValueError, AttributeError):
+            catalog = []
+        if not catalog:
+            return
+
+        if store.customers.empty():
+            self.customer_waits += 1
+        customer = await store.customers.get()
+        try:
+            for produto in rng.sample(catalog, min(len(catalog), rng.randint(1, 3))):
+                await self.call(customer.client, "POST /carrinho/itens", "POST", "/carrinho/itens",
+                                json={"produtoId": produto["id"], "quantidade": rng.randint(1, 2)})
+            await self.call(customer.client, "POST /carrinho/checkout", "POST", "/carrinho/checkout",
+                            json={"enderecoEntrega": ENDERECO, "formaPagamento": "PIX"})
+        finally:
+            store.customers.put_nowait(customer)
+
+    def _launch(self) -> None:
+        if len(self._inflight) >= self.max_inflight:
+            self.dropped += 1
+            return
+        # Each journey draws from its own RNG so the plan does not depend on completion order.
+        rng = random.Random(self.rng.getrandbits(64))
+        task = asyncio.create_task(self.journey(rng.choice(self.stores), rng.random() < self.checkout_ratio, rng))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        self.journeys += 1
+
+    async def run(self) -> float:
+        """Generate arrivals for ``duration_s``, wait for stragglers, return the elapsed time."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.duration_s
+        next_at = started
+        while True:
+            next_at += self.rng.expovariate(self.journey_rate)
+            if next_at >= deadline:
+                break
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+            self._launch()
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        return loop.time() - started
+
+    def report(self, elapsed_s: float) -> dict:
+        endpoints = {name: stats.summary(elapsed_s) for name, stats in sorted(self.recorder.endpoints.items())}
+        total = sum(e["count"] for e in endpoints.values())
+        return {
+            "elapsed_s": round(elapsed_s, 2),
+            "journeys": self.journeys,
+            "dropped_journeys": self.dropped,
+            "customer_waits": self.customer_waits,
+            "requests": total,
+            "throughput_rps": round(total / elapsed_s, 2) if elapsed_s else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+async def _unless_busy(call):
+    """Await ``call()``, waiting out 429 answers as the body's ``retryAfter`` (seconds) asks."""
+    for attempt in range(BUSY_RETRIES):
+        try:
+            return await call()
+        except ApiError as exc:
+            if exc.status != 429 or attempt == BUSY_RETRIES - 1:
+                raise
+            retry_after = exc.body.get("retryAfter") if isinstance(exc.body, dict) else None
+            await asyncio.sleep(float(retry_after or 2 ** attempt))
+
+
+async def _provision_store(http: httpx.AsyncClient, slug: str, customers: int) -> Store:
+    store = Store(slug)
+    info = await ApiClient(tenant_slug=slug, http=http).loja_info(slug)
+    store.empresa_id = info.get("id")
+    for n in range(customers):
+        email = f"loadgen-{n}@{slug}.loadgen.test"
+        client = ApiClient(tenant_slug=slug, http=http)
+        try:
+            await _unless_busy(lambda: client.signup(f"Cliente Carga {n}", email, CUSTOMER_PASSWORD,
+                                                     store.empresa_id))
+        except ApiError as exc:
+            if exc.status == 404:
+                break  # No signup route: mock-backend.
+            if exc.status != 409:
+                raise
+        await _unless_busy(lambda: client.login(email, CUSTOMER_PASSWORD))
+        client.tenant_slug = slug
+        store.customers.put_nowait(Customer(client, email))
+
+    if store.customers.empty():
+        for account in auth_state.ACCOUNTS.values():
+            if account.tenant_slug == slug:
+                client = ApiClient(tenant_slug=slug, http=http)
+                await _unless_busy(lambda: client.login(account.email, account.password))
+                client.tenant_slug = slug
+                store.customers.put_nowait(Customer(client, account.email))
+    if store.customers.empty():
+        raise LoadgenError(f"no customer account could sign in to {slug}")
+    return store
+
+
+async def provision(http: httpx.AsyncClient, slugs: Sequence[str], customers: int) -> List[Store]:
+    """Look up every store and sign its virtual customers in, ``PROVISION_CONCURRENCY`` stores at a time."""
+    slots = asyncio.Semaphore(PROVISION_CONCURRENCY)
+
+    async def one(slug: str) -> Store:
+        async with slots:
+            return await _provision_store(http, slug, customers)
+
+    return list(await asyncio.gather(*(one(slug) for slug in slugs)))
+
+
+def _read_tenants(value: Optional[str]) -> List[str]:
+    if not value:
+        return sorted({a.tenant_slug for a in auth_state.ACCOUNTS.values() if a.tenant_slug})
+    if value.startswith("@"):
+        lines = Path(value[1:]).read_text(encoding="utf-8").splitlines()
+        return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    return [slug.strip() for slug in value.split(",") if slug.strip()]
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'endpoint':<30} {'count':>7} {'err%':>6} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'rps':>7}"]
+    for name, e in report["endpoints"].items():
+        lines.append(f"{name:<30} {e['count']:>7} {e['error_rate'] * 100:>6.2f} {e['p50_ms']:>8.1f} "
+                     f"{e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f} {e['throughput_rps']:>7.1f}")
+    lines.append(f"{report['requests']} requests, {report['journeys']} journeys in {report['elapsed_s']}s "
+                 f"({report['throughput_rps']} req/s); {report['dropped_journeys']} dropped, "
+                 f"{report['customer_waits']} waited for a free customer")
+    return "\n".join(lines)
+
+
+async def _main(args) -> dict:
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.api_url.rstrip("/"), http1=True, http2=False, limits=limits,
+                                 timeout=args.timeout, headers={"Accept": "application/json"}) as http:
+        stores = await provision(http, _read_tenants(args.tenants), args.customers)
+        generator = LoadGenerator(http, stores, args.rps, args.duration, args.checkout_ratio,
+                                  args.max_inflight, args.seed)
+        return generator.report(await generator.run())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.loadgen", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rps", type=float, default=20.0, help="target requests per second (default: 20)")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of arrivals (default: 60)")
+    parser.add_argument("--tenants", help="comma-separated store slugs or @file (default: the seeded stores)")
+    parser.add_argument("--customers", type=int, default=10, help="virtual customers per store (default: 10)")
+    parser.add_argument("--checkout-ratio", type=float, default=0.3, help="share of journeys that buy (default: 0.3)")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="drop arrivals beyond this many open journeys")
+    parser.add_argument("--connections", type=int, default=200, help="HTTP keep-alive pool size (default: 200)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds (default: 30)")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed for arrivals and journeys (default: 1)")
+    parser.add_argument("--api-url", default=config.API_URL, help=f"API base URL (default: {config.API_URL})")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="exit non-zero when the overall error rate exceeds this fraction")
+    parser.add_argument("-o", "--output", type=Path, help="also write the report as JSON here")
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    try:
+        report = asyncio.run(_main(args))
+    except (ApiError, LoadgenError, httpx.HTTPError) as exc:
+        print(f"loadgen: setup failed: {exc}", file=sys.stderr)
+        return 2
+    print(format_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    errors = sum(e["errors"] for e in report["endpoints"].values())
+    if args.max_error_rate is not None and report["requests"] and errors / report["requests"] > args.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
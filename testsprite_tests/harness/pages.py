@@ -0,0 +1,235 @@
+"""Page objects for the screens the generated scripts drive.
+
+The generated steps locate elements through absolute XPaths recorded from one
+particular DOM (``html/body/div/div/div/div/form/div[2]/input``). Any layout
+change breaks them, and a missing element only surfaces after the full
+action timeout. These objects locate by test id (``data-testid`` attributes
+in ``src/``), ARIA role and accessible name instead, and check that the
+element is there within ``DELIVEREI_FIND_TIMEOUT_MS`` before acting, so a
+broken step fails quickly with a message naming the element and the URL::
+
+    await pages.LoginForm(page).login("admin@pizza-express.com", "pizza123")
+    await pages.AdminSidebar(page).open("Produtos")
+    await pages.Cart(page).add_product("Marmita Fitness 1")
+    await pages.Table(page).click_row_button("Pizza Express", "Ver detalhes")
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from playwright.async_api import Locator, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from . import config, readiness
+
+ACTION_TIMEOUT_MS = 5000
+
+
+class ElementNotFound(AssertionError):
+    """A page object could not find the element a step needs."""
+
+
+class PageObject:
+    title = "Page"
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    async def find(self, locator: Locator, what: str, state: str = "visible") -> Locator:
+        target = locator.first
+        try:
+            await target.wait_for(state=state, timeout=config.FIND_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            count = await locator.count()
+            problem = f"matched {count} element(s) but none {state}" if count else "not found"
+            raise ElementNotFound(f"{self.title}: {what} {problem} on {self.page.url}") from None
+        return target
+
+    async def click(self, locator: Locator, what: str) -> None:
+        await (await self.find(locator, what)).click(timeout=ACTION_TIMEOUT_MS)
+
+    async def fill(self, locator: Locator, what: str, value: str) -> None:
+        await (await self.find(locator, what)).fill(value, timeout=ACTION_TIMEOUT_MS)
+
+
+class LoginForm(PageObject):
+    """``/login``, ``/login-backend`` and the storefront ``/loja/:slug/login`` forms."""
+
+    title = "Login form"
+
+    @property
+    def email(self) -> Locator:
+        return self.page.get_by_test_id("login-email")
+
+    @property
+    def password(self) -> Locator:
+        return self.page.get_by_test_id("login-password")
+
+    @property
+    def submit_button(self) -> Locator:
+        return self.page.get_by_test_id("login-submit")
+
+    async def open(self) -> None:
+        """Click the 'Entrar' button in the public or storefront header."""
+        await self.click(self.page.get_by_test_id("header-login"), "'Entrar' header button")
+
+    async def fill_email(self, value: str) -> None:
+        await self.fill(self.email, "e-mail field", value)
+
+    async def fill_password(self, value: str) -> None:
+        await self.fill(self.password, "password field", value)
+
+    async def submit(self) -> None:
+        await self.click(self.submit_button, "'Entrar' submit button")
+
+    async def login(self, email: str, password: str) -> None:
+        await self.fill_email(email)
+        await self.fill_password(password)
+        await self.submit()
+
+
+class AdminSidebar(PageObject):
+    """Left navigation of the store and super admin panels."""
+
+    title = "Admin sidebar"
+
+    STORE_LINKS = ("Dashboard", "Produtos", "Pedidos", "Clientes", "Configurações")
+    SUPER_ADMIN_LINKS = ("Dashboard", "Empresas", "Assinaturas", "Tickets", "Configurações")
+
+    @property
+    def nav(self) -> Locator:
+        return self.page.get_by_test_id("admin-sidebar")
+
+    def link(self, label: str) -> Locator:
+        return self.nav.get_by_role("link", name=label, exact=True)
+
+    async def open(self, label: str) -> None:
+        await self.click(self.link(label), f"'{label}' link")
+
+    async def labels(self) -> List[str]:
+        await self.find(self.nav, "navigation")
+        return [text.strip() for text in await self.nav.get_by_role("link").all_inner_texts()]
+
+
+class ProductForm(PageObject):
+    """Create/edit product form (``src/components/products/ProductForm.tsx``)."""
+
+    title = "Product form"
+
+    def field(self, name: str) -> Locator:
+        return self.page.get_by_test_id(f"product-{name}")
+
+    async def fill_form(self, nome: Optional[str] = None, preco: Optional[str] = None,
+                        estoque: Optional[int] = None, descricao: Optional[str] = None,
+                        categoria: Optional[str] = None, ativo: Optional[bool] = None) -> None:
+        """Fill the given fields; ``preco`` is typed as the user would (``"29,90"``)."""
+        if nome is not None:
+            await self.fill(self.field("name"), "name field", nome)
+        if descricao is not None:
+            await self.fill(self.field("description"), "description field", descricao)
+        if preco is not None:
+            await self.fill(self.field("price"), "price field", preco)
+        if estoque is not None:
+            await self.fill(self.field("stock"), "stock field", str(estoque))
+        if categoria is not None:
+            select = await self.find(self.field("category"), "category select")
+            await select.select_option(categoria, timeout=ACTION_TIMEOUT_MS)
+        if ativo is not None:
+            checkbox = await self.find(self.field("active"), "'Disponível para venda' checkbox")
+            await checkbox.set_checked(ativo, timeout=ACTION_TIMEOUT_MS)
+
+    async def submit(self) -> None:
+        await self.click(self.field("submit"), "submit button")
+
+
+class Cart(PageObject):
+    """Storefront product grid, cart drawer and its upsell suggestions."""
+
+    title = "Cart"
+
+    @property
+    def drawer(self) -> Locator:
+        return self.page.get_by_test_id("cart-drawer")
+
+    @property
+    def items(self) -> Locator:
+        return self.drawer.get_by_test_id("cart-item")
+
+    async def open(self) -> None:
+        await self.click(self.page.get_by_role("button", name="Carrinho", exact=True), "'Carrinho' header button")
+
+    async def add_product(self, name: Optional[str] = None) -> None:
+        """Click 'Adicionar' on the product card named ``name`` (the first card when None)."""
+        cards = self.page.get_by_test_id("product-card")
+        if name:
+            cards = cards.filter(has=self.page.get_by_role("heading", name=name, exact=True))
+        what = f"'Adicionar' on product '{name}'" if name else "'Adicionar' on the first product"
+        await self.click(cards.first.get_by_role("button", name="Adicionar"), what)
+
+    async def add_suggestion(self, name: Optional[str] = None) -> None:
+        suggestions = self.drawer.get_by_test_id("upsell-item")
+        if name:
+            suggestions = suggestions.filter(has_text=name)
+        what = f"'Adicionar' on suggestion '{name}'" if name else "'Adicionar' on the first suggestion"
+        await self.click(suggestions.first.get_by_role("button", name="Adicionar"), what)
+
+    def _quantity_button(self, action: str, name: Optional[str]) -> Locator:
+        label = f"{action} quantidade de {name}" if name else re.compile(f"^{action} quantidade de ")
+        return self.drawer.get_by_role("button", name=label, exact=bool(name))
+
+    async def increase(self, name: Optional[str] = None) -> None:
+        await self.click(self._quantity_button("Aumentar", name), f"'+' for {name or 'the first item'}")
+
+    async def decrease(self, name: Optional[str] = None) -> None:
+        await self.click(self._quantity_button("Diminuir", name), f"'-' for {name or 'the first item'}")
+
+    async def item_count(self) -> int:
+        return await self.items.count()
+
+    async def subtotal(self) -> str:
+        return (await (await self.find(self.drawer.get_by_test_id("cart-subtotal"), "subtotal")).inner_text()).strip()
+
+    async def checkout(self) -> None:
+        await self.click(self.drawer.get_by_test_id("cart-checkout"), "checkout button")
+
+
+class Table(PageObject):
+    """Admin list tables (companies, orders): rows by content, buttons by name."""
+
+    title = "Table"
+
+    def row(self, text: str) -> Locator:
+        return self.page.get_by_role("row").filter(has_text=text)
+
+    async def click_row_button(self, row_text: str, button: str) -> None:
+        await self.click(self.row(row_text).get_by_role("button", name=button, exact=True),
+                         f"'{button}' in the row containing '{row_text}'")
+
+
+class Dashboard(PageObject):
+    """Store admin dashboard (``/admin/store``)."""
+
+    title = "Dashboard"
+
+    async def open(self, url: str) -> None:
+        """Navigate to ``url`` and wait for the statistics request it triggers."""
+        async with readiness.expect_api(self.page, "/dashboard/estatisticas"):
+            await self.page.goto(url, wait_until="commit", timeout=10000)
+
+    @property
+    def sales_chart(self) -> Locator:
+        return self.page.get_by_test_id("dashboard-sales")
+
+    @property
+    def recent_orders(self) -> Locator:
+        return self.page.get_by_test_id("dashboard-recent-orders")
+
+    async def stats(self) -> Dict[str, str]:
+        """Stat cards as ``{label: value}``, e.g. ``{"Pedidos": "12", ...}``."""
+        cards = self.page.get_by_test_id("dashboard-stat")
+        await self.find(cards, "statistics cards")
+        stats = {}
+        for text in await cards.all_inner_texts():
+            label, _, value = text.strip().partition("\n")
+            stats[label.strip()] = value.strip()
+        return stats
@@ -0,0 +1,144 @@
+"""Event-driven readiness waits for the generated scripts.
+
+The generated steps used to sleep a fixed 3s before every interaction and
+after every navigation. That is both slow (most steps are ready within a few
+hundred milliseconds) and flaky (a slow backend can take longer). These
+helpers wait for the thing the next step actually depends on instead:
+
+* :func:`settle` -- the document is loaded and the app's API traffic has gone
+  quiet. Used before every interaction in place of the old sleep.
+* :func:`expect_api` / :func:`wait_for_api` -- a specific backend response,
+  e.g. ``/dashboard/estatisticas``.
+* :func:`wait_for_app_idle` -- no request to the backend API in flight for
+  ``quiet_ms``. Only XHR/fetch calls the app's axios client makes to
+  ``DELIVEREI_API_URL`` (or any ``/api/`` path) count, so analytics beacons,
+  fonts and HMR sockets cannot keep a page "busy" forever.
+* :func:`wait_for_locator` -- a locator reaching a state.
+
+API traffic is tracked per ``BrowserContext``; ``browser_pool`` starts
+tracking every context it creates, so requests fired before the first wait
+are not missed. With tracing on (``harness.tracing``), :func:`settle` also
+records the page's vitals and JS heap as one step.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Locator, Page, Request, Response
+
+from . import config, tracing
+
+QUIET_MS = 200
+IDLE_TIMEOUT_MS = 10_000
+API_TIMEOUT_MS = 15_000
+
+_API_PREFIX = config.API_URL + "/"
+
+
+def is_api_url(url: str) -> bool:
+    return url.startswith(_API_PREFIX) or urlparse(url).path.startswith("/api/")
+
+
+def _is_app_request(request: Request) -> bool:
+    return request.resource_type in ("xhr", "fetch") and is_api_url(request.url)
+
+
+class _ApiTracker:
+    def __init__(self, context: BrowserContext):
+        self.inflight: Set[Request] = set()
+        self.last_activity = asyncio.get_running_loop().time()
+        self._changed = asyncio.Event()
+        context.on("request", self._started)
+        context.on("requestfinished", self._done)
+        context.on("requestfailed", self._done)
+
+    def _touch(self) -> None:
+        self.last_activity = asyncio.get_running_loop().time()
+        self._changed.set()
+
+    def _started(self, request: Request) -> None:
+        if _is_app_request(request):
+            self.inflight.add(request)
+            self._touch()
+
+    def _done(self, request: Request) -> None:
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self._touch()
+
+    async def wait_idle(self, quiet_ms: float, timeout_ms: float) -> None:
+        loop = asyncio.get_running_loop()
+        quiet, deadline = quiet_ms / 1000, loop.time() + timeout_ms / 1000
+        while True:
+            now = loop.time()
+            idle_for = now - self.last_activity
+            if not self.inflight and idle_for >= quiet:
+                return
+            if now >= deadline:
+                pending = ", ".join(sorted(r.url for r in self.inflight)) or "none"
+                raise TimeoutError(f"app did not go idle within {timeout_ms:.0f}ms (in flight: {pending})")
+            self._changed.clear()
+            step = deadline - now if self.inflight else min(quiet - idle_for, deadline - now)
+            try:
+                await asyncio.wait_for(self._changed.wait(), step)
+            except asyncio.TimeoutError:
+                pass
+
+
+_trackers: Dict[BrowserContext, _ApiTracker] = {}
+
+
+def track(context: BrowserContext) -> None:
+    """Start recording API traffic for ``context`` (idempotent)."""
+    if context not in _trackers:
+        _trackers[context] = _ApiTracker(context)
+        context.on("close", lambda _: _trackers.pop(context, None))
+
+
+async def wait_for_app_idle(page: Page, quiet_ms: float = QUIET_MS, timeout_ms: float = IDLE_TIMEOUT_MS) -> None:
+    """Wait until no backend API request has been in flight for ``quiet_ms``."""
+    track(page.context)
+    await _trackers[page.context].wait_idle(quiet_ms, timeout_ms)
+
+
+async def settle(page: Page, timeout_ms: float = IDLE_TIMEOUT_MS) -> None:
+    """Wait for the page to finish loading and its API calls to go quiet.
+
+    Never fails: if the app stays busy past ``timeout_ms`` the next step's own
+    auto-waiting decides whether the test can go on.
+    """
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+        await wait_for_app_idle(page, timeout_ms=timeout_ms)
+    except Exception:  # noqa: BLE001 - see docstring
+        pass
+    if tracing.enabled():
+        await tracing.step(page)
+
+
+def _matches(response: Response, path: str, method: Optional[str]) -> bool:
+    if not is_api_url(response.url) or path not in urlparse(response.url).path:
+        return False
+    return method is None or response.request.method == method.upper()
+
+
+def expect_api(page: Page, path: str, method: Optional[str] = None, timeout_ms: float = API_TIMEOUT_MS):
+    """Context manager that waits for the API response triggered inside it::
+
+        async with readiness.expect_api(page, "/dashboard/estatisticas") as info:
+            await page.goto(url)
+        response = await info.value
+    """
+    return page.expect_response(lambda r: _matches(r, path, method), timeout=timeout_ms)
+
+
+async def wait_for_api(page: Page, path: str, method: Optional[str] = None,
+                       timeout_ms: float = API_TIMEOUT_MS) -> Response:
+    """Wait for the next response from ``path``; prefer :func:`expect_api` when the trigger is known."""
+    return await page.wait_for_event("response", lambda r: _matches(r, path, method), timeout=timeout_ms)
+
+
+async def wait_for_locator(locator: Locator, state: str = "visible", timeout_ms: float = IDLE_TIMEOUT_MS) -> Locator:
+    await locator.wait_for(state=state, timeout=timeout_ms)
+    return locator
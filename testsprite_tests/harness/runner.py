@@ -0,0 +1,204 @@
+"""Parallel, sharded execution of the generated TestSprite scripts.
+
+Work is spread over ``workers`` OS processes (Chromium and the Python side of
+Playwright are both CPU heavy, so threads or a single event loop would not
+scale with cores). Each worker keeps one event loop alive for its whole
+lifetime and pulls test cases from a shared queue until it is drained.
+Scripts built on ``harness.browser_pool`` share that worker's warm Chromium
+instead of launching their own, and scripts built on ``harness.auth_state``
+start from login sessions created once in the parent process. Scripts built
+on ``harness.api_client`` share the worker's keep-alive connections to the
+API. Results are written in the same shape as ``tmp/test_results.json``;
+with ``DELIVEREI_TRACE=1`` each record also carries a ``performance`` summary
+(see ``harness.tracing``).
+"""
+
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import config
+from .discovery import TestCase, load_run_test
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse ``"k/n"`` into ``(k, n)`` with ``1 <= k <= n``."""
+    try:
+        k, n = (int(part) for part in value.split("/", 1))
+    except ValueError:
+        raise ValueError(f"invalid shard {value!r}, expected k/n") from None
+    if n < 1 or not 1 <= k <= n:
+        raise ValueError(f"invalid shard {value!r}, expected 1 <= k <= n")
+    return k, n
+
+
+def select_shard(cases: List[TestCase], k: int, n: int) -> List[TestCase]:
+    """Deterministic round-robin split of the (sorted) case list."""
+    return [case for i, case in enumerate(cases) if i % n == k - 1]
+
+
+def _timestamp(epoch: float) -> str:
+    moment = datetime.fromtimestamp(epoch, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def build_record(case: TestCase, status: str, error: Optional[str], started: float, finished: float) -> dict:
+    """One entry of ``test_results.json`` for ``case``."""
+    return {
+        "projectId": os.environ.get("TESTSPRITE_PROJECT_ID"),
+        "testId": str(uuid.uuid5(uuid.NAMESPACE_URL, f"deliverei/testsprite/{case.path.name}")),
+        "userId": os.environ.get("TESTSPRITE_USER_ID"),
+        "title": case.title,
+        "description": case.description,
+        "code": case.path.read_text(encoding="utf-8"),
+        "testStatus": status,
+        "testError": error,
+        "testType": "FRONTEND",
+        "createFrom": "harness",
+        "testVisualization": None,
+        "created": _timestamp(started),
+        "modified": _timestamp(finished),
+    }
+
+
+async def run_case(case: TestCase, timeout: float) -> dict:
+    """Run a single case in the current event loop and build its record."""
+    started = time.time()
+    status, error = PASSED, None
+    tracing = None
+    if config.TRACE_ENABLED:
+        from . import tracing
+
+        tracing.begin(case.path.stem)
+    try:
+        run_test = load_run_test(case.path)
+        await asyncio.wait_for(run_test(), timeout)
+    except asyncio.TimeoutError:
+        status, error = FAILED, f"Test timed out after {timeout:.0f}s"
+    except AssertionError as exc:
+        status, error = FAILED, str(exc) or "Assertion failed"
+    except Exception as exc:  # noqa: BLE001 - every failure must become a record
+        status = FAILED
+        error = f"{type(exc).__name__}: {exc}\n{traceback.format_exc(limit=5)}"
+    record = build_record(case, status, error, started, time.time())
+    if tracing is not None:
+        record["performance"] = tracing.finish()
+    return record
+
+
+def prepare_auth(cases: List[TestCase]) -> None:
+    """Log the seeded roles in once, before workers start, when any case needs them."""
+    # api_client sessions for a role are built from the same cached logins.
+    if not any(name in case.path.read_text(encoding="utf-8") for case in cases for name in ("auth_state", "api_client")):
+        return
+    from . import auth_state
+
+    for role, error in auth_state.prepare().items():
+        if error:
+            # Cases using this role will retry the login and report the real error.
+            print(f"auth state for {role} not ready: {error}", file=sys.stderr)
+
+
+async def _warm_pool():
+    """Start this worker's shared browser pool; None when Playwright is unusable."""
+    try:
+        from . import browser_pool
+
+        await browser_pool.get_pool().warm_up()
+        return browser_pool
+    except Exception as exc:  # noqa: BLE001 - cases will report the real error
+        print(f"browser pool warm-up failed: {exc}", file=sys.stderr)
+        return None
+
+
+async def _drain(jobs, results, timeout: float) -> None:
+    pool = await _warm_pool()
+    try:
+        while True:
+            case = jobs.get()
+            if case is None:
+                return
+            results.put((case.path.name, await run_case(case, timeout)))
+    finally:
+        if pool is not None:
+            await pool.close_pool()
+        api_client = sys.modules.get(f"{__package__}.api_client")
+        if api_client is not None:
+            await api_client.close_http()
+
+
+def _worker_main(jobs, results, timeout: float) -> None:
+    asyncio.run(_drain(jobs, results, timeout))
+
+
+def run_cases(cases: List[TestCase], workers: int, timeout: float = config.TEST_TIMEOUT_S, on_result=None) -> List[dict]:
+    """Run ``cases`` on ``workers`` processes and return records in case order."""
+    if not cases:
+        return []
+    workers = max(1, min(workers, len(cases)))
+    prepare_auth(cases)
+    # spawn: Playwright's driver does not survive being forked.
+    ctx = mp.get_context("spawn")
+    jobs, results = ctx.Queue(), ctx.Queue()
+    for case in cases:
+        jobs.put(case)
+    for _ in range(workers):
+        jobs.put(None)
+
+    procs = [ctx.Process(target=_worker_main, args=(jobs, results, timeout), daemon=True) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+
+    by_name: Dict[str, dict] = {}
+    while len(by_name) < len(cases):
+        try:
+            name, record = results.get(timeout=1.0)
+        except queue.Empty:
+            if not any(proc.is_alive() for proc in procs):
+                break
+            continue
+        by_name[name] = record
+        if on_result:
+            on_result(record)
+
+    for proc in procs:
+        proc.join(timeout=5)
+
+    now = time.time()
+    records = []
+    for case in cases:
+        record = by_name.get(case.path.name)
+        if record is None:
+            record = build_record(case, FAILED, "Worker process exited before reporting a result", now, now)
+            if on_result:
+                on_result(record)
+        records.append(record)
+    return records
+
+
+def write_results(records: List[dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(records, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def merge_results(paths: Iterable[Path]) -> List[dict]:
+    """Merge shard result files; a later file wins for the same ``testId``."""
+    merged: Dict[str, dict] = {}
+    for path in paths:
+        for record in json.loads(Path(path).read_text(encoding="utf-8")):
+            merged[record["testId"]] = record
+    return sorted(merged.values(), key=lambda r: r["title"])
@@ -0,0 +1,464 @@
+"""Deterministic multi-tenant dataset for performance work.
+
+``backend/prisma/seed.ts`` creates two stores with a handful of rows, which
+is too little for the dashboard, order list and catalog queries to show their
+real cost. This generator fills the Prisma tables at any scale from a seeded
+RNG and streams the rows into PostgreSQL with ``COPY``::
+
+    python -m harness.seed_data --tenants 1000 --orders 2000000 --dsn postgresql://localhost/deliverei
+    python -m harness.seed_data --tenants 10 --orders 20000 --out tmp/seed   # TSV files + load.sql, no database
+
+The same ``--seed`` and scale always produce the same rows, ids included; a
+store's accounts and catalog do not depend on how many stores are generated. Stores
+are ``seed-00001``, ``seed-00002``...; every generated account uses the
+password ``senha123`` (``admin@seed-00001.seed.test``,
+``cliente-1@seed-00001.seed.test``). ``--replace`` deletes the previously
+generated stores first (the Prisma relations cascade), leaving the
+``seed.ts`` fixtures alone.
+
+Orders are generated in chunks of ``--chunk`` and each chunk is copied
+table by table in foreign-key order, so memory stays flat and no row is
+built twice. Order volume per store follows a Zipf distribution, order times
+cluster around lunch and dinner (America/Sao_Paulo), and older orders are
+mostly delivered.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import config
+
+PASSWORD = "senha123"
+# bcrypt (cost 10, like seed.ts) of PASSWORD; hashing per user would dominate the run.
+PASSWORD_HASH = "$2b$10$cCgl3lwdYKlIzOKI0keGp.Pt2Bi4s0IijTgylTOJIyqkBQChTY1mi"
+SLUG_PREFIX = "seed-"
+DEFAULT_END = "2025-10-01"
+
+# Prisma column names, in load (foreign-key) order.
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "empresas": ("id", "nome", "email", "telefone", "endereco", "ativo", "slug", "subdominio", "createdAt",
+                 "updatedAt"),
+    "usuarios": ("id", "nome", "email", "senha", "telefone", "tipo", "ativo", "empresaId", "createdAt", "updatedAt"),
+    "categorias": ("id", "empresaId", "nome", "createdAt"),
+    "produtos": ("id", "nome", "descricao", "preco", "preco_riscado", "imagem", "ativo", "empresaId", "estoque",
+                 "categoria", "promo_tag", "bestseller_tag", "new_tag", "createdAt", "updatedAt"),
+    "cupons": ("id", "codigo", "descricao", "tipo", "valor", "valor_minimo", "data_inicio", "data_fim", "ativo",
+               "uso_maximo", "uso_atual", "empresa_id", "created_at", "updated_at"),
+    "pedidos": ("id", "numero", "status", "subtotal", "desconto", "total", "frete", "clienteId", "empresaId",
+                "enderecoEntrega", "formaPagamento", "cupomDesconto", "observacoes", "createdAt", "updatedAt"),
+    "itens_pedido": ("id", "pedidoId", "produtoId", "quantidade", "precoUnitario", "subtotal"),
+    "pagamentos": ("id", "pedidoId", "empresaId", "valor", "metodo", "status", "transacaoId", "dataPagamento",
+                   "createdAt", "updatedAt"),
+    "avaliacoes": ("id", "nota", "comentario", "produto_id", "usuario_id", "pedido_id", "created_at"),
+    "notificacoes": ("id", "titulo", "mensagem", "tipo", "lida", "usuario_id", "pedido_id", "created_at"),
+}
+
+# COPY bypasses the backend, so the dashboard rollup (backend/src/dashboard/vendas-diarias.service.ts)
+# is rebuilt for the generated stores once everything is loaded. Same SQL as `npm run dashboard:backfill`.
+DASHBOARD_TIMEZONE = os.environ.get("DASHBOARD_TIMEZONE", "America/Sao_Paulo")
+_SEED_EMPRESAS = f"SELECT id FROM empresas WHERE slug LIKE '{SLUG_PREFIX}%'"
+_DIA = f"(p.\"createdAt\" AT TIME ZONE 'UTC' AT TIME ZONE '{DASHBOARD_TIMEZONE}')::date"
+ROLLUP_SQL = (
+    f'DELETE FROM vendas_diarias_produtos WHERE "empresaId" IN ({_SEED_EMPRESAS})',
+    f'DELETE FROM vendas_diarias WHERE "empresaId" IN ({_SEED_EMPRESAS})',
+    'INSERT INTO vendas_diarias ("empresaId", dia, status, pedidos, total) '
+    f'SELECT p."empresaId", {_DIA}, p.status, count(*), coalesce(sum(p.total), 0) FROM pedidos p '
+    f'WHERE p."empresaId" IN ({_SEED_EMPRESAS}) GROUP BY 1, 2, 3',
+    'INSERT INTO vendas_diarias_produtos ("empresaId", dia, status, "produtoId", quantidade, subtotal) '
+    f'SELECT p."empresaId", {_DIA}, p.status, i."produtoId", sum(i.quantidade), coalesce(sum(i.subtotal), 0) '
+    f'FROM itens_pedido i JOIN pedidos p ON p.id = i."pedidoId" '
+    f'WHERE p."empresaId" IN ({_SEED_EMPRESAS}) GROUP BY 1, 2, 3, 4',
+)
+ROLLUP_TABLES = ("vendas_diarias", "vendas_diarias_produtos")
+
+CATEGORIAS = ("Pizzas", "Lanches", "Marmitas", "Bebidas", "Sobremesas", "Porções", "Saladas", "Açaí", "Japonesa",
+              "Pastéis")
+PRATOS = ("Especial", "da Casa", "Tradicional", "Fit", "Premium", "Kids", "Família", "Light", "Duplo", "Artesanal")
+BAIRROS = ("Centro", "Jardins", "Moema", "Pinheiros", "Vila Mariana", "Tatuapé", "Santana", "Lapa", "Mooca",
+           "Butantã")
+FORMAS_PAGAMENTO = ("PIX", "CARTAO", "DINHEIRO")
+STATUS_RECENTES = ("PENDENTE", "CONFIRMADO", "EM_PREPARO", "SAIU_ENTREGA", "ENTREGUE", "CANCELADO")
+# Local (America/Sao_Paulo, UTC-3) order hour weights: lunch and dinner peaks.
+HOUR_WEIGHTS = (0, 0, 0, 0, 0, 0, 1, 1, 2, 3, 5, 12, 20, 14, 6, 4, 4, 6, 12, 20, 18, 10, 5, 2)
+UTC_OFFSET_H = 3
+
+
+@dataclass(frozen=True)
+class Scale:
+    tenants: int = 10
+    orders: int = 20_000
+    customers_per_tenant: int = 200
+    products_per_tenant: int = 60
+    coupons_per_tenant: int = 5
+    days: int = 365
+    review_ratio: float = 0.1
+    notification_ratio: float = 0.5
+
+
+@dataclass
+class Tenant:
+    index: int
+    id: str
+    slug: str
+    customers: List[str] = field(default_factory=list)
+    products: List[Tuple[str, float]] = field(default_factory=list)
+    coupons: List[str] = field(default_factory=list)
+
+
+def _rng(seed: int, *key) -> random.Random:
+    # String seeds are hashed with SHA-512, so this is stable across runs and platforms.
+    return random.Random(":".join(str(part) for part in (seed,) + key))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _money(value: float) -> float:
+    return round(value + 1e-9, 2)
+
+
+def _ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S.") + f"{value.microsecond // 1000:03d}"
+
+
+def _field(value) -> str:
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, datetime):
+        return _ts(value)
+    text = str(value)
+    if any(c in text for c in "\\\t\n\r"):
+        text = text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return text
+
+
+class Batch:
+    """Rows of several tables in ``COPY ... FROM STDIN`` text format."""
+
+    def __init__(self):
+        self.buffers: Dict[str, io.StringIO] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, table: str, *values) -> None:
+        buffer = self.buffers.get(table)
+        if buffer is None:
+            buffer = self.buffers[table] = io.StringIO()
+            self.counts[table] = 0
+        buffer.write("\t".join(map(_field, values)))
+        buffer.write("\n")
+        self.counts[table] += 1
+
+    def tables(self) -> Iterable[Tuple[str, str]]:
+        """(table, data) in foreign-key order."""
+        for table in TABLES:
+            if table in self.buffers:
+                yield table, self.buffers[table].getvalue()
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+
+def orders_per_tenant(scale: Scale, seed: int) -> List[int]:
+    """Split ``scale.orders`` over the stores with Zipf(1.1) weights, shuffled by seed."""
+    weights = [1 / (rank ** 1.1) for rank in range(1, scale.tenants + 1)]
+    _rng(seed, "zipf").shuffle(weights)
+    total = sum(weights)
+    exact = [scale.orders * w / total for w in weights]
+    counts = [int(x) for x in exact]
+    # Largest remainder, so the counts add up to exactly scale.orders.
+    by_remainder = sorted(range(scale.tenants), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in by_remainder[:scale.orders - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def tenant_rows(batch: Batch, index: int, scale: Scale, seed: int, end: datetime) -> Tenant:
+    """Store, admin, customers, categories, products and coupons of tenant ``index``."""
+    rng = _rng(seed, "tenant", index)
+    slug = f"{SLUG_PREFIX}{index + 1:05d}"
+    tenant = Tenant(index, _uuid(rng), slug)
+    created = end - timedelta(days=scale.days + rng.randint(1, 365))
+    nome = f"Loja Seed {index + 1:05d}"
+    batch.add("empresas", tenant.id, nome, f"contato@{slug}.seed.test", f"(11) 9{rng.randint(10_000_000, 99_999_999)}",
+              f"Rua {rng.choice(BAIRROS)}, {rng.randint(1, 2000)} - São Paulo/SP", True, slug, slug, created, created)
+
+    batch.add("usuarios", _uuid(rng), f"Admin {nome}", f"admin@{slug}.seed.test", PASSWORD_HASH, None, "ADMIN_EMPRESA",
+              True, tenant.id, created, created)
+    for n in range(1, scale.customers_per_tenant + 1):
+        customer_id = _uuid(rng)
+        joined = created + timedelta(seconds=rng.randint(0, scale.days * 86_400))
+        batch.add("usuarios", customer_id, f"Cliente {n} {slug}", f"cliente-{n}@{slug}.seed.test", PASSWORD_HASH,
+                  f"(11) 9{rng.randint(10_000_000, 99_999_999)}", "CLIENTE", True, tenant.id, joined, joined)
+        tenant.customers.append(customer_id)
+
+    categorias = rng.sample(CATEGORIAS, rng.randint(4, 6))
+    for categoria in categorias:
+        batch.add("categorias", _uuid(rng), tenant.id, categoria, created)
+
+    for n in range(1, scale.products_per_tenant + 1):
+        produto_id = _uuid(rng)
+        categoria = rng.choice(categorias)
+        preco = _money(rng.randint(10, 119) + 0.9)
+        riscado = _money(preco * 1.2) if rng.random() < 0.15 else None
+        ativo = rng.random() < 0.9
+        batch.add("produtos", produto_id, f"{categoria} {rng.choice(PRATOS)} {n}", f"{categoria} preparado na hora",
+                  preco, riscado, None, ativo, tenant.id, rng.randint(0, 500), categoria, riscado is not None,
+                  rng.random() < 0.1, rng.random() < 0.1, created, created)
+        if ativo:
+            tenant.products.append((produto_id, preco))
+
+    for n in range(1, scale.coupons_per_tenant + 1):
+        codigo = f"SEED{n:02d}"
+        percentual = rng.random() < 0.6
+        inicio = end - timedelta(days=rng.randint(0, scale.days))
+        batch.add("cupons", _uuid(rng), codigo, f"Cupom {codigo}", "PERCENTUAL" if percentual else "VALOR_FIXO",
+                  float(rng.choice((5, 10, 15))) if percentual else float(rng.choice((5, 10))),
+                  float(rng.choice((0, 30, 50))) or None, inicio, inicio + timedelta(days=rng.randint(7, 90)),
+                  rng.random() < 0.8, rng.choice((None, 100, 1000)), rng.randint(0, 100), tenant.id, inicio, inicio)
+        tenant.coupons.append(codigo)
+    return tenant
+
+
+def _order_time(rng: random.Random, scale: Scale, end: datetime) -> datetime:
+    # Bias towards recent days (a growing business), then pick a local hour by weight.
+    day = int(scale.days * rng.random() ** 1.3)
+    hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+    local = end - timedelta(days=day + 1)
+    return local.replace(hour=hour, minute=rng.randint(0, 59), second=rng.randint(0, 59),
+                         microsecond=rng.randint(0, 999) * 1000) + timedelta(hours=UTC_OFFSET_H)
+
+
+def order_rows(batch: Batch, tenant: Tenant, seq: int, scale: Scale, seed: int, end: datetime) -> None:
+    """One order of ``tenant`` with its items, payment, review and notification."""
+    rng = _rng(seed, "pedido", tenant.index, seq)
+    pedido_id = _uuid(rng)
+    # Squaring skews towards the first customers: regulars order more often.
+    cliente_id = tenant.customers[int(len(tenant.customers) * rng.random() ** 2)]
+    created = _order_time(rng, scale, end)
+    age = end - created
+    if age > timedelta(days=1):
+        status = "CANCELADO" if rng.random() < 0.08 else "ENTREGUE"
+    else:
+        status = rng.choice(STATUS_RECENTES)
+    updated = created + timedelta(minutes=rng.randint(20, 90)) if status in ("ENTREGUE", "CANCELADO") else created
+
+    subtotal = 0.0
+    itens = rng.sample(tenant.products, min(len(tenant.products), rng.choices((1, 2, 3, 4), (45, 30, 15, 10))[0]))
+    for produto_id, preco in itens:
+        quantidade = rng.choices((1, 2, 3), (70, 22, 8))[0]
+        batch.add("itens_pedido", _uuid(rng), pedido_id, produto_id, quantidade, preco, _money(preco * quantidade))
+        subtotal += preco * quantidade
+    subtotal = _money(subtotal)
+    cupom = rng.choice(tenant.coupons) if tenant.coupons and rng.random() < 0.1 else None
+    desconto = _money(subtotal * 0.1) if cupom else 0.0
+    frete = rng.choice((0.0, 0.0, 5.99, 7.99, 9.99))
+    total = _money(subtotal - desconto + frete)
+    forma = rng.choices(FORMAS_PAGAMENTO, (55, 35, 10))[0]
+    numero = f"SEED-{tenant.index + 1:05d}-{seq + 1:08d}"
+    # Same layout the checkout writes: "<rua> <numero> - <bairro> - <cidade>/<UF> - <cep>".
+    endereco = (f"Rua {rng.randint(1, 999)} {rng.randint(1, 3000)} - {rng.choice(BAIRROS)} - São Paulo/SP - "
+                f"0{rng.randint(1000, 9999)}-000")
+    batch.add("pedidos", pedido_id, numero, status, subtotal, desconto, total, frete, cliente_id, tenant.id, endereco,
+              forma, cupom, None, created, updated)
+
+    pago = status not in ("PENDENTE", "CANCELADO")
+    batch.add("pagamentos", _uuid(rng), pedido_id, tenant.id, total, forma,
+              "APROVADO" if pago else ("RECUSADO" if status == "CANCELADO" else "PENDENTE"),
+              f"seed_{rng.getrandbits(48):012x}" if forma != "DINHEIRO" else None,
+              created + timedelta(minutes=1) if pago else None, created, updated)
+
+    if status == "ENTREGUE" and itens and rng.random() < scale.review_ratio:
+        nota = rng.choices((1, 2, 3, 4, 5), (3, 4, 10, 33, 50))[0]
+        batch.add("avaliacoes", _uuid(rng), nota, rng.choice((None, "Muito bom!", "Chegou frio.", "Recomendo.")),
+                  itens[0][0], cliente_id, pedido_id, updated + timedelta(hours=rng.randint(1, 48)))
+    if rng.random() < scale.notification_ratio:
+        situacao = status.lower().replace("_", " ")
+        batch.add("notificacoes", _uuid(rng), f"Pedido {numero}", f"Seu pedido está {situacao}", "PEDIDO",
+                  age > timedelta(days=2), cliente_id, pedido_id, updated)
+
+
+def generate(scale: Scale, seed: int, end: datetime, chunk: int) -> Iterable[Batch]:
+    """Yield batches of rows: stores first, then orders ``chunk`` at a time."""
+    counts = orders_per_tenant(scale, seed)
+    tenants = []
+    batch = Batch()
+    for index in range(scale.tenants):
+        tenants.append(tenant_rows(batch, index, scale, seed, end))
+        if len(batch) >= chunk:
+            yield batch
+            batch = Batch()
+    pending = 0
+    for tenant, count in zip(tenants, counts):
+        if not tenant.products:
+            continue
+        for seq in range(count):
+            order_rows(batch, tenant, seq, scale, seed, end)
+            pending += 1
+            if pending >= chunk:
+                yield batch
+                batch, pending = Batch(), 0
+    if len(batch):
+        yield batch
+
+
+def _copy_target(table: str) -> str:
+    columns = ", ".join(f'"{column}"' for column in TABLES[table])
+    return f'"{table}" ({columns})'
+
+
+class PostgresSink:
+    """Streams each batch with one ``COPY`` per table and commits it."""
+
+    def __init__(self, dsn: str):
+        import psycopg  # Only needed when loading into a database.
+
+        self.conn = psycopg.connect(dsn)
+
+    def replace(self) -> int:
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM empresas WHERE slug LIKE %s", (SLUG_PREFIX + "%",))
+            deleted = cur.rowcount
+        self.conn.commit()
+        return deleted
+
+    def write(self, batch: Batch) -> None:
+        with self.conn.cursor() as cur:
+            for table, data in batch.tables():
+                with cur.copy(f"COPY {_copy_target(table)} FROM STDIN") as copy:
+                    copy.write(data)
+        self.conn.commit()
+
+    def close(self) -> None:
+        with self.conn.cursor() as cur:
+            for statement in ROLLUP_SQL:
+                cur.execute(statement)
+            self.conn.commit()
+            for table in (*TABLES, *ROLLUP_TABLES):
+                cur.execute(f'ANALYZE "{table}"')
+        self.conn.commit()
+        self.conn.close()
+
+
+class DirectorySink:
+    """Writes ``<table>.tsv`` files plus a ``load.sql`` for ``psql -f``."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        for table in TABLES:
+            (path / f"{table}.tsv").write_text("", encoding="utf-8")
+
+    def replace(self) -> int:
+        return 0
+
+    def write(self, batch: Batch) -> None:
+        for table, data in batch.tables():
+            with (self.path / f"{table}.tsv").open("a", encoding="utf-8") as f:
+                f.write(data)
+
+    def close(self) -> None:
+        # \copy paths are relative to psql's working directory: run it from here.
+        lines = ["BEGIN;"]
+        for table in TABLES:
+            lines.append(f"\\copy {_copy_target(table)} FROM '{table}.tsv'")
+        lines += [f"{statement};" for statement in ROLLUP_SQL]
+        lines += ["COMMIT;"] + [f'ANALYZE "{table}";' for table in (*TABLES, *ROLLUP_TABLES)]
+        (self.path / "load.sql").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _default_dsn() -> Optional[str]:
+    dsn = os.environ.get("DIRECT_URL") or os.environ.get("DATABASE_URL")
+    if not dsn:
+        return None
+    # libpq rejects Prisma-only query parameters.
+    parts = urlsplit(dsn)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("schema", "pgbouncer", "connection_limit")]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def load(sink, scale: Scale, seed: int, end: datetime, chunk: int, replace: bool = False,
+         progress=None) -> Dict[str, int]:
+    """Generate everything into ``sink``; returns rows per table."""
+    if replace:
+        deleted = sink.replace()
+        if progress and deleted:
+            progress(f"removed {deleted} previously generated stores")
+    totals = {table: 0 for table in TABLES}
+    started = time.monotonic()
+    try:
+        for batch in generate(scale, seed, end, chunk):
+            sink.write(batch)
+            for table, count in batch.counts.items():
+                totals[table] += count
+            if progress:
+                rows = sum(totals.values())
+                progress(f"{rows:,} rows ({rows / max(time.monotonic() - started, 1e-6):,.0f}/s), "
+                         f"{totals['pedidos']:,}/{scale.orders:,} orders")
+    finally:
+        sink.close()
+    return totals
+
+
+def write_tenants(path: Path, scale: Scale) -> None:
+    """Slugs of the generated stores, one per line (``loadgen --tenants @file``)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{SLUG_PREFIX}{i + 1:05d}\n" for i in range(scale.tenants)), encoding="utf-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.seed_data", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tenants", type=int, default=Scale.tenants, help="stores to create (default: 10)")
+    parser.add_argument("--orders", type=int, default=Scale.orders, help="orders over all stores (default: 20000)")
+    parser.add_argument("--customers", type=int, default=Scale.customers_per_tenant,
+                        help="customers per store (default: 200)")
+    parser.add_argument("--products", type=int, default=Scale.products_per_tenant,
+                        help="products per store (default: 60)")
+    parser.add_argument("--coupons", type=int, default=Scale.coupons_per_tenant, help="coupons per store (default: 5)")
+    parser.add_argument("--days", type=int, default=Scale.days, help="order history length in days (default: 365)")
+    parser.add_argument("--end", default=DEFAULT_END, help=f"last day of history, YYYY-MM-DD (default: {DEFAULT_END})")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed (default: 1)")
+    parser.add_argument("--chunk", type=int, default=20_000, help="orders per COPY batch (default: 20000)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--dsn", default=_default_dsn(), help="PostgreSQL URL (default: $DIRECT_URL or $DATABASE_URL)")
+    target.add_argument("--out", type=Path, help="write TSV files and load.sql here instead of loading")
+    parser.add_argument("--replace", action="store_true", help=f"delete stores with a '{SLUG_PREFIX}' slug first")
+    parser.add_argument("--tenants-file", type=Path, default=config.TMP_DIR / "seed_tenants.txt",
+                        help="where to list the generated slugs (default: tmp/seed_tenants.txt)")
+    args = parser.parse_args(argv)
+
+    if args.out is None and not args.dsn:
+        parser.error("no database: pass --dsn, set DATABASE_URL, or use --out")
+    if args.tenants < 1 or args.customers < 1 or args.products < 1 or args.orders < 0 or args.chunk < 1:
+        parser.error("--tenants, --customers, --products and --chunk must be positive")
+    scale = Scale(args.tenants, args.orders, args.customers, args.products, args.coupons, args.days)
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+
+    sink = DirectorySink(args.out) if args.out else PostgresSink(args.dsn)
+    started = time.monotonic()
+    totals = load(sink, scale, args.seed, end, args.chunk, args.replace,
+                  progress=lambda message: print(message, file=sys.stderr))
+    write_tenants(args.tenants_file, scale)
+    elapsed = time.monotonic() - started
+    for table, count in totals.items():
+        print(f"{table:<14} {count:>12,}")
+    print(f"{sum(totals.values()):,} rows in {elapsed:.1f}s; store slugs in {args.tenants_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
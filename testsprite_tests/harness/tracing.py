@@ -0,0 +1,281 @@
+"""Optional performance capture for the Playwright cases.
+
+With ``DELIVEREI_TRACE=1`` (``python -m harness --trace``) every context the
+browser pool hands out is instrumented:
+
+* a Chromium performance trace (``tmp/traces/<case>/trace.json``, open it in
+  the DevTools Performance panel or ui.perfetto.dev);
+* the network waterfall: every request with its status, start offset and
+  duration (``network.json``);
+* Web Vitals per page from ``PerformanceObserver``: FCP, LCP, CLS and an
+  approximate TTI (end of the last long task before a 5 s quiet window after
+  FCP; the network-quiet part of the Lighthouse definition is left out);
+* JS heap (``Performance.getMetrics`` over CDP) and the vitals so far at every
+  step -- each :func:`readiness.settle` call, i.e. before every interaction.
+
+The runner attaches a summary to the case's record in ``test_results.json``
+(``"performance"``) and ``--trace`` adds a table to
+``testsprite-mcp-test-report.md``. When tracing is off none of this runs.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from playwright.async_api import Browser, BrowserContext, CDPSession, Page, Request
+
+from . import config
+
+TTI_QUIET_MS = 5000
+SLOWEST_REQUESTS = 5
+REPORT_START = "<!-- harness:performance:start -->"
+REPORT_END = "<!-- harness:performance:end -->"
+
+VITALS_SCRIPT = """
+(() => {
+  if (window.__delivereiVitals) return;
+  const vitals = window.__delivereiVitals = { fcp: null, lcp: null, cls: 0, longTasks: [] };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry)).observe({ type, buffered: true });
+    } catch (e) { /* entry type not supported */ }
+  };
+  observe('paint', (e) => { if (e.name === 'first-contentful-paint') vitals.fcp = e.startTime; });
+  observe('largest-contentful-paint', (e) => { vitals.lcp = e.renderTime || e.loadTime || e.startTime; });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) vitals.cls += e.value; });
+  observe('longtask', (e) => { vitals.longTasks.push([e.startTime, e.startTime + e.duration]); });
+})();
+"""
+
+READ_VITALS = "() => window.__delivereiVitals ? { ...window.__delivereiVitals, now: performance.now() } : null"
+
+
+def enabled() -> bool:
+    return config.TRACE_ENABLED
+
+
+def time_to_interactive(fcp: Optional[float], long_tasks: Sequence[Sequence[float]],
+                        quiet_ms: float = TTI_QUIET_MS) -> Optional[float]:
+    """End of the last long task that starts less than ``quiet_ms`` after the previous one (or FCP)."""
+    if fcp is None:
+        return None
+    interactive = fcp
+    for start, end in sorted(long_tasks):
+        if end <= interactive:
+            continue
+        if start - interactive >= quiet_ms:
+            break
+        interactive = end
+    return interactive
+
+
+def _vitals(raw: Optional[dict]) -> dict:
+    if not raw:
+        return {}
+    return {
+        "fcp_ms": _round(raw.get("fcp")),
+        "lcp_ms": _round(raw.get("lcp")),
+        "cls": round(raw.get("cls") or 0.0, 4),
+        "tti_ms": _round(time_to_interactive(raw.get("fcp"), raw.get("longTasks") or [])),
+        "long_tasks": len(raw.get("longTasks") or []),
+    }
+
+
+def _round(value: Optional[float], digits: int = 1) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+class _Collector:
+    """Everything recorded for one context."""
+
+    def __init__(self, case: str, browser: Browser):
+        self.case = case
+        self.browser = browser
+        self.started = time.time()
+        self.tracing = False
+        self.steps: List[dict] = []
+        self.pages: List[dict] = []
+        self.network: List[dict] = []
+        self.sessions: Dict[Page, CDPSession] = {}
+
+    async def on_request_done(self, request: Request) -> None:
+        timing = request.timing
+        start = timing.get("startTime") or 0
+        duration = timing.get("responseEnd", -1)
+        try:
+            response = await request.response()
+        except Exception:  # noqa: BLE001 - the context may be closing
+            response = None
+        self.network.append({
+            "url": request.url,
+            "method": request.method,
+            "type": request.resource_type,
+            "status": response.status if response else None,
+            "failure": request.failure,
+            "start_ms": round(start - self.started * 1000, 1) if start else None,
+            "duration_ms": round(duration, 1) if duration is not None and duration >= 0 else None,
+        })
+
+    async def heap(self, page: Page) -> Dict[str, Optional[float]]:
+        session = self.sessions.get(page)
+        try:
+            if session is None:
+                session = self.sessions[page] = await page.context.new_cdp_session(page)
+                await session.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in (await session.send("Performance.getMetrics"))["metrics"]}
+        except Exception:  # noqa: BLE001 - page closed or not a Chromium page
+            return {}
+        return {"heap_used_bytes": metrics.get("JSHeapUsedSize"), "heap_total_bytes": metrics.get("JSHeapTotalSize")}
+
+
+_current_case: Optional[str] = None
+_collectors: Dict[BrowserContext, _Collector] = {}
+_finished: List[_Collector] = []
+
+
+def begin(case: str) -> None:
+    """Name the traces of the case about to run in this process."""
+    global _current_case
+    _current_case = case
+    _finished.clear()
+
+
+async def attach(context: BrowserContext, browser: Browser) -> None:
+    """Start recording ``context`` (called by the browser pool)."""
+    collector = _Collector(_current_case or "adhoc", browser)
+    _collectors[context] = collector
+    await context.add_init_script(VITALS_SCRIPT)
+    context.on("requestfinished", collector.on_request_done)
+    context.on("requestfailed", collector.on_request_done)
+    try:
+        # One Chromium trace per browser at a time; a second concurrent context goes without.
+        await browser.start_tracing(screenshots=True, categories=[
+            "devtools.timeline", "disabled-by-default-devtools.timeline", "v8.execute", "blink.user_timing",
+            "loading", "latencyInfo",
+        ])
+        collector.tracing = True
+    except Exception:  # noqa: BLE001
+        pass
+
+
+async def step(page: Page) -> None:
+    """Record heap and vitals for the step about to run on ``page``."""
+    collector = _collectors.get(page.context)
+    if collector is None:
+        return
+    try:
+        vitals = _vitals(await page.evaluate(READ_VITALS))
+    except Exception:  # noqa: BLE001 - navigating; the next step will catch up
+        vitals = {}
+    collector.steps.append({
+        "index": len(collector.steps) + 1,
+        "url": page.url,
+        "elapsed_ms": round((time.time() - collector.started) * 1000, 1),
+        **await collector.heap(page),
+        **vitals,
+    })
+
+
+def _case_dir(case: str) -> Path:
+    return config.TRACE_DIR / re.sub(r"[^\w.-]+", "_", case)
+
+
+async def detach(context: BrowserContext) -> None:
+    """Collect the final vitals, stop the trace and write the artifacts (before the context closes)."""
+    collector = _collectors.pop(context, None)
+    if collector is None:
+        return
+    for page in context.pages:
+        try:
+            raw = await page.evaluate(READ_VITALS)
+        except Exception:  # noqa: BLE001
+            raw = None
+        collector.pages.append({"url": page.url, **_vitals(raw), **await collector.heap(page)})
+
+    directory = _case_dir(collector.case)
+    directory.mkdir(parents=True, exist_ok=True)
+    if collector.tracing:
+        try:
+            (directory / "trace.json").write_bytes(await collector.browser.stop_tracing())
+        except Exception:  # noqa: BLE001 - browser already gone
+            collector.tracing = False
+    collector.network.sort(key=lambda r: r["start_ms"] if r["start_ms"] is not None else float("inf"))
+    (directory / "network.json").write_text(json.dumps(collector.network, indent=1) + "\n", encoding="utf-8")
+    _finished.append(collector)
+
+
+def finish() -> Optional[dict]:
+    """Summary of everything recorded since :func:`begin`, for the result record."""
+    if not _finished:
+        return None
+    collectors, directory = list(_finished), _case_dir(_finished[0].case)
+    _finished.clear()
+    steps = [s for c in collectors for s in c.steps]
+    pages = [p for c in collectors for p in c.pages]
+    network = [r for c in collectors for r in c.network]
+    timed = [r for r in network if r["duration_ms"] is not None]
+    slowest = sorted(timed, key=lambda r: r["duration_ms"], reverse=True)[:SLOWEST_REQUESTS]
+    heaps = [s["heap_used_bytes"] for s in steps + pages if s.get("heap_used_bytes")]
+    relative = lambda path: os.path.relpath(path, config.SUITE_DIR)  # noqa: E731
+    return {
+        "trace": relative(directory / "trace.json") if any(c.tracing for c in collectors) else None,
+        "network": relative(directory / "network.json"),
+        "requests": len(network),
+        "failed_requests": sum(1 for r in network if r["failure"] or (r["status"] or 0) >= 400),
+        "slowest_requests": slowest,
+        "peak_heap_bytes": max(heaps) if heaps else None,
+        "pages": pages,
+        "steps": steps,
+    }
+
+
+# -- report -------------------------------------------------------------------
+
+def _fmt(value, unit: str = "", digits: int = 0) -> str:
+    return "–" if value is None else f"{value:,.{digits}f}{unit}"
+
+
+def report_section(records: Sequence[dict]) -> str:
+    lines = [
+        REPORT_START,
+        "## Performance (harness --trace)",
+        "",
+        "Last page of each test; heap is the peak over all steps. Traces open in the DevTools Performance panel.",
+        "",
+        "| Test | Status | FCP | LCP | CLS | TTI | Peak heap | Requests (failed) | Slowest request | Trace |",
+        "|------|--------|-----|-----|-----|-----|-----------|-------------------|-----------------|-------|",
+    ]
+    for record in records:
+        perf = record.get("performance")
+        if not perf:
+            continue
+        page = perf["pages"][-1] if perf["pages"] else {}
+        slowest = perf["slowest_requests"][0] if perf["slowest_requests"] else None
+        slow = f"`{slowest['method']} {slowest['url'].split('?')[0]}` {slowest['duration_ms']:.0f} ms" if slowest else "–"
+        heap = perf["peak_heap_bytes"] / 1024 / 1024 if perf["peak_heap_bytes"] else None
+        lines.append(
+            f"| {record['title']} | {record['testStatus']} | {_fmt(page.get('fcp_ms'), ' ms')} "
+            f"| {_fmt(page.get('lcp_ms'), ' ms')} | {_fmt(page.get('cls'), '', 3)} | {_fmt(page.get('tti_ms'), ' ms')} "
+            f"| {_fmt(heap, ' MB', 1)} | {perf['requests']} ({perf['failed_requests']}) | {slow} "
+            f"| {'`' + perf['trace'] + '`' if perf['trace'] else '–'} |"
+        )
+    lines.append(REPORT_END)
+    return "\n".join(lines)
+
+
+def update_report(records: Sequence[dict], path: Path = config.REPORT_PATH) -> bool:
+    """Replace (or append) the performance section of the markdown report; False if nothing was traced."""
+    if not any(r.get("performance") for r in records):
+        return False
+    section = report_section(records)
+    text = path.read_text(encoding="utf-8") if path.exists() else ""
+    pattern = re.compile(re.escape(REPORT_START) + ".*?" + re.escape(REPORT_END), re.S)
+    if pattern.search(text):
+        text = pattern.sub(lambda _: section, text)
+    else:
+        text = text.rstrip("\n") + ("\n\n" if text else "") + section
+    path.write_text(text + "\n" if not text.endswith("\n") else text, encoding="utf-8")
+    return True